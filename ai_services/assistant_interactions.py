@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from contextlib import aclosing
 
 from ai_services.guild_api_keys import (
     raise_for_guild_gemini_exception,
@@ -9,7 +10,7 @@ from ai_services.guild_api_keys import (
     use_guild_gemini_api_key,
 )
 from config import AIDM_PROMPT_PATH, client
-from data_store.db_repository import get_memory_name
+from data_store.async_db_repository import get_memory_name
 from discord_app.shared_functions import send_response_in_chunks
 from .gemini_client import gemini_client
 
@@ -69,6 +70,30 @@ def _compose_system_prompt(system_prompt: str | None = None) -> str:
     return f"{SYSTEM_PROMPT}\n\n{system_prompt.strip()}".strip()
 
 
+async def _generate_response_text(
+    prompt: str,
+    system_prompt: str | None,
+    model_name: str | None,
+    response_stream=None,
+) -> str:
+    if response_stream is None:
+        return await gemini_client.generate_text_async(
+            prompt,
+            _compose_system_prompt(system_prompt),
+            model_name,
+        )
+    async with aclosing(
+        gemini_client.generate_text_stream_async(
+            prompt,
+            _compose_system_prompt(system_prompt),
+            model_name,
+        )
+    ) as chunks:
+        async for text in chunks:
+            await response_stream.feed(text)
+    return (await response_stream.finish()).strip()
+
+
 async def get_assistant_response(
     user_message,
     channel_id,
@@ -79,7 +104,15 @@ async def get_assistant_response(
     model_name=None,
     context_block: str | None = None,
     system_prompt: str | None = None,
+    memory_name: str | None = None,
+    response_stream=None,
 ):
+    """Generate a reply for the assigned memory.
+
+    When `response_stream` (a `DiscordResponseStream`) is given, the reply is
+    streamed into Discord as it is generated and `send_message` is ignored;
+    check `response_stream.posted` to see whether anything reached the channel.
+    """
     try:
         target_id = thread_id or channel_id
         channel = client.get_channel(target_id)
@@ -94,7 +127,8 @@ async def get_assistant_response(
             return error_message
 
         normalized_message = _normalize_user_message(user_message)
-        memory_name = await asyncio.to_thread(get_memory_name, assigned_memory)
+        if memory_name is None:
+            memory_name = await get_memory_name(assigned_memory)
         prompt = _build_prompt(memory_name, normalized_message, context_block=context_block)
         guild = getattr(channel, "guild", None)
         guild_id = getattr(guild, "id", None)
@@ -103,21 +137,13 @@ async def get_assistant_response(
             try:
                 if guild_id is not None:
                     with use_guild_gemini_api_key(guild_id):
-                        response_text = await asyncio.to_thread(
-                            gemini_client.generate_text,
-                            prompt,
-                            _compose_system_prompt(system_prompt),
-                            model_name,
-                        )
+                        response_text = await _generate_response_text(prompt, system_prompt, model_name, response_stream)
                     await asyncio.to_thread(record_guild_gemini_key_success, guild_id)
                 else:
-                    response_text = await asyncio.to_thread(
-                        gemini_client.generate_text,
-                        prompt,
-                        _compose_system_prompt(system_prompt),
-                        model_name,
-                    )
+                    response_text = await _generate_response_text(prompt, system_prompt, model_name, response_stream)
             except Exception as exc:
+                if response_stream is not None and response_stream.posted:
+                    await response_stream.finish("\n\n*(Response interrupted.)*")
                 if guild_id is not None:
                     await asyncio.to_thread(raise_for_guild_gemini_exception, guild_id, exc)
                 raise
@@ -126,7 +152,7 @@ async def get_assistant_response(
             return "No valid response received from Gemini."
 
         logger.info("Gemini responded in memory '%s': %s", assigned_memory, response_text[:100])
-        if send_message:
+        if send_message and response_stream is None:
             await send_response_in_chunks(channel, response_text)
         return response_text
 
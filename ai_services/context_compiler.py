@@ -1,13 +1,14 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 
 import discord
 
-from config import DISCORD_BOT_TOKEN
+from config import CONTEXT_PACKET_CACHE_TTL_SECONDS, DISCORD_BOT_TOKEN
 from voice.context_support import build_context_block
 
 
@@ -336,17 +337,7 @@ async def _hydrate_entry_assets(
                 if key in seen:
                     continue
                 seen.add(key)
-                image_bytes = None
-                if _attachment_is_image(attachment):
-                    try:
-                        image_bytes = await attachment.read(use_cached=True)
-                    except Exception as exc:
-                        logger.warning(
-                            "Could not prefetch context image %s from message %s: %s",
-                            attachment.filename,
-                            message.id,
-                            exc,
-                        )
+                # Image bytes are fetched lazily, downscaled and cached by reference_image_cache.
                 resolved_assets.append(
                     ContextAsset(
                         filename=attachment.filename,
@@ -356,10 +347,10 @@ async def _hydrate_entry_assets(
                         source_message_id=message.id,
                         source_channel_id=message.channel.id,
                         is_image=_attachment_is_image(attachment),
-                        image_bytes=image_bytes,
                     )
                 )
         entry.assets = resolved_assets
+        context_packet_cache.remember_assets(entry)
 
     return entries
 
@@ -396,16 +387,150 @@ def _entries_to_assets(entries: list[ManagedContextEntry]) -> list[ContextAsset]
     return assets
 
 
+@dataclass
+class _ContextChannelState:
+    fragments: dict[int, dict]
+    last_message_id: int | None
+    loaded_at: float
+    assets_by_entry: dict[str, list[ContextAsset]] = field(default_factory=dict)
+
+
+class ContextPacketCache:
+    """Parsed `[AIDM_CONTEXT_ENTRY]` fragments per #context / #dm-planning channel.
+
+    The first compile walks the channel history once. Later compiles compare
+    the channel's `last_message_id` (kept current by the gateway) with the last
+    message seen and fetch and parse only messages posted after it. Entries
+    whose source messages were hydrated keep their assets between compiles.
+    Edits and deletes in a cached channel drop its state through `invalidate`;
+    `ttl_seconds` forces a full reload as a safety net (0 disables the cache).
+    Concurrent compiles of one channel share a single in-flight load.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._states: dict[int, _ContextChannelState] = {}
+        self._in_flight: dict[int, asyncio.Future] = {}
+        # Tracked only while a load is in flight; bumped on invalidation so a load
+        # that raced with an edit does not store stale fragments.
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.incremental_loads = 0
+        self.full_loads = 0
+        self.invalidations = 0
+
+    def _fresh_state(self, channel_id: int) -> _ContextChannelState | None:
+        state = self._states.get(channel_id)
+        if state is None or time.monotonic() - state.loaded_at > self.ttl_seconds:
+            return None
+        return state
+
+    async def _full_load(self, channel: discord.TextChannel) -> _ContextChannelState:
+        fragments: dict[int, dict] = {}
+        last_message_id = None
+        async for message in channel.history(limit=CONTEXT_HISTORY_LIMIT):
+            last_message_id = last_message_id or message.id
+            fragment = parse_context_entry_fragment(message)
+            if fragment:
+                fragments[message.id] = fragment
+        self.full_loads += 1
+        return _ContextChannelState(fragments=fragments, last_message_id=last_message_id, loaded_at=time.monotonic())
+
+    async def _load_newer(self, channel: discord.TextChannel, state: _ContextChannelState) -> _ContextChannelState:
+        newer = [
+            message
+            async for message in channel.history(
+                limit=CONTEXT_HISTORY_LIMIT,
+                after=discord.Object(id=state.last_message_id),
+                oldest_first=True,
+            )
+        ]
+        if len(newer) >= CONTEXT_HISTORY_LIMIT:
+            return await self._full_load(channel)
+        for message in newer:
+            fragment = parse_context_entry_fragment(message)
+            if fragment:
+                state.fragments[message.id] = fragment
+            state.last_message_id = message.id
+        self.incremental_loads += 1
+        return state
+
+    async def _load_state(self, channel: discord.TextChannel) -> _ContextChannelState:
+        state = self._fresh_state(channel.id)
+        if state is None or state.last_message_id is None:
+            return await self._full_load(channel)
+        if channel.last_message_id and channel.last_message_id != state.last_message_id:
+            return await self._load_newer(channel, state)
+        self.hits += 1
+        return state
+
+    async def _shared_load(self, channel: discord.TextChannel) -> _ContextChannelState:
+        pending = self._in_flight.get(channel.id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[channel.id] = future
+        self._generations[channel.id] = 0
+        try:
+            state = await self._load_state(channel)
+            if self.ttl_seconds > 0 and not self._generations.get(channel.id):
+                self._states[channel.id] = state
+            future.set_result(state)
+            return state
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieve the exception so a future nobody else awaited does not log a warning.
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(channel.id, None)
+            self._generations.pop(channel.id, None)
+
+    async def load_entries(self, channel: discord.TextChannel | None) -> list[ManagedContextEntry]:
+        if channel is None:
+            return []
+        state = await self._shared_load(channel)
+        entries = _reconstruct_entries([state.fragments[message_id] for message_id in sorted(state.fragments, reverse=True)])
+        for entry in entries:
+            if not entry.assets and entry.entry_id in state.assets_by_entry:
+                entry.assets = state.assets_by_entry[entry.entry_id]
+        return entries
+
+    def remember_assets(self, entry: ManagedContextEntry) -> None:
+        state = self._states.get(entry.channel_id)
+        if state is not None:
+            state.assets_by_entry[entry.entry_id] = entry.assets
+
+    def invalidate(self, channel_id: int | None) -> bool:
+        if channel_id is None:
+            return False
+        # A load in flight may have read the channel before this edit; keep it from being stored.
+        if channel_id in self._in_flight:
+            self._generations[channel_id] += 1
+        if self._states.pop(channel_id, None) is None:
+            return False
+        self.invalidations += 1
+        logger.debug("Invalidated cached context fragments for channel %s.", channel_id)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "channels": len(self._states),
+            "hits": self.hits,
+            "incremental_loads": self.incremental_loads,
+            "full_loads": self.full_loads,
+            "invalidations": self.invalidations,
+        }
+
+
+context_packet_cache = ContextPacketCache(CONTEXT_PACKET_CACHE_TTL_SECONDS)
+
+
 async def _load_channel_entries(channel: discord.TextChannel | None) -> list[ManagedContextEntry]:
-    if channel is None:
-        return []
-
-    fragments: list[dict] = []
-    async for message in channel.history(limit=CONTEXT_HISTORY_LIMIT):
-        fragment = parse_context_entry_fragment(message)
-        if fragment:
-            fragments.append(fragment)
-    return _reconstruct_entries(fragments)
+    return await context_packet_cache.load_entries(channel)
 
 
 async def compile_context_packet_from_category(
@@ -1,10 +1,10 @@
+import asyncio
+import hashlib
 import logging
-import time
-from contextlib import contextmanager
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
 from contextvars import ContextVar
 from pathlib import Path
-from urllib.error import URLError
-from urllib.request import Request, urlopen
 
 from google import genai
 from google.genai import types
@@ -16,6 +16,9 @@ from config import (
     GEMINI_FALLBACK_MODEL,
     GEMINI_IMAGE_DEFAULT_ASPECT_RATIO,
     GEMINI_IMAGE_MODEL,
+    GEMINI_MAX_CONCURRENT_BACKGROUND_REQUESTS,
+    GEMINI_MAX_CONCURRENT_REQUESTS,
+    GEMINI_MAX_CONCURRENT_REQUESTS_PER_GUILD,
     GEMINI_MAX_OUTPUT_TOKENS,
     GEMINI_SUMMARY_MODEL,
     GEMINI_TEMPERATURE,
@@ -23,10 +26,13 @@ from config import (
     GEMINI_TOP_K,
     GEMINI_TOP_P,
 )
+from .gemini_file_poller import gemini_file_poller
+from .reference_image_cache import reference_image_cache
 
 
 logger = logging.getLogger(__name__)
 _CURRENT_GEMINI_API_KEY: ContextVar[str | None] = ContextVar("current_gemini_api_key", default=None)
+_CURRENT_GEMINI_GUILD_ID: ContextVar[int | None] = ContextVar("current_gemini_guild_id", default=None)
 
 
 def _client_error_status_code(exc: Exception) -> int | None:
@@ -50,18 +56,230 @@ def is_gemini_auth_error(exc: Exception) -> bool:
     return any(marker in message for marker in auth_markers)
 
 
+def is_gemini_file_unavailable_error(exc: Exception) -> bool:
+    """True when Gemini no longer serves a previously uploaded file to this key."""
+    return _client_error_status_code(exc) in {403, 404}
+
+
 @contextmanager
-def use_gemini_api_key(api_key: str | None):
+def use_gemini_api_key(api_key: str | None, *, guild_id: int | None = None):
     token = _CURRENT_GEMINI_API_KEY.set(api_key.strip() if isinstance(api_key, str) else api_key)
+    guild_token = _CURRENT_GEMINI_GUILD_ID.set(guild_id)
     try:
         yield
     finally:
+        _CURRENT_GEMINI_GUILD_ID.reset(guild_token)
         _CURRENT_GEMINI_API_KEY.reset(token)
 
 
+class GeminiConcurrencyLimiter:
+    """Caps in-flight Gemini requests globally and per guild.
+
+    Background work (transcription, window summaries, scene images) also takes a
+    slot from a smaller per-guild background pool, so a long voice session can
+    never hold every per-guild slot and starve chat replies in the same server.
+    """
+
+    def __init__(self, max_global: int, max_per_guild: int, max_background_per_guild: int) -> None:
+        self.in_flight = 0
+        self.max_global = self.max_per_guild = self.max_background_per_guild = 1
+        self.configure(
+            max_global=max_global,
+            max_per_guild=max_per_guild,
+            max_background_per_guild=max_background_per_guild,
+        )
+
+    @asynccontextmanager
+    async def slot(self, scope, *, background: bool = False):
+        # A scope's semaphores live only while some request holds or waits for them.
+        self._scope_users[scope] = self._scope_users.get(scope, 0) + 1
+        try:
+            async with AsyncExitStack() as stack:
+                if background:
+                    await stack.enter_async_context(
+                        self._background.setdefault(scope, asyncio.Semaphore(self.max_background_per_guild))
+                    )
+                await stack.enter_async_context(self._per_guild.setdefault(scope, asyncio.Semaphore(self.max_per_guild)))
+                await stack.enter_async_context(self._global)
+                self.in_flight += 1
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            self._scope_users[scope] -= 1
+            if not self._scope_users[scope]:
+                del self._scope_users[scope]
+                self._per_guild.pop(scope, None)
+                self._background.pop(scope, None)
+
+    def configure(
+        self,
+        *,
+        max_global: int | None = None,
+        max_per_guild: int | None = None,
+        max_background_per_guild: int | None = None,
+    ) -> None:
+        """Set the limits. Only safe before any request is in flight, e.g. in a CLI entry point."""
+        self.max_global = max(1, max_global or self.max_global)
+        self.max_per_guild = max(1, max_per_guild or self.max_per_guild)
+        self.max_background_per_guild = max(
+            1,
+            min(max_background_per_guild or self.max_background_per_guild, self.max_per_guild),
+        )
+        self._global = asyncio.Semaphore(self.max_global)
+        self._per_guild: dict[object, asyncio.Semaphore] = {}
+        self._background: dict[object, asyncio.Semaphore] = {}
+        self._scope_users: dict[object, int] = {}
+
+    def stats(self) -> dict[str, int]:
+        return {"in_flight": self.in_flight, "active_scopes": len(self._scope_users)}
+
+
+gemini_limiter = GeminiConcurrencyLimiter(
+    GEMINI_MAX_CONCURRENT_REQUESTS,
+    GEMINI_MAX_CONCURRENT_REQUESTS_PER_GUILD,
+    GEMINI_MAX_CONCURRENT_BACKGROUND_REQUESTS,
+)
+
+
+def _text_config(
+    system_instruction: str | None = None,
+    tools: list | None = None,
+) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        temperature=GEMINI_TEMPERATURE,
+        top_p=GEMINI_TOP_P,
+        top_k=GEMINI_TOP_K,
+        max_output_tokens=GEMINI_MAX_OUTPUT_TOKENS,
+        system_instruction=system_instruction,
+        tools=tools,
+    )
+
+
+def _url_context_prompt(prompt: str, urls: list[str]) -> str:
+    joined_urls = "\n".join(f"- {url}" for url in urls)
+    return f"{prompt}\n\nRelevant public URLs:\n{joined_urls}"
+
+
+def _image_prompt(prompt: str, negative_prompt: str | None) -> str:
+    effective_prompt = prompt.strip()
+    if negative_prompt:
+        effective_prompt = (
+            f"{effective_prompt}\n\n"
+            f"Negative guidance: {negative_prompt.strip()}"
+        ).strip()
+    return effective_prompt
+
+
+def _image_content_config(number_of_images: int, aspect_ratio: str | None) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        candidate_count=number_of_images,
+        response_modalities=["TEXT", "IMAGE"],
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio or GEMINI_IMAGE_DEFAULT_ASPECT_RATIO,
+        ),
+    )
+
+
+def _images_config(
+    number_of_images: int,
+    aspect_ratio: str | None,
+    negative_prompt: str | None,
+) -> types.GenerateImagesConfig:
+    return types.GenerateImagesConfig(
+        number_of_images=number_of_images,
+        aspect_ratio=aspect_ratio or GEMINI_IMAGE_DEFAULT_ASPECT_RATIO,
+        negative_prompt=negative_prompt,
+        output_mime_type="image/png",
+        add_watermark=False,
+    )
+
+
+def gemini_file_handle(uploaded) -> dict:
+    """Serializable reference to an uploaded file, suitable for storing in a manifest."""
+    expiration_time = getattr(uploaded, "expiration_time", None)
+    return {
+        "name": uploaded.name,
+        "uri": getattr(uploaded, "uri", None),
+        "mime_type": getattr(uploaded, "mime_type", None),
+        "size_bytes": getattr(uploaded, "size_bytes", None),
+        "expires_at": expiration_time.isoformat() if expiration_time else None,
+    }
+
+
+def _file_part(file_or_handle):
+    if isinstance(file_or_handle, dict):
+        return types.Part.from_uri(file_uri=file_or_handle["uri"], mime_type=file_or_handle.get("mime_type"))
+    return file_or_handle
+
+
+def _reference_part(image_bytes: bytes, mime_type: str | None) -> types.Part:
+    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type or "image/png")
+
+
+def _inline_images_from_response(response) -> list[dict]:
+    generated = []
+    response_parts = getattr(response, "parts", None)
+    if response_parts is None:
+        response_parts = []
+        for candidate in getattr(response, "candidates", []) or []:
+            content = getattr(candidate, "content", None)
+            response_parts.extend(getattr(content, "parts", []) or [])
+    for part in response_parts:
+        inline_data = getattr(part, "inline_data", None)
+        image_bytes = getattr(inline_data, "data", None) if inline_data else None
+        mime_type = getattr(inline_data, "mime_type", None) if inline_data else None
+        if not image_bytes:
+            continue
+        generated.append(
+            {
+                "image_bytes": image_bytes,
+                "mime_type": mime_type or "image/png",
+                "enhanced_prompt": None,
+                "rai_filtered_reason": None,
+            }
+        )
+    return generated
+
+
+def _normalize_generated_images(generated: list) -> list[dict]:
+    outputs: list[dict] = []
+    for generated_image in generated:
+        if isinstance(generated_image, dict):
+            image_bytes = generated_image.get("image_bytes")
+            mime_type = generated_image.get("mime_type")
+            if not image_bytes:
+                continue
+            outputs.append(
+                {
+                    "image_bytes": image_bytes,
+                    "mime_type": mime_type or "image/png",
+                    "enhanced_prompt": generated_image.get("enhanced_prompt"),
+                    "rai_filtered_reason": generated_image.get("rai_filtered_reason"),
+                }
+            )
+            continue
+        image = getattr(generated_image, "image", None)
+        image_bytes = getattr(image, "image_bytes", None) if image else None
+        mime_type = getattr(image, "mime_type", None) if image else None
+        if not image_bytes:
+            continue
+        outputs.append(
+            {
+                "image_bytes": image_bytes,
+                "mime_type": mime_type or "image/png",
+                "enhanced_prompt": getattr(generated_image, "enhanced_prompt", None),
+                "rai_filtered_reason": getattr(generated_image, "rai_filtered_reason", None),
+            }
+        )
+    return outputs
+
+
 class GeminiClient:
-    def __init__(self) -> None:
+    def __init__(self, limiter: GeminiConcurrencyLimiter | None = None) -> None:
         self._client_cache: dict[str, genai.Client] = {}
+        self.limiter = limiter or gemini_limiter
 
     def _resolve_api_key(self, api_key: str | None = None) -> str:
         resolved = (api_key or _CURRENT_GEMINI_API_KEY.get() or GEMINI_API_KEY or "").strip()
@@ -80,7 +298,17 @@ class GeminiClient:
             self._client_cache[resolved] = client
         return client
 
-    def generate_text(
+    def _limit(self, api_key: str | None = None, *, background: bool = False):
+        # Guild keys are per-guild, so the key is a good scope when no guild is bound.
+        # Only a digest is used so the secret never becomes a dict key.
+        guild_id = _CURRENT_GEMINI_GUILD_ID.get()
+        if guild_id is not None:
+            scope = guild_id
+        else:
+            scope = "key:" + hashlib.sha256(self._resolve_api_key(api_key).encode("utf-8")).hexdigest()[:16]
+        return self.limiter.slot(scope, background=background)
+
+    async def generate_text_async(
         self,
         prompt: str,
         system_instruction: str | None = None,
@@ -88,144 +316,194 @@ class GeminiClient:
         *,
         api_key: str | None = None,
     ) -> str:
-        return self._generate_text_with_model(
+        return await self._generate_with_config_async(
             model_name or GEMINI_CHAT_MODEL,
             prompt,
-            system_instruction,
+            _text_config(system_instruction),
             api_key=api_key,
         )
 
-    def generate_summary_text(
+    async def generate_text_stream_async(
+        self,
+        prompt: str,
+        system_instruction: str | None = None,
+        model_name: str | None = None,
+        *,
+        api_key: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield response text as Gemini produces it.
+
+        The fallback model is only tried when the stream fails before the first
+        chunk; a stream that breaks midway re-raises so callers can mark the
+        partial reply.
+        """
+        chosen_model = model_name or GEMINI_CHAT_MODEL
+        config = _text_config(system_instruction)
+        client = self._get_client(api_key)
+        async with self._limit(api_key):
+            try:
+                stream = await client.aio.models.generate_content_stream(
+                    model=chosen_model,
+                    contents=prompt,
+                    config=config,
+                )
+            except ClientError as exc:
+                status_code = _client_error_status_code(exc)
+                if status_code == 404 and chosen_model != GEMINI_FALLBACK_MODEL:
+                    logger.warning("Gemini model %s unavailable; retrying with %s", chosen_model, GEMINI_FALLBACK_MODEL)
+                    stream = await client.aio.models.generate_content_stream(
+                        model=GEMINI_FALLBACK_MODEL,
+                        contents=prompt,
+                        config=config,
+                    )
+                else:
+                    raise
+            async for chunk in stream:
+                text = getattr(chunk, "text", None)
+                if text:
+                    yield text
+
+    async def generate_summary_text_async(
         self,
         prompt: str,
         system_instruction: str | None = None,
         *,
         api_key: str | None = None,
     ) -> str:
-        return self._generate_text_with_model(
+        return await self._generate_with_config_async(
             GEMINI_SUMMARY_MODEL,
             prompt,
-            system_instruction,
+            _text_config(system_instruction),
             api_key=api_key,
+            background=True,
         )
 
-    def generate_text_from_files(
+    async def generate_text_with_url_context_async(
         self,
-        file_paths: list[str],
         prompt: str,
-        model_name: str | None = None,
+        urls: list[str],
+        system_instruction: str | None = None,
         *,
         api_key: str | None = None,
     ) -> str:
-        client = self._get_client(api_key)
-        uploaded_files = [client.files.upload(file=Path(file_path)) for file_path in file_paths]
-        chosen_model = model_name or GEMINI_SUMMARY_MODEL
-
-        try:
-            for index, uploaded in enumerate(uploaded_files):
-                uploaded_files[index] = self._wait_for_file(client, uploaded)
+        config = _text_config(system_instruction, tools=[types.Tool(url_context=types.UrlContext())])
+        return await self._generate_with_config_async(
+            GEMINI_CHAT_MODEL,
+            _url_context_prompt(prompt, urls),
+            config,
+            api_key=api_key,
+        )
 
+    async def _generate_with_config_async(
+        self,
+        model_name: str,
+        contents,
+        config: types.GenerateContentConfig | None = None,
+        *,
+        api_key: str | None = None,
+        background: bool = False,
+    ) -> str:
+        client = self._get_client(api_key)
+        async with self._limit(api_key, background=background):
             try:
-                response = client.models.generate_content(
-                    model=chosen_model,
-                    contents=[prompt, *uploaded_files],
+                response = await client.aio.models.generate_content(
+                    model=model_name,
+                    contents=contents,
+                    config=config,
                 )
             except ClientError as exc:
                 status_code = _client_error_status_code(exc)
-                if status_code == 404 and chosen_model != GEMINI_FALLBACK_MODEL:
-                    logger.warning("Gemini model %s unavailable for files; retrying with %s", chosen_model, GEMINI_FALLBACK_MODEL)
-                    response = client.models.generate_content(
+                if status_code == 404 and model_name != GEMINI_FALLBACK_MODEL:
+                    logger.warning("Gemini model %s unavailable; retrying with %s", model_name, GEMINI_FALLBACK_MODEL)
+                    response = await client.aio.models.generate_content(
                         model=GEMINI_FALLBACK_MODEL,
-                        contents=[prompt, *uploaded_files],
+                        contents=contents,
+                        config=config,
                     )
                 else:
                     raise
-            return (response.text or "").strip()
-        finally:
-            for uploaded in uploaded_files:
-                try:
-                    client.files.delete(name=uploaded.name)
-                except Exception as exc:
-                    logger.warning("Failed to delete uploaded Gemini file %s: %s", uploaded.name, exc)
-
-    def _wait_for_file(self, client: genai.Client, uploaded):
-        for _ in range(60):
-            state = getattr(uploaded, "state", None)
-            state_name = getattr(state, "name", None)
-            if state_name in (None, "ACTIVE", "SUCCEEDED"):
-                return uploaded
-            if state_name == "FAILED":
-                raise RuntimeError(f"Gemini file processing failed for {uploaded.name}.")
-            time.sleep(1)
-            uploaded = client.files.get(name=uploaded.name)
-        return uploaded
-
-    def generate_text_with_url_context(
+        return (response.text or "").strip()
+
+    async def upload_file_async(self, file_path, *, api_key: str | None = None):
+        """Upload a file and wait until Gemini has finished processing it."""
+        client = self._get_client(api_key)
+        file_path = Path(file_path)
+        async with self._limit(api_key, background=True):
+            uploaded = await client.aio.files.upload(file=file_path)
+        try:
+            size_bytes = file_path.stat().st_size
+        except OSError:
+            size_bytes = None
+        return await gemini_file_poller.wait_until_active(client, uploaded, size_bytes=size_bytes)
+
+    async def delete_file_async(self, name: str, *, api_key: str | None = None) -> None:
+        try:
+            await self._get_client(api_key).aio.files.delete(name=name)
+        except Exception as exc:
+            logger.warning("Failed to delete uploaded Gemini file %s: %s", name, exc)
+
+    async def generate_text_from_uploaded_files_async(
         self,
+        files: list,
         prompt: str,
-        urls: list[str],
-        system_instruction: str | None = None,
+        model_name: str | None = None,
         *,
         api_key: str | None = None,
     ) -> str:
-        joined_urls = "\n".join(f"- {url}" for url in urls)
-        contextual_prompt = f"{prompt}\n\nRelevant public URLs:\n{joined_urls}"
-        config = types.GenerateContentConfig(
-            temperature=GEMINI_TEMPERATURE,
-            top_p=GEMINI_TOP_P,
-            top_k=GEMINI_TOP_K,
-            max_output_tokens=GEMINI_MAX_OUTPUT_TOKENS,
-            system_instruction=system_instruction,
-            tools=[types.Tool(url_context=types.UrlContext())],
+        """Generate from files that are already uploaded.
+
+        `files` may hold SDK file objects or handle dicts from `gemini_file_handle`.
+        """
+        parts = [_file_part(item) for item in files]
+        return await self._generate_with_config_async(
+            model_name or GEMINI_SUMMARY_MODEL,
+            [prompt, *parts],
+            api_key=api_key,
+            background=True,
         )
-        return self._generate_with_config(GEMINI_CHAT_MODEL, contextual_prompt, config, api_key=api_key)
 
-    def _generate_text_with_model(
+    async def _generate_from_uploads_async(
         self,
-        model_name: str,
+        file_paths: list,
         prompt: str,
-        system_instruction: str | None = None,
+        model_name: str,
         *,
         api_key: str | None = None,
     ) -> str:
-        config = types.GenerateContentConfig(
-            temperature=GEMINI_TEMPERATURE,
-            top_p=GEMINI_TOP_P,
-            top_k=GEMINI_TOP_K,
-            max_output_tokens=GEMINI_MAX_OUTPUT_TOKENS,
-            system_instruction=system_instruction,
+        results = await asyncio.gather(
+            *(self.upload_file_async(file_path, api_key=api_key) for file_path in file_paths),
+            return_exceptions=True,
         )
-        return self._generate_with_config(model_name, prompt, config, api_key=api_key)
+        uploaded_files = [result for result in results if not isinstance(result, BaseException)]
+        try:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            return await self.generate_text_from_uploaded_files_async(
+                uploaded_files,
+                prompt,
+                model_name,
+                api_key=api_key,
+            )
+        finally:
+            await asyncio.gather(*(self.delete_file_async(uploaded.name, api_key=api_key) for uploaded in uploaded_files))
 
-    def _generate_with_config(
+    async def generate_text_from_files_async(
         self,
-        model_name: str,
+        file_paths: list[str],
         prompt: str,
-        config: types.GenerateContentConfig,
+        model_name: str | None = None,
         *,
         api_key: str | None = None,
     ) -> str:
-        client = self._get_client(api_key)
-        try:
-            response = client.models.generate_content(
-                model=model_name,
-                contents=prompt,
-                config=config,
-            )
-        except ClientError as exc:
-            status_code = _client_error_status_code(exc)
-            if status_code == 404 and model_name != GEMINI_FALLBACK_MODEL:
-                logger.warning("Gemini model %s unavailable; retrying with %s", model_name, GEMINI_FALLBACK_MODEL)
-                response = client.models.generate_content(
-                    model=GEMINI_FALLBACK_MODEL,
-                    contents=prompt,
-                    config=config,
-                )
-            else:
-                raise
-        return (response.text or "").strip()
+        return await self._generate_from_uploads_async(
+            file_paths,
+            prompt,
+            model_name or GEMINI_SUMMARY_MODEL,
+            api_key=api_key,
+        )
 
-    def transcribe_audio(
+    async def transcribe_audio_async(
         self,
         audio_file_path: str,
         prompt: str,
@@ -233,97 +511,32 @@ class GeminiClient:
         *,
         api_key: str | None = None,
     ) -> str:
-        client = self._get_client(api_key)
-        uploaded = client.files.upload(file=Path(audio_file_path))
-        chosen_model = model_name or GEMINI_TRANSCRIBE_MODEL
-
-        uploaded = self._wait_for_file(client, uploaded)
+        return await self._generate_from_uploads_async(
+            [audio_file_path],
+            prompt,
+            model_name or GEMINI_TRANSCRIBE_MODEL,
+            api_key=api_key,
+        )
 
+    async def _load_reference_part_async(self, source) -> types.Part | None:
+        if isinstance(source, types.Part):
+            return source
         try:
-            try:
-                response = client.models.generate_content(
-                    model=chosen_model,
-                    contents=[prompt, uploaded],
-                )
-            except ClientError as exc:
-                status_code = _client_error_status_code(exc)
-                if status_code == 404 and chosen_model != GEMINI_FALLBACK_MODEL:
-                    logger.warning("Gemini model %s unavailable for audio; retrying with %s", chosen_model, GEMINI_FALLBACK_MODEL)
-                    response = client.models.generate_content(
-                        model=GEMINI_FALLBACK_MODEL,
-                        contents=[prompt, uploaded],
-                    )
-                else:
-                    raise
-            return (response.text or "").strip()
-        finally:
-            try:
-                client.files.delete(name=uploaded.name)
-            except Exception as exc:
-                logger.warning("Failed to delete uploaded Gemini file %s: %s", uploaded.name, exc)
-
-    def _load_image_bytes(self, source) -> tuple[bytes, str | None]:
-        if hasattr(source, "image_bytes") and getattr(source, "image_bytes"):
-            mime_type = getattr(source, "content_type", None) or "image/png"
-            return getattr(source, "image_bytes"), mime_type
-
-        if isinstance(source, (str, Path)):
-            source_path = Path(source).expanduser()
-            if source_path.exists():
-                suffix = source_path.suffix.lower()
-                mime_type = {
-                    ".png": "image/png",
-                    ".jpg": "image/jpeg",
-                    ".jpeg": "image/jpeg",
-                    ".webp": "image/webp",
-                }.get(suffix, "image/png")
-                return source_path.read_bytes(), mime_type
-
-            request = Request(str(source), headers={"User-Agent": "AIDM/1.0"})
-            with urlopen(request, timeout=30) as response:
-                data = response.read()
-                mime_type = response.headers.get_content_type()
-                return data, mime_type
-
-        if hasattr(source, "url"):
-            urls = [getattr(source, "url", None), getattr(source, "proxy_url", None)]
-            last_error = None
-            for candidate_url in urls:
-                if not candidate_url:
-                    continue
-                try:
-                    request = Request(str(candidate_url), headers={"User-Agent": "AIDM/1.0"})
-                    with urlopen(request, timeout=30) as response:
-                        data = response.read()
-                        mime_type = response.headers.get_content_type()
-                        return data, mime_type
-                except Exception as exc:
-                    last_error = exc
-            if last_error is not None:
-                raise last_error
-
-        if isinstance(source, dict) and source.get("image_bytes"):
-            return source["image_bytes"], source.get("content_type") or "image/png"
-
-        if isinstance(source, dict) and (source.get("url") or source.get("proxy_url")):
-            last_error = None
-            for candidate_url in (source.get("url"), source.get("proxy_url")):
-                if not candidate_url:
-                    continue
-                try:
-                    request = Request(str(candidate_url), headers={"User-Agent": "AIDM/1.0"})
-                    with urlopen(request, timeout=30) as response:
-                        data = response.read()
-                        mime_type = response.headers.get_content_type()
-                        return data, mime_type
-                except Exception as exc:
-                    last_error = exc
-            if last_error is not None:
-                raise last_error
-
-        raise ValueError(f"Unsupported image source: {source!r}")
-
-    def generate_image(
+            image_bytes, mime_type = await reference_image_cache.load(source)
+        except Exception as exc:
+            logger.warning("Skipping unusable reference image %r: %s", source, exc)
+            return None
+        return _reference_part(image_bytes, mime_type)
+
+    async def load_reference_parts_async(self, sources: list) -> list[types.Part | None]:
+        """Load reference images once so a batch of image requests can share the parts.
+
+        The result lines up with `sources`; unusable references come back as None.
+        Loaded parts can be passed straight to `generate_image_async`.
+        """
+        return list(await asyncio.gather(*(self._load_reference_part_async(source) for source in sources)))
+
+    async def generate_image_async(
         self,
         prompt: str,
         *,
@@ -337,115 +550,36 @@ class GeminiClient:
         chosen_model = model_name or GEMINI_IMAGE_MODEL
         client = self._get_client(api_key)
         refs = list(reference_images or [])
-        use_generate_content = chosen_model.startswith("gemini-")
-        effective_prompt = prompt.strip()
-        if negative_prompt:
-            effective_prompt = (
-                f"{effective_prompt}\n\n"
-                f"Negative guidance: {negative_prompt.strip()}"
-            ).strip()
+        effective_prompt = _image_prompt(prompt, negative_prompt)
 
         try:
-            if use_generate_content:
-                content_parts = [effective_prompt]
-                for item in refs:
-                    try:
-                        image_bytes, mime_type = self._load_image_bytes(item)
-                    except Exception as exc:
-                        logger.warning("Skipping unusable reference image %r: %s", item, exc)
-                        continue
-                    content_parts.append(
-                        types.Part.from_bytes(
-                            data=image_bytes,
-                            mime_type=mime_type or "image/png",
-                        )
-                    )
-
-                response = client.models.generate_content(
-                    model=chosen_model,
-                    contents=content_parts,
-                    config=types.GenerateContentConfig(
-                        candidate_count=number_of_images,
-                        response_modalities=["TEXT", "IMAGE"],
-                        image_config=types.ImageConfig(
-                            aspect_ratio=aspect_ratio or GEMINI_IMAGE_DEFAULT_ASPECT_RATIO,
-                        ),
-                    ),
-                )
-                generated = []
-                response_parts = getattr(response, "parts", None)
-                if response_parts is None:
-                    response_parts = []
-                    for candidate in getattr(response, "candidates", []) or []:
-                        content = getattr(candidate, "content", None)
-                        response_parts.extend(getattr(content, "parts", []) or [])
-                for part in response_parts:
-                    inline_data = getattr(part, "inline_data", None)
-                    image_bytes = getattr(inline_data, "data", None) if inline_data else None
-                    mime_type = getattr(inline_data, "mime_type", None) if inline_data else None
-                    if not image_bytes:
-                        continue
-                    generated.append(
-                        {
-                            "image_bytes": image_bytes,
-                            "mime_type": mime_type or "image/png",
-                            "enhanced_prompt": None,
-                            "rai_filtered_reason": None,
-                        }
+            if chosen_model.startswith("gemini-"):
+                # Reference downloads happen before taking a request slot.
+                reference_parts = await asyncio.gather(*(self._load_reference_part_async(item) for item in refs))
+                content_parts = [effective_prompt, *(part for part in reference_parts if part is not None)]
+                async with self._limit(api_key, background=True):
+                    response = await client.aio.models.generate_content(
+                        model=chosen_model,
+                        contents=content_parts,
+                        config=_image_content_config(number_of_images, aspect_ratio),
                     )
+                generated = _inline_images_from_response(response)
             else:
-                config = types.GenerateImagesConfig(
-                    number_of_images=number_of_images,
-                    aspect_ratio=aspect_ratio or GEMINI_IMAGE_DEFAULT_ASPECT_RATIO,
-                    negative_prompt=negative_prompt,
-                    output_mime_type="image/png",
-                    add_watermark=False,
-                )
                 if refs:
                     logger.warning(
                         "Reference images are not supported for non-Gemini image generation path; using prompt-only generation."
                     )
-                response = client.models.generate_images(
-                    model=chosen_model,
-                    prompt=effective_prompt,
-                    config=config,
-                )
+                async with self._limit(api_key, background=True):
+                    response = await client.aio.models.generate_images(
+                        model=chosen_model,
+                        prompt=effective_prompt,
+                        config=_images_config(number_of_images, aspect_ratio, negative_prompt),
+                    )
                 generated = getattr(response, "generated_images", None) or []
         except ClientError as exc:
             raise RuntimeError(f"Gemini image generation failed: {exc}") from exc
-        except URLError as exc:
-            raise RuntimeError(f"Could not fetch reference image: {exc}") from exc
-
-        outputs: list[dict] = []
-        for generated_image in generated:
-            if isinstance(generated_image, dict):
-                image_bytes = generated_image.get("image_bytes")
-                mime_type = generated_image.get("mime_type")
-                if not image_bytes:
-                    continue
-                outputs.append(
-                    {
-                        "image_bytes": image_bytes,
-                        "mime_type": mime_type or "image/png",
-                        "enhanced_prompt": generated_image.get("enhanced_prompt"),
-                        "rai_filtered_reason": generated_image.get("rai_filtered_reason"),
-                    }
-                )
-                continue
-            image = getattr(generated_image, "image", None)
-            image_bytes = getattr(image, "image_bytes", None) if image else None
-            mime_type = getattr(image, "mime_type", None) if image else None
-            if not image_bytes:
-                continue
-            outputs.append(
-                {
-                    "image_bytes": image_bytes,
-                    "mime_type": mime_type or "image/png",
-                    "enhanced_prompt": getattr(generated_image, "enhanced_prompt", None),
-                    "rai_filtered_reason": getattr(generated_image, "rai_filtered_reason", None),
-                }
-            )
-        return outputs
+
+        return _normalize_generated_images(generated)
 
 
 gemini_client = GeminiClient()
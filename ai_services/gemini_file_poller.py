@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from config import (
+    GEMINI_FILE_POLL_INITIAL_SECONDS,
+    GEMINI_FILE_POLL_MAX_SECONDS,
+    GEMINI_FILE_PROCESSING_TIMEOUT_SECONDS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in MB for the processing-time buckets; the last bucket is open-ended.
+SIZE_BUCKETS_MB = (1, 5, 20, 50)
+BACKOFF_FACTOR = 1.6
+
+
+def size_bucket_label(size_bytes: int | None) -> str:
+    if size_bytes is None:
+        return "unknown"
+    size_mb = size_bytes / (1024 * 1024)
+    lower = 0
+    for upper in SIZE_BUCKETS_MB:
+        if size_mb < upper:
+            return f"{lower}-{upper}MB"
+        lower = upper
+    return f"{lower}MB+"
+
+
+@dataclass
+class ProcessingBucket:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    failures: int = 0
+
+    def as_dict(self) -> dict:
+        average = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_seconds": round(average, 2),
+            "max_seconds": round(self.max_seconds, 2),
+            "failures": self.failures,
+        }
+
+
+@dataclass
+class _PendingFile:
+    client: object
+    name: str
+    future: asyncio.Future
+    size_bytes: int | None
+    started_at: float
+    next_poll_at: float
+    delay: float
+    polls: int = 0
+
+
+@dataclass
+class FileProcessingMetrics:
+    buckets: dict[str, ProcessingBucket] = field(default_factory=dict)
+
+    def record(self, size_bytes: int | None, seconds: float, *, failed: bool = False) -> None:
+        bucket = self.buckets.setdefault(size_bucket_label(size_bytes), ProcessingBucket())
+        if failed:
+            bucket.failures += 1
+            return
+        bucket.count += 1
+        bucket.total_seconds += seconds
+        bucket.max_seconds = max(bucket.max_seconds, seconds)
+
+    def stats(self) -> dict[str, dict]:
+        return {label: bucket.as_dict() for label, bucket in sorted(self.buckets.items())}
+
+    def format_stats(self) -> str:
+        return ", ".join(
+            f"{label}: n={values['count']} avg={values['avg_seconds']}s max={values['max_seconds']}s"
+            for label, values in self.stats().items()
+        ) or "no files processed"
+
+
+class GeminiFilePoller:
+    """Waits for uploaded Gemini files to become ACTIVE from a single polling task.
+
+    Every watched file gets its own exponential backoff schedule, and all files
+    that are due are checked together, so many parallel uploads cost one task
+    rather than one sleeping worker each. Processing time is recorded per file
+    size bucket to help tune chunk lengths.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_delay: float = GEMINI_FILE_POLL_INITIAL_SECONDS,
+        max_delay: float = GEMINI_FILE_POLL_MAX_SECONDS,
+        timeout: float = GEMINI_FILE_PROCESSING_TIMEOUT_SECONDS,
+    ) -> None:
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.metrics = FileProcessingMetrics()
+        self._pending: dict[str, _PendingFile] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def _state_name(uploaded) -> str | None:
+        return getattr(getattr(uploaded, "state", None), "name", None)
+
+    async def wait_until_active(self, client, uploaded, *, size_bytes: int | None = None):
+        state_name = self._state_name(uploaded)
+        if size_bytes is None:
+            size_bytes = getattr(uploaded, "size_bytes", None)
+        if state_name in (None, "ACTIVE", "SUCCEEDED"):
+            self.metrics.record(size_bytes, 0.0)
+            return uploaded
+        if state_name == "FAILED":
+            self.metrics.record(size_bytes, 0.0, failed=True)
+            raise RuntimeError(f"Gemini file processing failed for {uploaded.name}.")
+
+        existing = self._pending.get(uploaded.name)
+        if existing is not None:
+            return await asyncio.shield(existing.future)
+
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        pending = _PendingFile(
+            client=client,
+            name=uploaded.name,
+            future=loop.create_future(),
+            size_bytes=size_bytes,
+            started_at=now,
+            next_poll_at=now + self.initial_delay,
+            delay=self.initial_delay,
+        )
+        self._pending[uploaded.name] = pending
+        self._ensure_running(loop)
+        self._wakeup.set()
+        return await asyncio.shield(pending.future)
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            now = time.monotonic()
+            due = [pending for pending in self._pending.values() if pending.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(pending) for pending in due))
+                continue
+            next_due = min(pending.next_poll_at for pending in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_due - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, pending: _PendingFile) -> None:
+        pending.polls += 1
+        elapsed = time.monotonic() - pending.started_at
+        try:
+            uploaded = await pending.client.aio.files.get(name=pending.name)
+        except Exception as exc:
+            # Transient lookup errors just push the next attempt out.
+            logger.debug("Polling Gemini file %s failed: %s", pending.name, exc)
+            uploaded = None
+
+        state_name = self._state_name(uploaded) if uploaded is not None else "PROCESSING"
+        if state_name in (None, "ACTIVE", "SUCCEEDED"):
+            self._finish(pending, result=uploaded, elapsed=elapsed)
+        elif state_name == "FAILED":
+            self._finish(pending, error=RuntimeError(f"Gemini file processing failed for {pending.name}."), elapsed=elapsed)
+        elif elapsed >= self.timeout:
+            self._finish(
+                pending,
+                error=RuntimeError(f"Gemini file {pending.name} was still processing after {elapsed:.0f}s."),
+                elapsed=elapsed,
+            )
+        else:
+            pending.delay = min(self.max_delay, pending.delay * BACKOFF_FACTOR)
+            pending.next_poll_at = time.monotonic() + pending.delay
+
+    def _finish(self, pending: _PendingFile, *, elapsed: float, result=None, error: Exception | None = None) -> None:
+        self._pending.pop(pending.name, None)
+        self.metrics.record(pending.size_bytes, elapsed, failed=error is not None)
+        if error is None:
+            logger.info(
+                "Gemini file %s (%s) became active after %.1fs and %s polls.",
+                pending.name,
+                size_bucket_label(pending.size_bytes),
+                elapsed,
+                pending.polls,
+            )
+        if pending.future.done():
+            return
+        if error is not None:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(result)
+
+    def stats(self) -> dict[str, dict]:
+        return self.metrics.stats()
+
+
+gemini_file_poller = GeminiFilePoller()
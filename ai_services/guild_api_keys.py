@@ -8,6 +8,7 @@ from data_store.db_repository import (
     mark_guild_api_key_invalid,
     mark_guild_api_key_valid,
 )
+from data_store.guild_key_cache import guild_key_cache
 
 
 GEMINI_PROVIDER = "gemini"
@@ -38,12 +39,19 @@ def get_required_guild_gemini_api_key(discord_guild_id: int) -> str:
 @contextmanager
 def use_guild_gemini_api_key(discord_guild_id: int):
     api_key = get_required_guild_gemini_api_key(discord_guild_id)
-    with use_gemini_api_key(api_key):
+    with use_gemini_api_key(api_key, guild_id=discord_guild_id):
         yield api_key
 
 
 def record_guild_gemini_key_success(discord_guild_id: int) -> None:
-    mark_guild_api_key_valid(discord_guild_id, provider=GEMINI_PROVIDER)
+    # Validity is a health signal, not an audit log: write it at most once per interval.
+    if not guild_key_cache.should_mark_valid(discord_guild_id, GEMINI_PROVIDER):
+        return
+    try:
+        mark_guild_api_key_valid(discord_guild_id, provider=GEMINI_PROVIDER)
+    except Exception:
+        guild_key_cache.forget_validation(discord_guild_id, GEMINI_PROVIDER)
+        raise
 
 
 def mark_guild_gemini_key_auth_failure(discord_guild_id: int, exc: Exception) -> bool:
@@ -0,0 +1,310 @@
+import asyncio
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+
+from config import (
+    REFERENCE_IMAGE_CACHE_DISK_MB,
+    REFERENCE_IMAGE_CACHE_MEMORY_MB,
+    REFERENCE_IMAGE_CACHE_PATH,
+    REFERENCE_IMAGE_MAX_EDGE,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SOURCE_INDEX_FILENAME = "sources.json"
+DISCORD_CDN_HOSTS = {"cdn.discordapp.com", "media.discordapp.net"}
+FETCH_TIMEOUT_SECONDS = 30
+EXTENSION_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+
+
+def _url_key(url: str) -> str:
+    # Discord CDN links carry expiring signature parameters; the path alone names the attachment.
+    # Other hosts may use the query to pick the resource, so their URLs are kept whole.
+    parts = urlsplit(url)
+    if (parts.hostname or "").lower() not in DISCORD_CDN_HOSTS:
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _candidate_urls(source) -> list[str]:
+    if isinstance(source, dict):
+        urls = [source.get("url"), source.get("proxy_url")]
+    elif isinstance(source, (str, Path)):
+        urls = [str(source)]
+    else:
+        urls = [getattr(source, "url", None), getattr(source, "proxy_url", None)]
+    return [str(url) for url in urls if url]
+
+
+def _inline_bytes(source) -> tuple[bytes, str | None] | None:
+    if isinstance(source, dict):
+        data, mime_type = source.get("image_bytes"), source.get("content_type")
+    else:
+        data, mime_type = getattr(source, "image_bytes", None), getattr(source, "content_type", None)
+    return (data, mime_type) if data else None
+
+
+def _local_path(source) -> Path | None:
+    if isinstance(source, (str, Path)):
+        path = Path(source).expanduser()
+        if path.exists():
+            return path
+    return None
+
+
+def _downscale_image(data: bytes, mime_type: str, max_edge: int) -> tuple[bytes, str]:
+    """Fit the image inside `max_edge` pixels and re-encode it with ffmpeg.
+
+    PNGs stay PNG so transparency survives; everything else becomes JPEG. The
+    original is kept when ffmpeg is unavailable or the result is not smaller.
+    """
+    output_mime = "image/png" if mime_type == "image/png" else "image/jpeg"
+    codec_args = ["-c:v", "png"] if output_mime == "image/png" else ["-c:v", "mjpeg", "-q:v", "3"]
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                "pipe:0",
+                "-frames:v",
+                "1",
+                "-vf",
+                f"scale=w='min(iw,{max_edge})':h='min(ih,{max_edge})':force_original_aspect_ratio=decrease",
+                *codec_args,
+                "-f",
+                "image2pipe",
+                "pipe:1",
+            ],
+            input=data,
+            capture_output=True,
+            check=True,
+        )
+    except Exception as exc:
+        logger.warning("Could not downscale reference image, keeping the original: %s", exc)
+        return data, mime_type
+    if not result.stdout or len(result.stdout) >= len(data):
+        return data, mime_type
+    return result.stdout, output_mime
+
+
+class ReferenceImageCache:
+    """Content-addressed store of reference images, downscaled for the image models.
+
+    Images are keyed by the SHA-256 of the original bytes and stored after being
+    fitted inside `max_edge` pixels, on disk under `cache_dir/blobs` and in a
+    byte-bounded in-memory LRU. A source index maps each URL (Discord CDN links
+    without their expiring query string) or local file to the digest of its
+    content, so a known attachment is served without downloading it again. Both
+    tiers evict least recently used entries once they pass their size budget.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        max_edge: int = REFERENCE_IMAGE_MAX_EDGE,
+        max_memory_bytes: int = REFERENCE_IMAGE_CACHE_MEMORY_MB * 1024 * 1024,
+        max_disk_bytes: int = REFERENCE_IMAGE_CACHE_DISK_MB * 1024 * 1024,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.blob_dir = cache_dir / "blobs"
+        self.index_path = cache_dir / SOURCE_INDEX_FILENAME
+        self.max_edge = max_edge
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: int | None = None
+        self._sources: dict[str, str] | None = None
+        self._in_flight: dict[str, asyncio.Future] = {}
+        # Lookups and stores run in worker threads; the lock keeps the index and LRU consistent.
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def source_key(self, source) -> str | None:
+        path = _local_path(source)
+        if path is not None:
+            stat = path.stat()
+            return f"file:{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+        urls = _candidate_urls(source)
+        return f"url:{_url_key(urls[0])}" if urls else None
+
+    def _load_sources(self) -> dict[str, str]:
+        if self._sources is None:
+            try:
+                self._sources = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._sources = {}
+        return self._sources
+
+    def _save_sources(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self._load_sources()), encoding="utf-8")
+        os.replace(temp_path, self.index_path)
+
+    def _blob_path(self, digest: str, mime_type: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}{mimetypes.guess_extension(mime_type) or '.bin'}"
+
+    def _remember(self, digest: str, data: bytes, mime_type: str) -> None:
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return
+        self._memory[digest] = (data, mime_type)
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _digest, (evicted, _mime) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _read_digest(self, digest: str) -> tuple[bytes, str] | None:
+        cached = self._memory.get(digest)
+        if cached is not None:
+            self._memory.move_to_end(digest)
+            return cached
+        for blob_path in self.blob_dir.glob(f"{digest[:2]}/{digest}.*"):
+            try:
+                data = blob_path.read_bytes()
+                os.utime(blob_path)
+            except OSError:
+                continue
+            mime_type = mimetypes.guess_type(blob_path.name)[0] or "image/png"
+            self._remember(digest, data, mime_type)
+            return data, mime_type
+        return None
+
+    def _evict_disk(self) -> None:
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(path.stat().st_size for path in self.blob_dir.glob("*/*") if path.is_file())
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        blobs = [path for path in self.blob_dir.glob("*/*") if path.is_file()]
+        for blob_path in sorted(blobs, key=lambda path: path.stat().st_mtime):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            size = blob_path.stat().st_size
+            blob_path.unlink(missing_ok=True)
+            self._disk_bytes -= size
+            self._memory_bytes -= len(self._memory.pop(blob_path.stem, (b"", ""))[0])
+
+    def _index_source(self, source_key: str | None, digest: str) -> None:
+        if source_key and self._load_sources().get(source_key) != digest:
+            self._sources[source_key] = digest
+            self._save_sources()
+
+    def _store(self, source_key: str | None, data: bytes, mime_type: str | None) -> tuple[bytes, str]:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            cached = self._read_digest(digest)
+            if cached is not None:
+                self._index_source(source_key, digest)
+                return cached
+        # Re-encoding can take a while; other threads keep serving lookups meanwhile.
+        processed, processed_mime = _downscale_image(data, mime_type or "image/png", self.max_edge)
+        with self._lock:
+            cached = self._read_digest(digest)
+            if cached is None:
+                blob_path = self._blob_path(digest, processed_mime)
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                blob_path.write_bytes(processed)
+                if self._disk_bytes is not None:
+                    self._disk_bytes += len(processed)
+                self._remember(digest, processed, processed_mime)
+                self._evict_disk()
+                cached = processed, processed_mime
+            self._index_source(source_key, digest)
+            return cached
+
+    def _lookup(self, source) -> tuple[str | None, tuple[bytes, str] | None]:
+        """Resolve a source from the cache without fetching it; also returns its source key."""
+        source_key = self.source_key(source)
+        inline = _inline_bytes(source)
+        if inline is not None:
+            return source_key, self._store(source_key, *inline)
+        with self._lock:
+            digest = self._load_sources().get(source_key) if source_key else None
+            cached = self._read_digest(digest) if digest else None
+        path = _local_path(source)
+        if cached is None and path is not None:
+            mime_type = EXTENSION_MIME_TYPES.get(path.suffix.lower(), "image/png")
+            cached = self._store(source_key, path.read_bytes(), mime_type)
+        return source_key, cached
+
+    async def _fetch(self, urls: list[str]) -> tuple[bytes, str | None]:
+        last_error: Exception | None = None
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": "AIDM/1.0"}) as session:
+            for url in urls:
+                try:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        return await response.read(), response.content_type
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    last_error = exc
+        raise last_error or ValueError("No URL to fetch.")
+
+    async def load(self, source) -> tuple[bytes, str]:
+        """Return `(image_bytes, mime_type)` for a reference image, downloading it only on a miss.
+
+        Accepts context assets, attachment dicts, URLs and local paths. Concurrent
+        loads of the same source share one download.
+        """
+        source_key, cached = await asyncio.to_thread(self._lookup, source)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        urls = _candidate_urls(source)
+        if not urls:
+            raise ValueError(f"Unsupported image source: {source!r}")
+
+        pending = self._in_flight.get(source_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[source_key] = future
+        try:
+            self.misses += 1
+            data, mime_type = await self._fetch(urls)
+            result = await asyncio.to_thread(self._store, source_key, data, mime_type)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieve the exception so a future nobody else awaited does not log a warning.
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(source_key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+
+reference_image_cache = ReferenceImageCache(REFERENCE_IMAGE_CACHE_PATH)
@@ -1,5 +1,7 @@
+import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, asdict
 from typing import Any
 
@@ -264,7 +266,7 @@ class ScenePipeline:
             campaign_style_shift=self._extract_campaign_style_shift(context_packet),
             max_scenes_cap=max_scenes_cap,
         )
-        raw = gemini_client.generate_summary_text(prompt)
+        raw = await gemini_client.generate_summary_text_async(prompt)
         payload = self._extract_json_payload(raw)
         scenes = payload.get("scenes", []) if isinstance(payload, dict) else []
         if not isinstance(scenes, list):
@@ -286,7 +288,7 @@ class ScenePipeline:
             context_text=self._entries_text(context_packet),
             max_scenes_cap=max_scenes_cap,
         )
-        raw = gemini_client.generate_summary_text(prompt)
+        raw = await gemini_client.generate_summary_text_async(prompt)
         payload = self._extract_json_payload(raw)
         selected_ids = payload.get("selected_scene_ids", []) if isinstance(payload, dict) else []
         rationale = payload.get("selection_rationale") if isinstance(payload, dict) else None
@@ -311,7 +313,7 @@ class ScenePipeline:
             context_text=self._entries_text(context_packet),
             campaign_style_shift=self._extract_campaign_style_shift(context_packet),
         )
-        raw = gemini_client.generate_summary_text(prompt)
+        raw = await gemini_client.generate_summary_text_async(prompt)
         payload = self._extract_json_payload(raw)
         if not isinstance(payload, dict):
             raise ValueError("Direct image brief did not return an object.")
@@ -398,5 +400,68 @@ class ScenePipeline:
             model_name=model_name,
         )
 
+    async def render_image_requests(
+        self,
+        requests: list[PreparedImageRequest],
+        *,
+        extra_references: list | None = None,
+    ) -> AsyncIterator[tuple[int, PreparedImageRequest, list[dict] | Exception]]:
+        """Render all requests at once and yield `(index, request, images)` in request order.
+
+        Every distinct reference image in the batch is loaded once and the same
+        parts are shared by all requests. Renders run as background Gemini
+        requests, so the limiter's per-guild background pool bounds how many are
+        in flight. A failed render yields its exception in place of the images;
+        leaving the loop early cancels the renders still running.
+        """
+        shared_sources: dict[tuple, object] = {}
+        for request in requests:
+            for asset in request.reference_assets:
+                if asset.is_image:
+                    shared_sources.setdefault(("asset", asset.url, asset.source_message_id), asset)
+        for reference in extra_references or []:
+            shared_sources.setdefault(("extra", str(reference)), reference)
+
+        loaded_parts = await gemini_client.load_reference_parts_async(list(shared_sources.values()))
+        parts_by_key = dict(zip(shared_sources, loaded_parts))
+        extra_parts = [
+            part
+            for part in (parts_by_key[("extra", str(reference))] for reference in extra_references or [])
+            if part is not None
+        ]
+
+        def reference_parts_for(request: PreparedImageRequest) -> list:
+            parts = [
+                parts_by_key[("asset", asset.url, asset.source_message_id)]
+                for asset in request.reference_assets
+                if asset.is_image
+            ]
+            return [*(part for part in parts if part is not None), *extra_parts]
+
+        tasks = [
+            asyncio.create_task(
+                gemini_client.generate_image_async(
+                    request.prompt,
+                    model_name=request.model_name,
+                    aspect_ratio=request.aspect_ratio,
+                    reference_images=reference_parts_for(request),
+                )
+            )
+            for request in requests
+        ]
+        try:
+            for index, (request, task) in enumerate(zip(requests, tasks), start=1):
+                try:
+                    result: list[dict] | Exception = await task
+                except Exception as exc:
+                    logger.warning("Image render for %r failed: %s", request.title, exc)
+                    result = exc
+                yield index, request, result
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Collect the results so renders that already failed do not log unretrieved exceptions.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 
 scene_pipeline = ScenePipeline()
@@ -10,22 +10,61 @@ except Exception:  # pragma: no cover - optional runtime dependency guard
     voice_recv = None
 
 from ai_services.assistant_interactions import get_assistant_response
-from config import DISCORD_BOT_TOKEN, DISCORD_GUILD_ID, VOICE_AUTOJOIN_CHANNEL_NAME, client, tree
+from ai_services.context_compiler import context_packet_cache
+from ai_services.gemini_client import gemini_limiter
+from ai_services.reference_image_cache import reference_image_cache
+from config import (
+    DISCORD_BOT_TOKEN,
+    DISCORD_GUILD_ID,
+    RUNTIME_STATS_LOG_SECONDS,
+    VOICE_AUTOJOIN_CHANNEL_NAME,
+    client,
+    tree,
+)
+from data_store import async_db_repository
 from data_store.db_repository import (
+    close_db_pool,
     delete_campaign_record,
     delete_channel_record,
     delete_thread_record,
     ensure_runtime_schema,
     get_campaign_runtime_targets,
+    get_db_pool_stats,
+)
+from data_store.memory_name_cache import memory_name_cache
+from data_store.routing_cache import routing_cache
+from data_store.utils import (
+    category_threads,
+    refresh_thread_data,
+    remove_campaign_from_snapshot,
+    remove_channel_from_snapshot,
+    remove_thread_from_snapshot,
 )
-from data_store.utils import load_thread_data
 from discord_app import bot_commands, message_handlers
-from voice.transcription import VoiceRecorder
+from discord_app.thread_index import thread_index
+from voice.post_session_jobs import post_session_jobs
+from voice.session_registry import voice_sessions
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s:%(message)s")
 
-recorder = VoiceRecorder()
+_stats_task: asyncio.Task | None = None
+
+
+async def log_runtime_stats():
+    while True:
+        await asyncio.sleep(RUNTIME_STATS_LOG_SECONDS)
+        logging.info(
+            "Runtime stats: db_pool=%s async_db_pool=%s routing_cache=%s memory_name_cache=%s "
+            "context_packet_cache=%s reference_image_cache=%s gemini_limiter=%s",
+            get_db_pool_stats(),
+            await async_db_repository.get_db_pool_stats(),
+            routing_cache.stats(),
+            memory_name_cache.stats(),
+            context_packet_cache.stats(),
+            reference_image_cache.stats(),
+            gemini_limiter.stats(),
+        )
 
 
 @client.event
@@ -51,16 +90,60 @@ async def on_ready():
     except Exception as exc:
         logging.error("Error syncing commands: %s", exc)
 
-    load_thread_data()
+    try:
+        await refresh_thread_data()
+    except Exception as exc:
+        logging.warning("Failed to load thread data snapshot: %s", exc)
+    for guild in client.guilds:
+        thread_index.seed_guild(guild)
+        thread_index.warm_channels(
+            channel for channel in guild.text_channels if str(channel.category_id) in category_threads
+        )
     client.event(message_handlers.on_message)
+    await post_session_jobs.start()
+    global _stats_task
+    if RUNTIME_STATS_LOG_SECONDS > 0 and _stats_task is None:
+        _stats_task = asyncio.create_task(log_runtime_stats(), name="runtime-stats")
     logging.info("Bot is ready.")
 
 
+@client.event
+async def on_thread_create(thread):
+    thread_index.upsert(thread)
+
+
+@client.event
+async def on_thread_update(before, after):
+    thread_index.upsert(after)
+
+
+@client.event
+async def on_raw_thread_delete(payload):
+    thread_index.remove_thread(payload.thread_id, payload.parent_id)
+
+
+@client.event
+async def on_raw_message_edit(payload):
+    context_packet_cache.invalidate(payload.channel_id)
+
+
+@client.event
+async def on_raw_message_delete(payload):
+    context_packet_cache.invalidate(payload.channel_id)
+
+
+@client.event
+async def on_raw_bulk_message_delete(payload):
+    context_packet_cache.invalidate(payload.channel_id)
+
+
 @client.event
 async def on_thread_delete(thread):
+    routing_cache.invalidate(thread_id=thread.id)
+    thread_index.remove_thread(thread.id, thread.parent_id)
     try:
+        remove_thread_from_snapshot(thread.id)
         await asyncio.to_thread(delete_thread_record, thread.id)
-        load_thread_data()
         logging.info("Thread %s removed from Supabase snapshot.", thread.id)
     except Exception as exc:
         logging.warning("Failed to delete thread %s from Supabase: %s", thread.id, exc)
@@ -68,6 +151,15 @@ async def on_thread_delete(thread):
 
 @client.event
 async def on_guild_channel_delete(channel):
+    if isinstance(channel, discord.CategoryChannel):
+        routing_cache.invalidate(category_id=channel.id)
+    elif isinstance(channel, discord.Thread):
+        routing_cache.invalidate(thread_id=channel.id)
+        thread_index.remove_thread(channel.id, channel.parent_id)
+    else:
+        routing_cache.invalidate(channel_id=channel.id)
+        thread_index.remove_channel(channel.id)
+        context_packet_cache.invalidate(channel.id)
     try:
         if isinstance(channel, discord.CategoryChannel):
             runtime_targets = await asyncio.to_thread(get_campaign_runtime_targets, channel.id)
@@ -101,12 +193,14 @@ async def on_guild_channel_delete(channel):
                         exc,
                     )
 
+            remove_campaign_from_snapshot(channel.id)
             await asyncio.to_thread(delete_campaign_record, channel.id)
         elif isinstance(channel, discord.Thread):
+            remove_thread_from_snapshot(channel.id)
             await asyncio.to_thread(delete_thread_record, channel.id)
         elif isinstance(channel, (discord.TextChannel, discord.VoiceChannel)):
+            remove_channel_from_snapshot(channel.id)
             await asyncio.to_thread(delete_channel_record, channel.id)
-        load_thread_data()
         logging.info("Channel deletion processed for %s.", channel.id)
     except Exception as exc:
         logging.warning("Failed to process channel deletion for %s: %s", channel.id, exc)
@@ -122,14 +216,16 @@ async def on_voice_state_update(member, before, after):
                 VOICE_AUTOJOIN_CHANNEL_NAME,
             )
             return
-        if not any(vc.channel.id == after.channel.id for vc in client.voice_clients):
+        if not voice_sessions.is_active(after.channel) and not any(
+            vc.channel.id == after.channel.id for vc in client.voice_clients
+        ):
             try:
                 if voice_recv is not None:
                     voice_client = await after.channel.connect(cls=voice_recv.VoiceRecvClient)
                 else:
                     voice_client = await after.channel.connect()
                 logging.info("Bot has joined the voice channel: %s", after.channel.name)
-                await recorder.capture_audio(voice_client)
+                await voice_sessions.run_session(voice_client)
             except discord.ClientException:
                 logging.info("Already connected to %s", after.channel.name)
             except Exception as exc:
@@ -147,8 +243,22 @@ async def on_voice_state_update(member, before, after):
 bot_commands.setup_commands(tree, get_assistant_response)
 
 
+async def _run_client():
+    async with client:
+        try:
+            await client.start(DISCORD_BOT_TOKEN)
+        finally:
+            if _stats_task is not None:
+                _stats_task.cancel()
+            await async_db_repository.close_db_pool()
+            await asyncio.to_thread(close_db_pool)
+
+
 def run_bot():
-    client.run(DISCORD_BOT_TOKEN)
+    try:
+        asyncio.run(_run_client())
+    except KeyboardInterrupt:
+        logging.info("Bot stopped.")
 
 
 if __name__ == "__main__":
@@ -21,6 +21,8 @@ AIDM_PROMPT_PATH = BASE_DIR / "prompts" / "system" / "aidm_prompt.txt"
 TRANSCRIPT_PATH = BASE_DIR / "transcript.txt"
 TRANSCRIPT_MANIFEST_PATH = BASE_DIR / "transcript_manifest.json"
 AUDIO_FILES_PATH = BASE_DIR / "audio_files"
+VOICE_SESSIONS_PATH = BASE_DIR / "voice_sessions"
+POST_SESSION_JOBS_DB_PATH = VOICE_SESSIONS_PATH / "post_session_jobs.sqlite3"
 VOICE_CONTEXT_DIR = BASE_DIR / "voice_context"
 
 
@@ -31,6 +33,8 @@ DM_ROLE_NAME = os.getenv("DM_ROLE_NAME", "DM")
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 AIDM_KEY_ENCRYPTION_KEY = os.getenv("AIDM_KEY_ENCRYPTION_KEY")
+GUILD_API_KEY_CACHE_TTL_SECONDS = float(os.getenv("GUILD_API_KEY_CACHE_TTL_SECONDS", "120"))
+GUILD_API_KEY_VALIDATION_INTERVAL_SECONDS = float(os.getenv("GUILD_API_KEY_VALIDATION_INTERVAL_SECONDS", "600"))
 GEMINI_CHAT_MODEL = os.getenv("GEMINI_CHAT_MODEL", "gemini-2.5-flash")
 GEMINI_TRANSCRIBE_MODEL = os.getenv("GEMINI_TRANSCRIBE_MODEL", GEMINI_CHAT_MODEL)
 GEMINI_SUMMARY_MODEL = os.getenv("GEMINI_SUMMARY_MODEL", GEMINI_CHAT_MODEL)
@@ -43,11 +47,25 @@ GEMINI_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", "8192"))
 GEMINI_TEMPERATURE = float(os.getenv("GEMINI_TEMPERATURE", "0.7"))
 GEMINI_TOP_P = float(os.getenv("GEMINI_TOP_P", "0.95"))
 GEMINI_TOP_K = int(os.getenv("GEMINI_TOP_K", "40"))
+GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENT_REQUESTS", "16"))
+GEMINI_MAX_CONCURRENT_REQUESTS_PER_GUILD = int(os.getenv("GEMINI_MAX_CONCURRENT_REQUESTS_PER_GUILD", "4"))
+GEMINI_MAX_CONCURRENT_BACKGROUND_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENT_BACKGROUND_REQUESTS", "2"))
+GEMINI_FILE_POLL_INITIAL_SECONDS = float(os.getenv("GEMINI_FILE_POLL_INITIAL_SECONDS", "0.5"))
+GEMINI_FILE_POLL_MAX_SECONDS = float(os.getenv("GEMINI_FILE_POLL_MAX_SECONDS", "8"))
+GEMINI_FILE_PROCESSING_TIMEOUT_SECONDS = float(os.getenv("GEMINI_FILE_PROCESSING_TIMEOUT_SECONDS", "300"))
+REFERENCE_IMAGE_CACHE_PATH = Path(os.getenv("REFERENCE_IMAGE_CACHE_PATH") or BASE_DIR / "reference_image_cache")
+REFERENCE_IMAGE_MAX_EDGE = int(os.getenv("REFERENCE_IMAGE_MAX_EDGE", "1024"))
+REFERENCE_IMAGE_CACHE_MEMORY_MB = int(os.getenv("REFERENCE_IMAGE_CACHE_MEMORY_MB", "64"))
+REFERENCE_IMAGE_CACHE_DISK_MB = int(os.getenv("REFERENCE_IMAGE_CACHE_DISK_MB", "512"))
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
+STREAM_EDIT_INTERVAL_SECONDS = float(os.getenv("STREAM_EDIT_INTERVAL_SECONDS", "1.2"))
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_API_KEY = os.getenv("SUPABASE_API_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY") or SUPABASE_API_KEY
 SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "aidm-session-archives")
+STORAGE_UPLOAD_CONCURRENCY = int(os.getenv("STORAGE_UPLOAD_CONCURRENCY", "4"))
+STORAGE_UPLOAD_CHUNK_BYTES = int(os.getenv("STORAGE_UPLOAD_CHUNK_BYTES", str(6 * 1024 * 1024)))
 DIRECT_CONNECTION_STRING = os.getenv("DIRECT_CONNECTION_STRING")
 SUPABASE_DB_HOST = os.getenv("SUPABASE_DB_HOST")
 SUPABASE_DB_PORT = int(os.getenv("SUPABASE_DB_PORT", "5432"))
@@ -55,9 +73,41 @@ SUPABASE_DB_NAME = os.getenv("SUPABASE_DB_NAME", "postgres")
 SUPABASE_DB_USER = os.getenv("SUPABASE_DB_USER")
 SUPABASE_DB_PASSWORD = os.getenv("SUPABASE_DB_PASSWORD")
 SUPABASE_DB_SSLMODE = os.getenv("SUPABASE_DB_SSLMODE", "require")
+SUPABASE_DB_POOL_MIN_SIZE = int(os.getenv("SUPABASE_DB_POOL_MIN_SIZE", "1"))
+SUPABASE_DB_POOL_MAX_SIZE = int(os.getenv("SUPABASE_DB_POOL_MAX_SIZE", "4"))
+SUPABASE_DB_ASYNC_POOL_MIN_SIZE = int(os.getenv("SUPABASE_DB_ASYNC_POOL_MIN_SIZE", "1"))
+SUPABASE_DB_ASYNC_POOL_MAX_SIZE = int(os.getenv("SUPABASE_DB_ASYNC_POOL_MAX_SIZE", "4"))
+SUPABASE_DB_POOL_TIMEOUT = float(os.getenv("SUPABASE_DB_POOL_TIMEOUT", "30"))
+SUPABASE_DB_POOL_MAX_IDLE = float(os.getenv("SUPABASE_DB_POOL_MAX_IDLE", "300"))
+SUPABASE_DB_POOL_MAX_LIFETIME = float(os.getenv("SUPABASE_DB_POOL_MAX_LIFETIME", "1800"))
+ROUTING_CACHE_TTL_SECONDS = float(os.getenv("ROUTING_CACHE_TTL_SECONDS", "300"))
+ROUTING_CACHE_MAX_ENTRIES = int(os.getenv("ROUTING_CACHE_MAX_ENTRIES", "4096"))
+MEMORY_NAME_CACHE_TTL_SECONDS = float(os.getenv("MEMORY_NAME_CACHE_TTL_SECONDS", "600"))
+CONTEXT_PACKET_CACHE_TTL_SECONDS = float(os.getenv("CONTEXT_PACKET_CACHE_TTL_SECONDS", "3600"))
+THREAD_INDEX_REFRESH_SECONDS = float(os.getenv("THREAD_INDEX_REFRESH_SECONDS", "900"))
+THREAD_INDEX_ARCHIVED_LIMIT = int(os.getenv("THREAD_INDEX_ARCHIVED_LIMIT", "100"))
+RUNTIME_STATS_LOG_SECONDS = float(os.getenv("RUNTIME_STATS_LOG_SECONDS", "900"))
 
 AUDIO_CHUNK_SECONDS = int(os.getenv("AUDIO_CHUNK_SECONDS", "1200"))
 AUDIO_SUMMARY_WINDOW_CHUNKS = int(os.getenv("AUDIO_SUMMARY_WINDOW_CHUNKS", "1"))
+TRANSCRIPTION_CONCURRENCY = int(os.getenv("TRANSCRIPTION_CONCURRENCY", "4"))
+AUDIO_SUMMARY_CONCURRENCY = int(os.getenv("AUDIO_SUMMARY_CONCURRENCY", "3"))
+POST_SESSION_WORKERS = int(os.getenv("POST_SESSION_WORKERS", "2"))
+POST_SESSION_MAX_ATTEMPTS = int(os.getenv("POST_SESSION_MAX_ATTEMPTS", "3"))
+MANIFEST_COMPACT_EVENTS = int(os.getenv("MANIFEST_COMPACT_EVENTS", "200"))
+TRANSCRIPTION_QUEUE_SIZE = int(os.getenv("TRANSCRIPTION_QUEUE_SIZE", "32"))
+TRANSCRIPTION_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPTION_MAX_ATTEMPTS", "3"))
+TRANSCRIPTION_RETRY_BASE_SECONDS = float(os.getenv("TRANSCRIPTION_RETRY_BASE_SECONDS", "2"))
+CAPTURE_TRIM_SILENCE = os.getenv("CAPTURE_TRIM_SILENCE", "true").lower() == "true"
+CAPTURE_SILENCE_DBFS = float(os.getenv("CAPTURE_SILENCE_DBFS", "-45"))
+CAPTURE_SILENCE_HANGOVER_SECONDS = float(os.getenv("CAPTURE_SILENCE_HANGOVER_SECONDS", "0.6"))
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("VAD_MIN_SPEECH_SECONDS", "1.5"))
+VAD_MIN_PAUSE_SECONDS = float(os.getenv("VAD_MIN_PAUSE_SECONDS", "0.8"))
+VAD_SPLIT_SEARCH_SECONDS = float(os.getenv("VAD_SPLIT_SEARCH_SECONDS", "30"))
+CAPTURE_AUDIO_CODEC = os.getenv("CAPTURE_AUDIO_CODEC", "flac").lower()
+CAPTURE_SAMPLE_RATE = int(os.getenv("CAPTURE_SAMPLE_RATE", "16000"))
+CAPTURE_OPUS_BITRATE = os.getenv("CAPTURE_OPUS_BITRATE", "32k")
 AUDIO_BITRATE = os.getenv("AUDIO_BITRATE", "128k")
 AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "44100"))
 AUDIO_CHANNELS = int(os.getenv("AUDIO_CHANNELS", "1"))
@@ -0,0 +1,387 @@
+"""Async counterparts of the hot-path `db_repository` functions.
+
+These share the connection settings of the sync repository but run on their
+own psycopg `AsyncConnectionPool`, sized by `SUPABASE_DB_ASYNC_POOL_*`, so
+Discord handlers can await them directly instead of hopping through
+`asyncio.to_thread`. The sync API stays in place for scripts and thread-bound
+code paths.
+"""
+
+import asyncio
+import logging
+
+import psycopg
+from psycopg_pool import AsyncConnectionPool
+
+from config import (
+    DM_ROLE_NAME,
+    SUPABASE_DB_ASYNC_POOL_MAX_SIZE,
+    SUPABASE_DB_ASYNC_POOL_MIN_SIZE,
+    SUPABASE_DB_POOL_MAX_IDLE,
+    SUPABASE_DB_POOL_MAX_LIFETIME,
+    SUPABASE_DB_POOL_TIMEOUT,
+)
+
+from .db_repository import (
+    ASSIGN_CHANNEL_MEMORY_SQL,
+    ASSIGN_THREAD_MEMORY_SQL,
+    CAMPAIGN_CONTEXT_BY_CATEGORY_SQL,
+    CHANNEL_ID_SQL,
+    DEFAULT_MEMORY_ID_SQL,
+    ENSURE_CAMPAIGN_SQL,
+    ENSURE_CHANNEL_SQL,
+    ENSURE_GUILD_SQL,
+    ENSURE_MEMORY_SQL,
+    ENSURE_THREAD_SQL,
+    LIST_MEMORY_NAMES_SQL,
+    MEMORY_ID_BY_NAME_SQL,
+    MEMORY_NAME_SQL,
+    MESSAGE_ROUTING_SQL,
+    SET_CHANNEL_ALWAYS_ON_SQL,
+    SET_DEFAULT_MEMORY_SQL,
+    SET_THREAD_ALWAYS_ON_SQL,
+    THREAD_ID_SQL,
+    CampaignContext,
+    MessageRouting,
+    _connection_params,
+    _message_routing_from_row,
+)
+from .memory_name_cache import memory_name_cache
+from .routing_cache import routing_cache
+
+
+logger = logging.getLogger(__name__)
+_pool: AsyncConnectionPool | None = None
+_pool_lock = asyncio.Lock()
+
+
+async def _get_pool() -> AsyncConnectionPool:
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            conninfo, connect_kwargs = _connection_params()
+            pool = AsyncConnectionPool(
+                conninfo,
+                kwargs=connect_kwargs,
+                min_size=SUPABASE_DB_ASYNC_POOL_MIN_SIZE,
+                max_size=max(SUPABASE_DB_ASYNC_POOL_MIN_SIZE, SUPABASE_DB_ASYNC_POOL_MAX_SIZE),
+                timeout=SUPABASE_DB_POOL_TIMEOUT,
+                max_idle=SUPABASE_DB_POOL_MAX_IDLE,
+                max_lifetime=SUPABASE_DB_POOL_MAX_LIFETIME,
+                check=AsyncConnectionPool.check_connection,
+                name="aidm-db-async",
+                open=False,
+            )
+            await pool.open()
+            _pool = pool
+            logger.info(
+                "Opened async database connection pool min_size=%s max_size=%s.",
+                pool.min_size,
+                pool.max_size,
+            )
+    return _pool
+
+
+async def get_db_pool_stats() -> dict[str, int]:
+    if _pool is None:
+        return {}
+    return _pool.get_stats()
+
+
+async def close_db_pool() -> None:
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            return
+        logger.info("Closing async database connection pool stats=%s", _pool.pop_stats())
+        await _pool.close()
+        _pool = None
+
+
+async def _ensure_guild(cur: psycopg.AsyncCursor, discord_guild_id: int, name: str, dm_role_name: str | None = None) -> str:
+    await cur.execute(
+        ENSURE_GUILD_SQL,
+        (discord_guild_id, name, dm_role_name or DM_ROLE_NAME),
+    )
+    return str((await cur.fetchone())["id"])
+
+
+async def _ensure_campaign(cur: psycopg.AsyncCursor, guild_id: str, discord_category_id: int, name: str) -> str:
+    await cur.execute(
+        ENSURE_CAMPAIGN_SQL,
+        (guild_id, discord_category_id, name),
+    )
+    return str((await cur.fetchone())["id"])
+
+
+async def get_or_create_campaign_context(
+    discord_guild_id: int,
+    guild_name: str,
+    discord_category_id: int,
+    category_name: str,
+    dm_role_name: str | None = None,
+) -> CampaignContext:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            guild_id = await _ensure_guild(cur, discord_guild_id, guild_name, dm_role_name)
+            campaign_id = await _ensure_campaign(cur, guild_id, discord_category_id, category_name)
+        await conn.commit()
+    memory_name_cache.invalidate_category(discord_category_id)
+    return CampaignContext(guild_id=guild_id, campaign_id=campaign_id)
+
+
+async def get_campaign_context_by_category(discord_category_id: int) -> CampaignContext | None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                CAMPAIGN_CONTEXT_BY_CATEGORY_SQL,
+                (discord_category_id,),
+            )
+            row = await cur.fetchone()
+    if not row:
+        return None
+    return CampaignContext(guild_id=str(row["guild_id"]), campaign_id=str(row["campaign_id"]))
+
+
+async def ensure_memory(campaign_id: str, memory_name: str, provider: str = "gemini", provider_ref: str | None = None) -> str:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                ENSURE_MEMORY_SQL,
+                (campaign_id, memory_name, provider, provider_ref),
+            )
+            row = await cur.fetchone()
+        await conn.commit()
+    memory_name_cache.invalidate_category(row["discord_category_id"])
+    return str(row["id"])
+
+
+async def get_memory_id_by_name(campaign_id: str, memory_name: str) -> str | None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                MEMORY_ID_BY_NAME_SQL,
+                (campaign_id, memory_name),
+            )
+            row = await cur.fetchone()
+    return str(row["id"]) if row else None
+
+
+async def get_memory_name(memory_id: str) -> str | None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(MEMORY_NAME_SQL, (memory_id,))
+            row = await cur.fetchone()
+    return row["name"] if row else None
+
+
+async def set_default_memory(campaign_id: str, memory_id: str) -> None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                SET_DEFAULT_MEMORY_SQL,
+                (memory_id, campaign_id),
+            )
+        await conn.commit()
+    routing_cache.clear()
+
+
+async def ensure_channel(
+    campaign_id: str,
+    discord_channel_id: int,
+    name: str,
+    always_on: bool = False,
+    is_dm_private: bool = False,
+) -> str:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                ENSURE_CHANNEL_SQL,
+                (campaign_id, discord_channel_id, name, always_on, is_dm_private),
+            )
+            channel_id = str((await cur.fetchone())["id"])
+        await conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
+    return channel_id
+
+
+async def ensure_channel_for_category(
+    discord_category_id: int,
+    discord_channel_id: int,
+    name: str,
+    always_on: bool = False,
+    is_dm_private: bool = False,
+) -> str:
+    context = await get_campaign_context_by_category(discord_category_id)
+    if not context:
+        raise ValueError(f"Campaign for category {discord_category_id} does not exist.")
+    return await ensure_channel(context.campaign_id, discord_channel_id, name, always_on, is_dm_private)
+
+
+async def ensure_thread(channel_id: str, discord_thread_id: int, name: str, always_on: bool = False) -> str:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                ENSURE_THREAD_SQL,
+                (channel_id, discord_thread_id, name, always_on),
+            )
+            thread_id = str((await cur.fetchone())["id"])
+        await conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
+    return thread_id
+
+
+async def ensure_thread_for_channel(
+    discord_channel_id: int,
+    discord_thread_id: int,
+    name: str,
+    always_on: bool = False,
+) -> str:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(CHANNEL_ID_SQL, (discord_channel_id,))
+            row = await cur.fetchone()
+            if not row:
+                raise ValueError(f"Channel {discord_channel_id} is not registered in the database.")
+    return await ensure_thread(str(row["id"]), discord_thread_id, name, always_on)
+
+
+async def assign_memory_to_channel(discord_channel_id: int, memory_id: str) -> None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(CHANNEL_ID_SQL, (discord_channel_id,))
+            row = await cur.fetchone()
+            if not row:
+                raise ValueError(f"Channel {discord_channel_id} is not registered in the database.")
+            await cur.execute(
+                ASSIGN_CHANNEL_MEMORY_SQL,
+                (row["id"], memory_id),
+            )
+        await conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
+
+
+async def assign_memory_to_thread(discord_thread_id: int, memory_id: str) -> None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(THREAD_ID_SQL, (discord_thread_id,))
+            row = await cur.fetchone()
+            if not row:
+                raise ValueError(f"Thread {discord_thread_id} is not registered in the database.")
+            await cur.execute(
+                ASSIGN_THREAD_MEMORY_SQL,
+                (row["id"], memory_id),
+            )
+        await conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
+
+
+async def set_channel_always_on(discord_channel_id: int, always_on: bool) -> None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                SET_CHANNEL_ALWAYS_ON_SQL,
+                (always_on, discord_channel_id),
+            )
+        await conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
+
+
+async def set_thread_always_on(discord_thread_id: int, always_on: bool) -> None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                SET_THREAD_ALWAYS_ON_SQL,
+                (always_on, discord_thread_id),
+            )
+        await conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
+
+
+async def get_default_memory_id(discord_category_id: int) -> str | None:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                DEFAULT_MEMORY_ID_SQL,
+                (discord_category_id,),
+            )
+            row = await cur.fetchone()
+    return str(row["default_memory_id"]) if row and row["default_memory_id"] else None
+
+
+async def resolve_message_routing(
+    discord_channel_id: int,
+    discord_category_id: int | None,
+    discord_thread_id: int | None = None,
+) -> MessageRouting:
+    cache_key = routing_cache.make_key(discord_category_id, discord_channel_id, discord_thread_id)
+    cached = routing_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                MESSAGE_ROUTING_SQL,
+                {
+                    "thread_id": discord_thread_id,
+                    "channel_id": discord_channel_id,
+                    "category_id": discord_category_id,
+                },
+            )
+            row = await cur.fetchone()
+    routing = _message_routing_from_row(row)
+    routing_cache.set(cache_key, routing)
+    return routing
+
+
+async def list_memory_names(discord_category_id: int) -> list[str]:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                LIST_MEMORY_NAMES_SQL,
+                (discord_category_id,),
+            )
+            rows = await cur.fetchall()
+    return [row["name"] for row in rows]
+
+
+async def get_campaign_memory_names(discord_category_id: int) -> tuple[str | None, list[str]]:
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                select campaigns.id as campaign_id, memories.name
+                from campaigns
+                left join memories on memories.campaign_id = campaigns.id
+                where campaigns.discord_category_id = %s
+                order by memories.name
+                """,
+                (discord_category_id,),
+            )
+            rows = await cur.fetchall()
+    if not rows:
+        return None, []
+    return str(rows[0]["campaign_id"]), [row["name"] for row in rows if row["name"]]
+
+
+async def search_memory_names(discord_category_id: int, current: str = "") -> list[str]:
+    return await memory_name_cache.search(discord_category_id, current, get_campaign_memory_names)
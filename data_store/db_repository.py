@@ -1,23 +1,37 @@
 import logging
+import threading
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 
 from config import AIDM_KEY_ENCRYPTION_KEY, DIRECT_CONNECTION_STRING, DM_ROLE_NAME, SUPABASE_URL
 from config import (
     SUPABASE_DB_HOST,
     SUPABASE_DB_NAME,
     SUPABASE_DB_PASSWORD,
+    SUPABASE_DB_POOL_MAX_IDLE,
+    SUPABASE_DB_POOL_MAX_LIFETIME,
+    SUPABASE_DB_POOL_MAX_SIZE,
+    SUPABASE_DB_POOL_MIN_SIZE,
+    SUPABASE_DB_POOL_TIMEOUT,
     SUPABASE_DB_PORT,
     SUPABASE_DB_SSLMODE,
     SUPABASE_DB_USER,
 )
 
+from .guild_key_cache import MISSING, guild_key_cache
+from .memory_name_cache import memory_name_cache
+from .routing_cache import routing_cache
+
 
 logger = logging.getLogger(__name__)
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
 
 
 DEFAULT_MEMORY_NAMES = ("gameplay", "out-of-game", "dm-private", "worldbuilding")
@@ -48,6 +62,13 @@ class CampaignContext:
     campaign_id: str
 
 
+@dataclass
+class MessageRouting:
+    always_on: bool = False
+    memory_id: str | None = None
+    memory_name: str | None = None
+
+
 @dataclass
 class CampaignImageSettings:
     session_image_mode: str = "off"
@@ -70,17 +91,18 @@ class GuildApiKeyStatus:
     updated_at: datetime | None = None
 
 
-def _connect() -> psycopg.Connection:
+def _connection_params() -> tuple[str, dict[str, Any]]:
     if SUPABASE_DB_HOST and SUPABASE_DB_USER and SUPABASE_DB_PASSWORD:
-        return psycopg.connect(
-            host=SUPABASE_DB_HOST,
-            port=SUPABASE_DB_PORT,
-            dbname=SUPABASE_DB_NAME,
-            user=SUPABASE_DB_USER,
-            password=SUPABASE_DB_PASSWORD,
-            sslmode=SUPABASE_DB_SSLMODE,
-            row_factory=dict_row,
-        )
+        return "", {
+            "host": SUPABASE_DB_HOST,
+            "port": SUPABASE_DB_PORT,
+            "dbname": SUPABASE_DB_NAME,
+            "user": SUPABASE_DB_USER,
+            "password": SUPABASE_DB_PASSWORD,
+            "sslmode": SUPABASE_DB_SSLMODE,
+            "row_factory": dict_row,
+            **_pooler_kwargs(SUPABASE_DB_HOST, SUPABASE_DB_PORT),
+        }
 
     if not DIRECT_CONNECTION_STRING:
         raise RuntimeError(
@@ -117,12 +139,74 @@ def _connect() -> psycopg.Connection:
             "user": user,
             "password": password,
             "row_factory": dict_row,
+            **_pooler_kwargs(host, int(port or 5432)),
         }
         if "sslmode=require" in query_string or "pooler.supabase.com" in host:
             connect_kwargs["sslmode"] = "require"
-        return psycopg.connect(**connect_kwargs)
+        return "", connect_kwargs
+
+    return connection_string, {"row_factory": dict_row}
+
+
+def _pooler_kwargs(host: str | None, port: int | None) -> dict[str, Any]:
+    # Supavisor in transaction mode (port 6543) hands each transaction to a
+    # different backend, so server-side prepared statements cannot be reused.
+    if host and "pooler.supabase.com" in host and port == 6543:
+        return {"prepare_threshold": None}
+    return {}
+
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            conninfo, connect_kwargs = _connection_params()
+            _pool = ConnectionPool(
+                conninfo,
+                kwargs=connect_kwargs,
+                min_size=SUPABASE_DB_POOL_MIN_SIZE,
+                max_size=max(SUPABASE_DB_POOL_MIN_SIZE, SUPABASE_DB_POOL_MAX_SIZE),
+                timeout=SUPABASE_DB_POOL_TIMEOUT,
+                max_idle=SUPABASE_DB_POOL_MAX_IDLE,
+                max_lifetime=SUPABASE_DB_POOL_MAX_LIFETIME,
+                check=ConnectionPool.check_connection,
+                name="aidm-db",
+                open=True,
+            )
+            logger.info(
+                "Opened database connection pool min_size=%s max_size=%s.",
+                _pool.min_size,
+                _pool.max_size,
+            )
+    return _pool
+
+
+def _connect() -> AbstractContextManager[psycopg.Connection]:
+    """Borrow a connection from the process-wide pool.
+
+    The connection is checked before it is handed out, so sockets dropped by the
+    Supabase pooler are replaced transparently. On exit the transaction is
+    committed (or rolled back on error) and the connection returns to the pool.
+    """
+    return _get_pool().connection()
+
+
+def get_db_pool_stats() -> dict[str, int]:
+    if _pool is None:
+        return {}
+    return _pool.get_stats()
 
-    return psycopg.connect(connection_string, row_factory=dict_row)
+
+def close_db_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            return
+        logger.info("Closing database connection pool stats=%s", _pool.pop_stats())
+        _pool.close()
+        _pool = None
 
 
 def ensure_runtime_schema() -> None:
@@ -160,33 +244,39 @@ def ensure_runtime_schema() -> None:
         conn.commit()
 
 
+ENSURE_GUILD_SQL = """
+    insert into guilds (discord_guild_id, name, dm_role_name)
+    values (%s, %s, %s)
+    on conflict (discord_guild_id)
+    do update set
+      name = excluded.name,
+      dm_role_name = excluded.dm_role_name
+    returning id
+"""
+
+
 def _ensure_guild(cur: psycopg.Cursor, discord_guild_id: int, name: str, dm_role_name: str | None = None) -> str:
     cur.execute(
-        """
-        insert into guilds (discord_guild_id, name, dm_role_name)
-        values (%s, %s, %s)
-        on conflict (discord_guild_id)
-        do update set
-          name = excluded.name,
-          dm_role_name = excluded.dm_role_name
-        returning id
-        """,
+        ENSURE_GUILD_SQL,
         (discord_guild_id, name, dm_role_name or DM_ROLE_NAME),
     )
     return str(cur.fetchone()["id"])
 
 
+ENSURE_CAMPAIGN_SQL = """
+    insert into campaigns (guild_id, discord_category_id, name)
+    values (%s, %s, %s)
+    on conflict (discord_category_id)
+    do update set
+      guild_id = excluded.guild_id,
+      name = excluded.name
+    returning id
+"""
+
+
 def _ensure_campaign(cur: psycopg.Cursor, guild_id: str, discord_category_id: int, name: str) -> str:
     cur.execute(
-        """
-        insert into campaigns (guild_id, discord_category_id, name)
-        values (%s, %s, %s)
-        on conflict (discord_category_id)
-        do update set
-          guild_id = excluded.guild_id,
-          name = excluded.name
-        returning id
-        """,
+        ENSURE_CAMPAIGN_SQL,
         (guild_id, discord_category_id, name),
     )
     return str(cur.fetchone()["id"])
@@ -224,18 +314,22 @@ def get_or_create_campaign_context(
             guild_id = _ensure_guild(cur, discord_guild_id, guild_name, dm_role_name)
             campaign_id = _ensure_campaign(cur, guild_id, discord_category_id, category_name)
         conn.commit()
+    memory_name_cache.invalidate_category(discord_category_id)
     return CampaignContext(guild_id=guild_id, campaign_id=campaign_id)
 
 
+CAMPAIGN_CONTEXT_BY_CATEGORY_SQL = """
+    select campaigns.id as campaign_id, campaigns.guild_id
+    from campaigns
+    where campaigns.discord_category_id = %s
+"""
+
+
 def get_campaign_context_by_category(discord_category_id: int) -> CampaignContext | None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                select campaigns.id as campaign_id, campaigns.guild_id
-                from campaigns
-                where campaigns.discord_category_id = %s
-                """,
+                CAMPAIGN_CONTEXT_BY_CATEGORY_SQL,
                 (discord_category_id,),
             )
             row = cur.fetchone()
@@ -329,6 +423,7 @@ def set_guild_api_key(
             )
             row = cur.fetchone()
         conn.commit()
+    guild_key_cache.invalidate(discord_guild_id, provider_name)
     return GuildApiKeyStatus(
         provider=str(row["provider"]),
         has_key=True,
@@ -343,6 +438,9 @@ def set_guild_api_key(
 
 
 def get_guild_api_key(discord_guild_id: int, *, provider: str) -> str | None:
+    cached = guild_key_cache.get(discord_guild_id, provider)
+    if cached is not MISSING:
+        return cached
     secret = _require_key_encryption_secret()
     with _connect() as conn:
         with conn.cursor() as cur:
@@ -358,7 +456,9 @@ def get_guild_api_key(discord_guild_id: int, *, provider: str) -> str | None:
                 (secret, discord_guild_id, provider.strip().lower()),
             )
             row = cur.fetchone()
-    return str(row["api_key"]) if row and row["api_key"] else None
+    api_key = str(row["api_key"]) if row and row["api_key"] else None
+    guild_key_cache.set(discord_guild_id, provider, api_key)
+    return api_key
 
 
 def get_guild_api_key_status(discord_guild_id: int, *, provider: str) -> GuildApiKeyStatus:
@@ -443,6 +543,7 @@ def mark_guild_api_key_invalid(discord_guild_id: int, *, provider: str, error_me
                 (error_message[:500], discord_guild_id, provider.strip().lower()),
             )
         conn.commit()
+    guild_key_cache.invalidate(discord_guild_id, provider)
 
 
 def delete_guild_api_key(discord_guild_id: int, *, provider: str) -> bool:
@@ -463,6 +564,7 @@ def delete_guild_api_key(discord_guild_id: int, *, provider: str) -> bool:
             )
             row = cur.fetchone()
         conn.commit()
+    guild_key_cache.invalidate(discord_guild_id, provider)
     return row is not None
 
 
@@ -544,53 +646,81 @@ def update_campaign_image_settings(
     )
 
 
+ENSURE_MEMORY_SQL = """
+    insert into memories (campaign_id, name, provider, provider_ref)
+    values (%s, %s, %s, %s)
+    on conflict (campaign_id, name)
+    do update set
+      provider = excluded.provider,
+      provider_ref = coalesce(memories.provider_ref, excluded.provider_ref)
+    returning id,
+      (select discord_category_id from campaigns where campaigns.id = memories.campaign_id) as discord_category_id
+"""
+
+
 def ensure_memory(campaign_id: str, memory_name: str, provider: str = "gemini", provider_ref: str | None = None) -> str:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                insert into memories (campaign_id, name, provider, provider_ref)
-                values (%s, %s, %s, %s)
-                on conflict (campaign_id, name)
-                do update set
-                  provider = excluded.provider,
-                  provider_ref = coalesce(memories.provider_ref, excluded.provider_ref)
-                returning id
-                """,
+                ENSURE_MEMORY_SQL,
                 (campaign_id, memory_name, provider, provider_ref),
             )
-            memory_id = str(cur.fetchone()["id"])
+            row = cur.fetchone()
         conn.commit()
-    return memory_id
+    memory_name_cache.invalidate_category(row["discord_category_id"])
+    return str(row["id"])
+
+
+MEMORY_ID_BY_NAME_SQL = "select id from memories where campaign_id = %s and name = %s"
 
 
 def get_memory_id_by_name(campaign_id: str, memory_name: str) -> str | None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                "select id from memories where campaign_id = %s and name = %s",
+                MEMORY_ID_BY_NAME_SQL,
                 (campaign_id, memory_name),
             )
             row = cur.fetchone()
     return str(row["id"]) if row else None
 
 
+MEMORY_NAME_SQL = "select name from memories where id = %s"
+
+
 def get_memory_name(memory_id: str) -> str | None:
     with _connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("select name from memories where id = %s", (memory_id,))
+            cur.execute(MEMORY_NAME_SQL, (memory_id,))
             row = cur.fetchone()
     return row["name"] if row else None
 
 
+SET_DEFAULT_MEMORY_SQL = "update campaigns set default_memory_id = %s where id = %s"
+
+
 def set_default_memory(campaign_id: str, memory_id: str) -> None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                "update campaigns set default_memory_id = %s where id = %s",
+                SET_DEFAULT_MEMORY_SQL,
                 (memory_id, campaign_id),
             )
         conn.commit()
+    routing_cache.clear()
+
+
+ENSURE_CHANNEL_SQL = """
+    insert into channels (campaign_id, discord_channel_id, name, always_on, is_dm_private)
+    values (%s, %s, %s, %s, %s)
+    on conflict (discord_channel_id)
+    do update set
+      campaign_id = excluded.campaign_id,
+      name = excluded.name,
+      always_on = excluded.always_on,
+      is_dm_private = excluded.is_dm_private
+    returning id
+"""
 
 
 def ensure_channel(
@@ -603,21 +733,12 @@ def ensure_channel(
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                insert into channels (campaign_id, discord_channel_id, name, always_on, is_dm_private)
-                values (%s, %s, %s, %s, %s)
-                on conflict (discord_channel_id)
-                do update set
-                  campaign_id = excluded.campaign_id,
-                  name = excluded.name,
-                  always_on = excluded.always_on,
-                  is_dm_private = excluded.is_dm_private
-                returning id
-                """,
+                ENSURE_CHANNEL_SQL,
                 (campaign_id, discord_channel_id, name, always_on, is_dm_private),
             )
             channel_id = str(cur.fetchone()["id"])
         conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
     return channel_id
 
 
@@ -634,27 +755,34 @@ def ensure_channel_for_category(
     return ensure_channel(context.campaign_id, discord_channel_id, name, always_on, is_dm_private)
 
 
+ENSURE_THREAD_SQL = """
+    insert into threads (channel_id, discord_thread_id, name, always_on)
+    values (%s, %s, %s, %s)
+    on conflict (discord_thread_id)
+    do update set
+      channel_id = excluded.channel_id,
+      name = excluded.name,
+      always_on = excluded.always_on
+    returning id
+"""
+
+
 def ensure_thread(channel_id: str, discord_thread_id: int, name: str, always_on: bool = False) -> str:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                insert into threads (channel_id, discord_thread_id, name, always_on)
-                values (%s, %s, %s, %s)
-                on conflict (discord_thread_id)
-                do update set
-                  channel_id = excluded.channel_id,
-                  name = excluded.name,
-                  always_on = excluded.always_on
-                returning id
-                """,
+                ENSURE_THREAD_SQL,
                 (channel_id, discord_thread_id, name, always_on),
             )
             thread_id = str(cur.fetchone()["id"])
         conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
     return thread_id
 
 
+CHANNEL_ID_SQL = "select id from channels where discord_channel_id = %s"
+
+
 def ensure_thread_for_channel(
     discord_channel_id: int,
     discord_thread_id: int,
@@ -663,80 +791,102 @@ def ensure_thread_for_channel(
 ) -> str:
     with _connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("select id from channels where discord_channel_id = %s", (discord_channel_id,))
+            cur.execute(CHANNEL_ID_SQL, (discord_channel_id,))
             row = cur.fetchone()
             if not row:
                 raise ValueError(f"Channel {discord_channel_id} is not registered in the database.")
     return ensure_thread(str(row["id"]), discord_thread_id, name, always_on)
 
 
+ASSIGN_CHANNEL_MEMORY_SQL = """
+    insert into channel_memory_assignments (channel_id, memory_id)
+    values (%s, %s)
+    on conflict (channel_id)
+    do update set memory_id = excluded.memory_id
+"""
+
+
 def assign_memory_to_channel(discord_channel_id: int, memory_id: str) -> None:
     with _connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("select id from channels where discord_channel_id = %s", (discord_channel_id,))
+            cur.execute(CHANNEL_ID_SQL, (discord_channel_id,))
             row = cur.fetchone()
             if not row:
                 raise ValueError(f"Channel {discord_channel_id} is not registered in the database.")
             cur.execute(
-                """
-                insert into channel_memory_assignments (channel_id, memory_id)
-                values (%s, %s)
-                on conflict (channel_id)
-                do update set memory_id = excluded.memory_id
-                """,
+                ASSIGN_CHANNEL_MEMORY_SQL,
                 (row["id"], memory_id),
             )
         conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
+
+
+THREAD_ID_SQL = "select id from threads where discord_thread_id = %s"
+
+
+ASSIGN_THREAD_MEMORY_SQL = """
+    insert into thread_memory_assignments (thread_id, memory_id)
+    values (%s, %s)
+    on conflict (thread_id)
+    do update set memory_id = excluded.memory_id
+"""
 
 
 def assign_memory_to_thread(discord_thread_id: int, memory_id: str) -> None:
     with _connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("select id from threads where discord_thread_id = %s", (discord_thread_id,))
+            cur.execute(THREAD_ID_SQL, (discord_thread_id,))
             row = cur.fetchone()
             if not row:
                 raise ValueError(f"Thread {discord_thread_id} is not registered in the database.")
             cur.execute(
-                """
-                insert into thread_memory_assignments (thread_id, memory_id)
-                values (%s, %s)
-                on conflict (thread_id)
-                do update set memory_id = excluded.memory_id
-                """,
+                ASSIGN_THREAD_MEMORY_SQL,
                 (row["id"], memory_id),
             )
         conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
+
+
+SET_CHANNEL_ALWAYS_ON_SQL = "update channels set always_on = %s where discord_channel_id = %s"
 
 
 def set_channel_always_on(discord_channel_id: int, always_on: bool) -> None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                "update channels set always_on = %s where discord_channel_id = %s",
+                SET_CHANNEL_ALWAYS_ON_SQL,
                 (always_on, discord_channel_id),
             )
         conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
+
+
+SET_THREAD_ALWAYS_ON_SQL = "update threads set always_on = %s where discord_thread_id = %s"
 
 
 def set_thread_always_on(discord_thread_id: int, always_on: bool) -> None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                "update threads set always_on = %s where discord_thread_id = %s",
+                SET_THREAD_ALWAYS_ON_SQL,
                 (always_on, discord_thread_id),
             )
         conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
+
+
+DEFAULT_MEMORY_ID_SQL = """
+    select campaigns.default_memory_id
+    from campaigns
+    where campaigns.discord_category_id = %s
+"""
 
 
 def get_default_memory_id(discord_category_id: int) -> str | None:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                select campaigns.default_memory_id
-                from campaigns
-                where campaigns.discord_category_id = %s
-                """,
+                DEFAULT_MEMORY_ID_SQL,
                 (discord_category_id,),
             )
             row = cur.fetchone()
@@ -805,6 +955,77 @@ def is_always_on(discord_channel_id: int, discord_thread_id: int | None = None)
     return bool(row and row["always_on"])
 
 
+MESSAGE_ROUTING_SQL = """
+    with thread_row as (
+      select t.always_on, tma.memory_id
+      from threads t
+      left join thread_memory_assignments tma on tma.thread_id = t.id
+      where t.discord_thread_id = %(thread_id)s
+    ),
+    channel_row as (
+      select c.always_on, cma.memory_id
+      from channels c
+      left join channel_memory_assignments cma on cma.channel_id = c.id
+      where c.discord_channel_id = %(channel_id)s
+    ),
+    resolved as (
+      select
+        coalesce((select always_on from thread_row), false)
+          or coalesce((select always_on from channel_row), false) as always_on,
+        coalesce(
+          (select memory_id from thread_row),
+          (select memory_id from channel_row),
+          (select default_memory_id from campaigns where discord_category_id = %(category_id)s)
+        ) as memory_id
+    )
+    select resolved.always_on, resolved.memory_id, memories.name as memory_name
+    from resolved
+    left join memories on memories.id = resolved.memory_id
+"""
+
+
+def _message_routing_from_row(row: dict[str, Any] | None) -> MessageRouting:
+    if not row:
+        return MessageRouting()
+    return MessageRouting(
+        always_on=bool(row["always_on"]),
+        memory_id=str(row["memory_id"]) if row["memory_id"] else None,
+        memory_name=row["memory_name"],
+    )
+
+
+def resolve_message_routing(
+    discord_channel_id: int,
+    discord_category_id: int | None,
+    discord_thread_id: int | None = None,
+) -> MessageRouting:
+    """Resolve always_on, the effective memory and its name in one round trip.
+
+    Mirrors `is_always_on` plus `get_assigned_memory_id` (thread -> channel ->
+    campaign default) plus `get_memory_name`. The statement text is constant, so
+    psycopg prepares it server-side once it runs often on a pooled connection.
+    Results are served from `routing_cache` until an assignment changes.
+    """
+    cache_key = routing_cache.make_key(discord_category_id, discord_channel_id, discord_thread_id)
+    cached = routing_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    with _connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                MESSAGE_ROUTING_SQL,
+                {
+                    "thread_id": discord_thread_id,
+                    "channel_id": discord_channel_id,
+                    "category_id": discord_category_id,
+                },
+            )
+            row = cur.fetchone()
+    routing = _message_routing_from_row(row)
+    routing_cache.set(cache_key, routing)
+    return routing
+
+
 def delete_memory(memory_name_or_id: str, discord_category_id: int) -> bool:
     with _connect() as conn:
         with conn.cursor() as cur:
@@ -828,6 +1049,8 @@ def delete_memory(memory_name_or_id: str, discord_category_id: int) -> bool:
             cur.execute("delete from thread_memory_assignments where memory_id = %s", (row["id"],))
             cur.execute("delete from memories where id = %s", (row["id"],))
         conn.commit()
+    routing_cache.invalidate(memory_id=str(row["id"]))
+    memory_name_cache.invalidate_category(discord_category_id)
     return True
 
 
@@ -836,6 +1059,7 @@ def delete_thread_record(discord_thread_id: int) -> None:
         with conn.cursor() as cur:
             cur.execute("delete from threads where discord_thread_id = %s", (discord_thread_id,))
         conn.commit()
+    routing_cache.invalidate(thread_id=discord_thread_id)
 
 
 def delete_channel_record(discord_channel_id: int) -> None:
@@ -843,6 +1067,7 @@ def delete_channel_record(discord_channel_id: int) -> None:
         with conn.cursor() as cur:
             cur.execute("delete from channels where discord_channel_id = %s", (discord_channel_id,))
         conn.commit()
+    routing_cache.invalidate(channel_id=discord_channel_id)
 
 
 def get_campaign_runtime_targets(discord_category_id: int) -> dict[str, list[int]]:
@@ -960,10 +1185,14 @@ def delete_campaign_record(discord_category_id: int) -> None:
                 (guild_id, guild_id),
             )
         conn.commit()
+    routing_cache.invalidate(category_id=discord_category_id)
+    memory_name_cache.invalidate_category(discord_category_id)
 
 
-def build_thread_data_snapshot() -> dict[str, Any]:
+def build_thread_data_snapshot(discord_category_id: int | None = None) -> dict[str, Any]:
+    """Build the campaign -> channel -> thread snapshot, optionally for one category only."""
     snapshot: dict[str, Any] = {}
+    params = {"category_id": discord_category_id}
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -977,8 +1206,11 @@ def build_thread_data_snapshot() -> dict[str, Any]:
                   memories.name as memory_name
                 from campaigns
                 left join memories on memories.campaign_id = campaigns.id
+                where %(category_id)s::bigint is null
+                   or campaigns.discord_category_id = %(category_id)s
                 order by campaigns.name, memories.name
-                """
+                """,
+                params,
             )
             campaigns = cur.fetchall()
 
@@ -993,10 +1225,14 @@ def build_thread_data_snapshot() -> dict[str, Any]:
                   cma.memory_id as assigned_memory_id,
                   memories.name as assigned_memory_name
                 from channels
+                join campaigns on campaigns.id = channels.campaign_id
                 left join channel_memory_assignments cma on cma.channel_id = channels.id
                 left join memories on memories.id = cma.memory_id
+                where %(category_id)s::bigint is null
+                   or campaigns.discord_category_id = %(category_id)s
                 order by channels.name
-                """
+                """,
+                params,
             )
             channels = cur.fetchall()
 
@@ -1010,10 +1246,15 @@ def build_thread_data_snapshot() -> dict[str, Any]:
                   tma.memory_id as assigned_memory_id,
                   memories.name as assigned_memory_name
                 from threads
+                join channels on channels.id = threads.channel_id
+                join campaigns on campaigns.id = channels.campaign_id
                 left join thread_memory_assignments tma on tma.thread_id = threads.id
                 left join memories on memories.id = tma.memory_id
+                where %(category_id)s::bigint is null
+                   or campaigns.discord_category_id = %(category_id)s
                 order by threads.name
-                """
+                """,
+                params,
             )
             threads = cur.fetchall()
 
@@ -1068,17 +1309,20 @@ def build_thread_data_snapshot() -> dict[str, Any]:
     return snapshot
 
 
+LIST_MEMORY_NAMES_SQL = """
+    select memories.name
+    from memories
+    join campaigns on campaigns.id = memories.campaign_id
+    where campaigns.discord_category_id = %s
+    order by memories.name
+"""
+
+
 def list_memory_names(discord_category_id: int) -> list[str]:
     with _connect() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
-                select memories.name
-                from memories
-                join campaigns on campaigns.id = memories.campaign_id
-                where campaigns.discord_category_id = %s
-                order by memories.name
-                """,
+                LIST_MEMORY_NAMES_SQL,
                 (discord_category_id,),
             )
             rows = cur.fetchall()
@@ -1086,7 +1330,7 @@ def list_memory_names(discord_category_id: int) -> list[str]:
 
 
 def fetch_memory_details(discord_category_id: int, discord_channel_id: int, discord_thread_id: int | None = None) -> dict[str, Any] | None:
-    snapshot = build_thread_data_snapshot()
+    snapshot = build_thread_data_snapshot(discord_category_id)
     category_data = snapshot.get(str(discord_category_id))
     if not category_data:
         return None
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from config import GUILD_API_KEY_CACHE_TTL_SECONDS, GUILD_API_KEY_VALIDATION_INTERVAL_SECONDS
+
+
+MISSING = object()
+
+
+class GuildApiKeyCache:
+    """Short-lived cache of decrypted guild API keys.
+
+    Saves a `pgp_sym_decrypt` round trip per model call. Writers that rotate,
+    delete or deactivate a key invalidate it explicitly; the TTL only bounds how
+    long a key changed outside this process can linger. The cache also tracks
+    when each key was last marked valid so success writes can be coalesced.
+    """
+
+    def __init__(self, ttl_seconds: float, validation_interval_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.validation_interval_seconds = validation_interval_seconds
+        self._keys: dict[tuple[int, str], tuple[float, str | None]] = {}
+        self._last_marked_valid: dict[tuple[int, str], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(discord_guild_id: int, provider: str) -> tuple[int, str]:
+        return int(discord_guild_id), provider.strip().lower()
+
+    def get(self, discord_guild_id: int, provider: str):
+        """Return the cached key (possibly None for "no key"), or `MISSING`."""
+        if self.ttl_seconds <= 0:
+            return MISSING
+        cache_key = self._key(discord_guild_id, provider)
+        with self._lock:
+            entry = self._keys.get(cache_key)
+            if entry is None:
+                return MISSING
+            expires_at, api_key = entry
+            if expires_at <= time.monotonic():
+                del self._keys[cache_key]
+                return MISSING
+            return api_key
+
+    def set(self, discord_guild_id: int, provider: str, api_key: str | None) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._keys[self._key(discord_guild_id, provider)] = (time.monotonic() + self.ttl_seconds, api_key)
+
+    def invalidate(self, discord_guild_id: int, provider: str) -> None:
+        cache_key = self._key(discord_guild_id, provider)
+        with self._lock:
+            self._keys.pop(cache_key, None)
+            self._last_marked_valid.pop(cache_key, None)
+
+    def should_mark_valid(self, discord_guild_id: int, provider: str) -> bool:
+        """Return True at most once per validation interval for each guild key."""
+        cache_key = self._key(discord_guild_id, provider)
+        now = time.monotonic()
+        with self._lock:
+            last_marked = self._last_marked_valid.get(cache_key)
+            if last_marked is not None and now - last_marked < self.validation_interval_seconds:
+                return False
+            self._last_marked_valid[cache_key] = now
+            return True
+
+    def forget_validation(self, discord_guild_id: int, provider: str) -> None:
+        with self._lock:
+            self._last_marked_valid.pop(self._key(discord_guild_id, provider), None)
+
+
+guild_key_cache = GuildApiKeyCache(GUILD_API_KEY_CACHE_TTL_SECONDS, GUILD_API_KEY_VALIDATION_INTERVAL_SECONDS)
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 import discord
@@ -7,24 +6,13 @@ from discord import app_commands
 from config import DM_ROLE_NAME
 from discord_app.shared_functions import apply_always_on, send_interaction_message
 
+from . import async_db_repository as async_repo
 from .db_repository import (
     DEFAULT_CHANNEL_SPECS,
     DEFAULT_MEMORY_NAMES,
     DEFAULT_VOICE_CHANNEL_SPECS,
-    assign_memory_to_channel,
-    assign_memory_to_thread,
+    MessageRouting,
     delete_memory as delete_memory_record,
-    ensure_channel_for_category,
-    ensure_memory,
-    ensure_thread_for_channel,
-    get_assigned_memory_id,
-    get_campaign_context_by_category,
-    get_default_memory_id,
-    get_memory_id_by_name,
-    get_memory_name,
-    get_or_create_campaign_context,
-    list_memory_names,
-    set_default_memory as set_default_memory_record,
 )
 
 
@@ -32,17 +20,16 @@ logger = logging.getLogger(__name__)
 
 
 async def create_memory(interaction: discord.Interaction, memory_name: str, category_id_str: str):
-    context = await asyncio.to_thread(get_campaign_context_by_category, int(category_id_str))
+    context = await async_repo.get_campaign_context_by_category(int(category_id_str))
     if not context:
-        context = await asyncio.to_thread(
-            get_or_create_campaign_context,
+        context = await async_repo.get_or_create_campaign_context(
             interaction.guild.id,
             interaction.guild.name,
             int(category_id_str),
             interaction.channel.category.name,
             DM_ROLE_NAME,
         )
-    return await asyncio.to_thread(ensure_memory, context.campaign_id, memory_name)
+    return await async_repo.ensure_memory(context.campaign_id, memory_name)
 
 
 async def assign_memory(
@@ -62,16 +49,14 @@ async def assign_memory(
         return "Invalid channel specified. Please specify a valid channel."
 
     category = channel_obj.category or interaction.channel.category
-    context = await asyncio.to_thread(
-        get_or_create_campaign_context,
+    context = await async_repo.get_or_create_campaign_context(
         interaction.guild.id,
         interaction.guild.name,
         category.id,
         category.name,
         DM_ROLE_NAME,
     )
-    await asyncio.to_thread(
-        ensure_channel_for_category,
+    await async_repo.ensure_channel_for_category(
         category.id,
         channel_obj.id,
         channel_obj.name,
@@ -81,14 +66,14 @@ async def assign_memory(
 
     if memory == "CREATE NEW MEMORY":
         target_memory_name = memory_name
-        memory_id = await asyncio.to_thread(ensure_memory, context.campaign_id, memory_name)
+        memory_id = await async_repo.ensure_memory(context.campaign_id, memory_name)
     else:
         target_memory_name = memory
-        memory_id = await asyncio.to_thread(get_memory_id_by_name, context.campaign_id, memory)
+        memory_id = await async_repo.get_memory_id_by_name(context.campaign_id, memory)
         if memory_id is None:
             return (
                 f"Error: Memory '{memory}' does not exist in category '{category.id}'. "
-                f"Available memories: {await asyncio.to_thread(list_memory_names, category.id)}."
+                f"Available memories: {await async_repo.list_memory_names(category.id)}."
             )
 
     if thread_id:
@@ -96,39 +81,61 @@ async def assign_memory(
         if not isinstance(thread_obj, discord.Thread):
             return f"Error: Thread with ID '{thread_id}' not found or is not a thread."
 
-        await asyncio.to_thread(
-            ensure_thread_for_channel,
+        await async_repo.ensure_thread_for_channel(
             channel_obj.id,
             thread_obj.id,
             thread_obj.name,
             False,
         )
-        await asyncio.to_thread(assign_memory_to_thread, thread_obj.id, memory_id)
+        await async_repo.assign_memory_to_thread(thread_obj.id, memory_id)
         return (
             f"Memory '{target_memory_name}' assigned to thread '{thread_obj.name}' in channel "
             f"'{channel_obj.name}' with memory ID '{memory_id}'."
         )
 
-    await asyncio.to_thread(assign_memory_to_channel, channel_obj.id, memory_id)
+    await async_repo.assign_memory_to_channel(channel_obj.id, memory_id)
     return f"Memory '{target_memory_name}' assigned to channel '{channel_obj.name}' with memory ID '{memory_id}'."
 
 
 async def get_default_memory(category_id):
-    return await asyncio.to_thread(get_default_memory_id, int(category_id))
+    return await async_repo.get_default_memory_id(int(category_id))
 
 
 async def set_default_memory(category_id):
-    context = await asyncio.to_thread(get_campaign_context_by_category, int(category_id))
+    context = await async_repo.get_campaign_context_by_category(int(category_id))
     if not context:
         return
-    gameplay_memory_id = await asyncio.to_thread(get_memory_id_by_name, context.campaign_id, "gameplay")
+    gameplay_memory_id = await async_repo.get_memory_id_by_name(context.campaign_id, "gameplay")
     if gameplay_memory_id:
-        await asyncio.to_thread(set_default_memory_record, context.campaign_id, gameplay_memory_id)
+        await async_repo.set_default_memory(context.campaign_id, gameplay_memory_id)
 
 
 async def get_assigned_memory(channel_id, category_id, thread_id=None):
     logger.info("Fetching assigned memory channel_id=%s category_id=%s thread_id=%s", channel_id, category_id, thread_id)
-    return await asyncio.to_thread(get_assigned_memory_id, int(channel_id), int(category_id), int(thread_id) if thread_id else None)
+    routing = await async_repo.resolve_message_routing(
+        int(channel_id),
+        int(category_id) if category_id else None,
+        int(thread_id) if thread_id else None,
+    )
+    return routing.memory_id
+
+
+async def get_message_routing(channel_id, category_id, thread_id=None) -> MessageRouting:
+    try:
+        return await async_repo.resolve_message_routing(
+            int(channel_id),
+            int(category_id) if category_id else None,
+            int(thread_id) if thread_id else None,
+        )
+    except Exception as exc:
+        logger.error(
+            "Failed to resolve message routing for category %s channel %s thread %s: %s",
+            category_id,
+            channel_id,
+            thread_id,
+            exc,
+        )
+        return MessageRouting()
 
 
 async def initialize_threads(category):
@@ -137,8 +144,7 @@ async def initialize_threads(category):
     if dm_role is None:
         raise ValueError(f"Role '{DM_ROLE_NAME}' was not found. Create it and assign it to at least one user before running /invite.")
 
-    context = await asyncio.to_thread(
-        get_or_create_campaign_context,
+    context = await async_repo.get_or_create_campaign_context(
         guild.id,
         guild.name,
         category.id,
@@ -148,9 +154,9 @@ async def initialize_threads(category):
 
     memory_ids = {}
     for memory_name in DEFAULT_MEMORY_NAMES:
-        memory_ids[memory_name] = await asyncio.to_thread(ensure_memory, context.campaign_id, memory_name)
+        memory_ids[memory_name] = await async_repo.ensure_memory(context.campaign_id, memory_name)
 
-    await asyncio.to_thread(set_default_memory_record, context.campaign_id, memory_ids["gameplay"])
+    await async_repo.set_default_memory(context.campaign_id, memory_ids["gameplay"])
 
     created_channels = []
     reused_channels = []
@@ -182,15 +188,14 @@ async def initialize_threads(category):
             if spec["is_dm_private"]:
                 await channel.edit(overwrites=dm_overwrites)
 
-        await asyncio.to_thread(
-            ensure_channel_for_category,
+        await async_repo.ensure_channel_for_category(
             category.id,
             channel.id,
             channel.name,
             spec["always_on"],
             spec["is_dm_private"],
         )
-        await asyncio.to_thread(assign_memory_to_channel, channel.id, memory_ids[spec["memory"]])
+        await async_repo.assign_memory_to_channel(channel.id, memory_ids[spec["memory"]])
 
     for spec in DEFAULT_VOICE_CHANNEL_SPECS:
         voice_channel = discord.utils.get(category.voice_channels, name=spec["name"])
@@ -205,8 +210,7 @@ async def initialize_threads(category):
             if spec["is_dm_private"]:
                 await voice_channel.edit(overwrites=dm_overwrites)
 
-        await asyncio.to_thread(
-            ensure_channel_for_category,
+        await async_repo.ensure_channel_for_category(
             category.id,
             voice_channel.id,
             voice_channel.name,
@@ -294,4 +298,4 @@ async def reset_memory_history(memory_id: str) -> int:
 async def lookup_memory_name(memory_id: str | None) -> str | None:
     if not memory_id:
         return None
-    return await asyncio.to_thread(get_memory_name, memory_id)
+    return await async_repo.get_memory_name(memory_id)
@@ -0,0 +1,95 @@
+import logging
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+from config import MEMORY_NAME_CACHE_TTL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+_WORD_BOUNDARY_RE = re.compile(r"[\s_\-/]+")
+
+
+def rank_memory_names(memory_names: list[str], current: str) -> list[str]:
+    """Order names by match quality: exact, prefix, word prefix, then substring."""
+    query = (current or "").strip().lower()
+    if not query:
+        return sorted(memory_names, key=str.lower)
+
+    ranked: list[tuple[int, int, str, str]] = []
+    for name in memory_names:
+        lowered = name.lower()
+        if lowered == query:
+            rank = 0
+        elif lowered.startswith(query):
+            rank = 1
+        elif any(word.startswith(query) for word in _WORD_BOUNDARY_RE.split(lowered)):
+            rank = 2
+        elif query in lowered:
+            rank = 3
+        else:
+            continue
+        ranked.append((rank, len(name), lowered, name))
+    ranked.sort()
+    return [name for *_sort_key, name in ranked]
+
+
+class MemoryNameIndex:
+    """Lazily populated per-campaign index of memory names, keyed by Discord category id.
+
+    Writers invalidate by category. Categories without a campaign are never
+    cached, and entries expire after `ttl_seconds` as a safety net.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._names: dict[int, tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_names(
+        self,
+        discord_category_id: int,
+        loader: Callable[[int], Awaitable[tuple[str | None, list[str]]]],
+    ) -> list[str]:
+        category_id = int(discord_category_id)
+        with self._lock:
+            cached = self._names.get(category_id)
+            if cached is not None and cached[0] > time.monotonic():
+                self.hits += 1
+                return list(cached[1])
+            self.misses += 1
+            generation = self._generation
+
+        campaign_id, names = await loader(category_id)
+        with self._lock:
+            # Skip caching if a writer invalidated while the load was in flight.
+            if campaign_id and self.ttl_seconds > 0 and generation == self._generation:
+                self._names[category_id] = (time.monotonic() + self.ttl_seconds, list(names))
+        return list(names)
+
+    async def search(
+        self,
+        discord_category_id: int,
+        current: str,
+        loader: Callable[[int], Awaitable[tuple[str | None, list[str]]]],
+    ) -> list[str]:
+        return rank_memory_names(await self.get_names(discord_category_id, loader), current)
+
+    def invalidate_category(self, discord_category_id) -> None:
+        if not discord_category_id:
+            return
+        with self._lock:
+            self._generation += 1
+            self._names.pop(int(discord_category_id), None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"campaigns": len(self._names), "hits": self.hits, "misses": self.misses}
+
+
+memory_name_cache = MemoryNameIndex(MEMORY_NAME_CACHE_TTL_SECONDS)
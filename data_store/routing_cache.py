@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from config import ROUTING_CACHE_MAX_ENTRIES, ROUTING_CACHE_TTL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+RoutingKey = tuple[int | None, int | None, int | None]
+
+
+def _as_id(value) -> int | None:
+    return int(value) if value else None
+
+
+class RoutingCache:
+    """TTL + LRU cache for per-message routing lookups.
+
+    Keys are `(category_id, channel_id, thread_id)` Discord ids. Entries expire
+    after `ttl_seconds` as a safety net, but writers are expected to invalidate
+    explicitly whenever assignments or always_on flags change.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[RoutingKey, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(category_id, channel_id, thread_id=None) -> RoutingKey:
+        return _as_id(category_id), _as_id(channel_id), _as_id(thread_id)
+
+    def get(self, key: RoutingKey):
+        if self.ttl_seconds <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: RoutingKey, value) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(
+        self,
+        *,
+        category_id=None,
+        channel_id=None,
+        thread_id=None,
+        memory_id: str | None = None,
+    ) -> int:
+        category_id = _as_id(category_id)
+        channel_id = _as_id(channel_id)
+        thread_id = _as_id(thread_id)
+        with self._lock:
+            stale_keys = [
+                key
+                for key, (_expires_at, value) in self._entries.items()
+                if (category_id is not None and key[0] == category_id)
+                or (channel_id is not None and key[1] == channel_id)
+                or (thread_id is not None and key[2] == thread_id)
+                or (memory_id is not None and getattr(value, "memory_id", None) == str(memory_id))
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+        if stale_keys:
+            logger.debug(
+                "Invalidated %s routing cache entries category=%s channel=%s thread=%s memory=%s",
+                len(stale_keys),
+                category_id,
+                channel_id,
+                thread_id,
+                memory_id,
+            )
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+routing_cache = RoutingCache(ROUTING_CACHE_MAX_ENTRIES, ROUTING_CACHE_TTL_SECONDS)
@@ -1,21 +1,107 @@
+import asyncio
 import logging
+import threading
 
 from .db_repository import build_thread_data_snapshot
 
 
+# Shared compatibility snapshot. It is always mutated in place so modules that
+# imported it by name keep seeing the current data.
 category_threads = {}
+_snapshot_lock = threading.Lock()
+_refresh_in_flight = 0
+_patches_during_refresh: list[tuple[str, str]] = []
+
+
+def _replace_snapshot(new_data: dict) -> None:
+    category_threads.clear()
+    category_threads.update(new_data)
+
+
+def _record_patch(kind: str, discord_id) -> None:
+    if _refresh_in_flight:
+        _patches_during_refresh.append((kind, str(discord_id)))
+
+
+def _apply_removal(kind: str, discord_id: str) -> bool:
+    if kind == "campaign":
+        return category_threads.pop(discord_id, None) is not None
+    for campaign_entry in category_threads.values():
+        channels = campaign_entry.get("channels", {})
+        if kind == "channel" and channels.pop(discord_id, None) is not None:
+            return True
+        if kind == "thread":
+            for channel_entry in channels.values():
+                if channel_entry.get("threads", {}).pop(discord_id, None) is not None:
+                    return True
+    return False
 
 
 def save_thread_data(_new_data=None):
     """Refresh the in-memory compatibility snapshot from Supabase."""
-    global category_threads
-    category_threads = build_thread_data_snapshot()
+    load_thread_data()
     logging.info("Refreshed thread data snapshot from Supabase.")
     return category_threads
 
 
 def load_thread_data():
-    """Load the compatibility snapshot from Supabase."""
-    global category_threads
-    category_threads = build_thread_data_snapshot()
+    """Load the full compatibility snapshot from Supabase (blocking)."""
+    snapshot = build_thread_data_snapshot()
+    with _snapshot_lock:
+        _replace_snapshot(snapshot)
+    return category_threads
+
+
+async def refresh_thread_data():
+    """Rebuild the full snapshot off the event loop.
+
+    Removals patched in while the rebuild was running are re-applied on top of
+    the fresh data so a slow refresh cannot resurrect a deleted thread or channel.
+    """
+    global _refresh_in_flight
+    with _snapshot_lock:
+        _refresh_in_flight += 1
+    try:
+        snapshot = await asyncio.to_thread(build_thread_data_snapshot)
+    finally:
+        with _snapshot_lock:
+            _refresh_in_flight -= 1
+            pending_patches = list(_patches_during_refresh)
+            if not _refresh_in_flight:
+                _patches_during_refresh.clear()
+    with _snapshot_lock:
+        _replace_snapshot(snapshot)
+        for kind, discord_id in pending_patches:
+            _apply_removal(kind, discord_id)
+    logging.info("Refreshed thread data snapshot for %s campaigns.", len(category_threads))
     return category_threads
+
+
+async def refresh_campaign_thread_data(discord_category_id: int):
+    """Reload a single campaign's slice of the snapshot off the event loop."""
+    campaign_key = str(discord_category_id)
+    snapshot = await asyncio.to_thread(build_thread_data_snapshot, int(discord_category_id))
+    with _snapshot_lock:
+        if campaign_key in snapshot:
+            category_threads[campaign_key] = snapshot[campaign_key]
+        else:
+            category_threads.pop(campaign_key, None)
+    return category_threads.get(campaign_key)
+
+
+def remove_thread_from_snapshot(discord_thread_id: int) -> bool:
+    with _snapshot_lock:
+        _record_patch("thread", discord_thread_id)
+        return _apply_removal("thread", str(discord_thread_id))
+
+
+def remove_channel_from_snapshot(discord_channel_id: int) -> bool:
+    with _snapshot_lock:
+        _record_patch("channel", discord_channel_id)
+        return _apply_removal("channel", str(discord_channel_id))
+
+
+def remove_campaign_from_snapshot(discord_category_id: int) -> bool:
+    with _snapshot_lock:
+        _record_patch("campaign", discord_category_id)
+        return _apply_removal("campaign", str(discord_category_id))
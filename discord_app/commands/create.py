@@ -312,7 +312,7 @@ def register(create_group, h) -> None:
         prepass_prompt = h.build_other_prepass_prompt(note)
         try:
             with use_guild_gemini_api_key(interaction.guild.id):
-                prepass_output = await asyncio.to_thread(h.gemini_client.generate_text, prepass_prompt)
+                prepass_output = await h.gemini_client.generate_text_async(prepass_prompt)
         except Exception as exc:
             raise_for_guild_gemini_exception(interaction.guild.id, exc)
         card_titles, card_inventory_text, cascade_rules_text = h.parse_other_prepass_output(prepass_output)
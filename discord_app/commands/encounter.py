@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import asyncio
-
 import discord
 from discord import app_commands
 
@@ -154,7 +152,7 @@ def register(encounter_group, h) -> None:
         system_prompt = build_encounter_workspace_system_prompt(encounter_name)
         try:
             with use_guild_gemini_api_key(interaction.guild.id):
-                raw = await asyncio.to_thread(h.gemini_client.generate_text, prompt, system_prompt)
+                raw = await h.gemini_client.generate_text_async(prompt, system_prompt)
         except Exception as exc:
             raise_for_guild_gemini_exception(interaction.guild.id, exc)
         updates = parse_card_update_response(raw)
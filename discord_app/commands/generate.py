@@ -83,7 +83,7 @@ def register(generate_group, h) -> None:
                             directives=directives,
                             aspect_ratio_override=aspect_ratio_override,
                         )
-                        images = h.gemini_client.generate_image(
+                        images = await h.gemini_client.generate_image_async(
                             request.prompt,
                             model_name=request.model_name,
                             aspect_ratio=request.aspect_ratio,
@@ -166,7 +166,7 @@ def register(generate_group, h) -> None:
                     seen_refs.add(key)
                     combined_reference_assets.append(asset)
 
-                images = h.gemini_client.generate_image(
+                images = await h.gemini_client.generate_image_async(
                     request.prompt,
                     model_name=request.model_name,
                     aspect_ratio=request.aspect_ratio,
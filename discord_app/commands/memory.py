@@ -84,8 +84,11 @@ def register(memory_group, h) -> None:
     async def listmemory(interaction, channel: str = None, thread: str = None):
         try:
             category_id = h.get_category_id(interaction)
+            if category_id is None:
+                await h.send_interaction_message(interaction, "No memory data found for this category.")
+                return
             if not channel and not thread:
-                snapshot = await h.asyncio.to_thread(h.build_thread_data_snapshot)
+                snapshot = await h.asyncio.to_thread(h.build_thread_data_snapshot, int(category_id))
                 category_data = snapshot.get(str(category_id))
                 if not category_data:
                     await h.send_interaction_message(interaction, "No memory data found for this category.")
@@ -167,7 +170,7 @@ def register(memory_group, h) -> None:
             )
 
             if not thread_id:
-                snapshot = await h.asyncio.to_thread(h.build_thread_data_snapshot)
+                snapshot = await h.asyncio.to_thread(h.build_thread_data_snapshot, int(category_id))
                 category_data = snapshot.get(str(category_id), {})
                 channel_data = category_data.get("channels", {}).get(str(channel_id), {})
                 threads = sorted(channel_data.get("threads", {}).items(), key=lambda item: item[1].get("name", "").lower())
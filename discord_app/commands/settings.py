@@ -40,8 +40,7 @@ def register(settings_group, h) -> None:
 
         await h.send_command_ack(interaction, f"{action_label} the guild Gemini API key...")
         try:
-            await h.asyncio.to_thread(
-                h.gemini_client.generate_text,
+            await h.gemini_client.generate_text_async(
                 "Reply with exactly OK.",
                 "Return exactly OK.",
                 None,
@@ -16,14 +16,16 @@ from content_retrieval import (
     format_message_with_attachments,
     select_messages,
 )
-from data_store.db_repository import ensure_thread_for_channel, list_memory_names
+from data_store import async_db_repository as async_repo
+from data_store.db_repository import ensure_thread_for_channel
 from data_store.memory_management import assign_memory, get_assigned_memory
 from prompts.reference_prompts import build_reference_prompt
 from prompts.query_prompts import construct_query_prompt
 from prompts.summary_prompts import build_summary_prompt
-from data_store.utils import category_threads, load_thread_data
+from data_store.utils import category_threads, refresh_campaign_thread_data
 
 from .shared_functions import send_interaction_message, send_response
+from .thread_index import thread_index
 
 category_conversations = {}
 
@@ -136,8 +138,7 @@ async def answer_from_public_url(
             query,
             url,
         )
-        response = await asyncio.to_thread(
-            gemini_client.generate_text_with_url_context,
+        response = await gemini_client.generate_text_with_url_context_async(
             prompt,
             [url],
             None,
@@ -191,6 +192,8 @@ async def handle_thread_creation(interaction, channel, thread_name, category_id,
         # Optionally assign memory to the new thread if provided
         if memory_name:
             await assign_memory(interaction, memory_name, str(channel.id), str(thread.id))
+        if channel.category:
+            await refresh_campaign_thread_data(channel.category.id)
 
         return thread, None
     else:
@@ -204,7 +207,7 @@ async def get_channels_in_category(category, guild):
 
 async def get_memory_options(category_id, session, predefined_threads):
     del session, predefined_threads
-    memory_names = await asyncio.to_thread(list_memory_names, int(category_id))
+    memory_names = await async_repo.search_memory_names(int(category_id))
     return [
         app_commands.Choice(name=memory_name, value=memory_name)
         for memory_name in memory_names
@@ -264,8 +267,6 @@ async def thread_autocomplete(interaction: discord.Interaction, current: str):
                     return nested_value
             return None
 
-        # Load thread data from JSON
-        category_threads = load_thread_data()
         category = get_interaction_category(interaction)
         if category is None:
             return []
@@ -282,17 +283,15 @@ async def thread_autocomplete(interaction: discord.Interaction, current: str):
                 channel_id = interaction.channel.id
         channel_id = str(channel_id)
 
-        if category_id not in category_threads:
-            category_threads[category_id] = {"channels": {}}
+        # Registered threads come from the in-memory snapshot; it is kept current
+        # by targeted patches, so autocomplete never rebuilds it.
+        channel_data = category_threads.get(category_id, {}).get('channels', {}).get(channel_id, {})
+        registered_threads = channel_data.get('threads', {})
 
-        # Get threads from JSON structure
-        channel_data = category_threads[category_id]['channels'].get(channel_id, {})
-
-        # Get both active threads and JSON-stored threads
         choices = []
-        
-        # 1. Add threads from JSON data
-        for thread_id, thread_data in channel_data.get('threads', {}).items():
+
+        # 1. Add threads registered in the database
+        for thread_id, thread_data in registered_threads.items():
             thread_name = thread_data.get('name', f"Unnamed Thread {thread_id}")
             choices.append(
                 discord.app_commands.Choice(
@@ -301,22 +300,20 @@ async def thread_autocomplete(interaction: discord.Interaction, current: str):
                 )
             )
 
-        # 2. Add active threads from Discord API
+        # 2. Add active and archived threads from the cached Discord thread index
         channel_obj = interaction.guild.get_channel(int(channel_id))
         if channel_obj:
-            # Get active threads
-            active_threads = channel_obj.threads
-            # Get archived threads (adjust limits as needed)
-            archived_threads = []
-            async for thread in channel_obj.archived_threads(limit=100):
-                archived_threads.append(thread)
-
-            for thread in active_threads + archived_threads:
-                if str(thread.id) not in channel_data.get('threads', {}):
+            for thread in channel_obj.threads:
+                thread_index.upsert(thread)
+            if isinstance(channel_obj, discord.TextChannel):
+                thread_index.schedule_refresh(channel_obj)
+
+            for thread in thread_index.threads_for(channel_obj.id):
+                if str(thread.thread_id) not in registered_threads:
                     choices.append(
                         discord.app_commands.Choice(
                             name=f"{thread.name} ({'active' if not thread.archived else 'archived'})",
-                            value=str(thread.id)
+                            value=str(thread.thread_id)
                         )
                     )
 
@@ -347,20 +344,20 @@ async def memory_autocomplete(interaction: discord.Interaction, current: str):
     if category_id is None:
         return []
 
-    memory_names = await asyncio.to_thread(list_memory_names, int(category_id))
+    # Matched and ranked locally against the per-campaign memory name index
+    memory_names = await async_repo.search_memory_names(int(category_id), current)
 
     # Create list for matching memories, including "Create New Memory" option
     matching_memories = [
         discord.app_commands.Choice(name="CREATE A NEW MEMORY", value="CREATE NEW MEMORY")
     ]
-
-    # Filter memory names by input
     matching_memories += [
         discord.app_commands.Choice(name=memory_name, value=memory_name)
-        for memory_name in memory_names if current.lower() in memory_name.lower()
+        for memory_name in memory_names
     ]
 
-    return matching_memories[:50]  # Limit to 50 suggestions
+    # Discord accepts at most 25 autocomplete choices
+    return matching_memories[:25]
 
 async def process_query_command(
     interaction: discord.Interaction,
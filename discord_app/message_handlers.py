@@ -13,7 +13,7 @@ from docx import Document
 from ai_services.assistant_interactions import get_assistant_response
 from ai_services.gemini_client import gemini_client
 from content_retrieval import extract_public_url_text
-from data_store.memory_management import get_assigned_memory
+from data_store.memory_management import get_assigned_memory, get_message_routing
 from data_store.db_repository import (
     assign_memory_to_thread,
     ensure_channel_for_category,
@@ -22,7 +22,7 @@ from data_store.db_repository import (
     get_or_create_campaign_context,
     set_thread_always_on,
 )
-from config import DM_ROLE_NAME
+from config import DM_ROLE_NAME, STREAM_RESPONSES
 from discord_app.player_workspace.schema import (
     PlayerWorkspaceBundle,
     PlayerWorkspaceCardBundle,
@@ -53,7 +53,8 @@ from discord_app.workspace_threads import (
     parse_workspace_thread,
     sync_workspace_cards,
 )
-from .shared_functions import check_always_on, send_response_in_chunks
+from .response_streaming import DiscordResponseStream
+from .shared_functions import send_response_in_chunks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -98,8 +99,7 @@ async def _fetch_url_context(urls: list[str]) -> str:
             logging.warning("Direct URL fetch failed for %s, falling back to Gemini URL Context: %s", url, exc)
 
         try:
-            fallback = await asyncio.to_thread(
-                gemini_client.generate_text_with_url_context,
+            fallback = await gemini_client.generate_text_with_url_context_async(
                 "Read the provided public URL and extract the most relevant factual content in plain text for downstream assistant context. "
                 "Focus on the actual linked document/page. Do not answer the user directly. Do not add commentary.",
                 [url],
@@ -210,8 +210,7 @@ async def _analyze_gameplay_workspace_updates(*, user_message: str, assistant_re
         user_message=user_message,
         assistant_response=assistant_response,
     )
-    raw = await asyncio.to_thread(
-        gemini_client.generate_text,
+    raw = await gemini_client.generate_text_async(
         prompt,
         "You extract gameplay state updates into strict JSON only.",
     )
@@ -1553,7 +1552,8 @@ async def on_message(message):
             return
 
     response_sent = False
-    channel_always_on = await check_always_on(channel_id, category_id, thread_id)
+    routing = await get_message_routing(channel_id, category_id, thread_id)
+    channel_always_on = routing.always_on
     urls = _extract_urls(message.content)
 
     async def send_response(response):
@@ -1567,9 +1567,14 @@ async def on_message(message):
 
     try:
         if should_respond:
-            assigned_memory = await get_assigned_memory(channel_id, category_id, thread_id)
+            assigned_memory = routing.memory_id
             if assigned_memory:
                 context_block = await _fetch_url_context(urls) if urls else None
+                response_stream = (
+                    DiscordResponseStream(message.channel, placeholder=indicator_message)
+                    if STREAM_RESPONSES and (channel_always_on or channel_name == "telldm")
+                    else None
+                )
                 response = await get_assistant_response(
                     user_message,
                     channel_id,
@@ -1578,8 +1583,16 @@ async def on_message(message):
                     assigned_memory,
                     context_block=context_block,
                     system_prompt=_channel_system_prompt(channel_name),
+                    memory_name=routing.memory_name,
+                    response_stream=response_stream,
                 )
-                response_sent = await send_response(response)
+                if response_stream is not None and response_stream.placeholder_consumed:
+                    # The thinking indicator became the first page of the reply.
+                    indicator_message = None
+                if response_stream is not None and response_stream.posted:
+                    response_sent = True
+                else:
+                    response_sent = await send_response(response)
                 if response_sent and channel_name == "gameplay" and thread_id is None:
                     try:
                         await _post_gameplay_workspace_updates(
@@ -1594,12 +1607,28 @@ async def on_message(message):
         if message.attachments and not response_sent:
             for attachment in message.attachments:
                 logging.info(f"Found attachment: {attachment.filename} with URL: {attachment.url}")
-                await handle_attachments(attachment, user_message, channel_id, category_id, thread_id)
+                await handle_attachments(
+                    attachment,
+                    user_message,
+                    channel_id,
+                    category_id,
+                    thread_id,
+                    assigned_memory=routing.memory_id,
+                    memory_name=routing.memory_name,
+                )
     finally:
         await _stop_thinking_indicator(indicator_message)
 
 
-async def handle_attachments(attachment, user_message, channel_id, category_id, thread_id):
+async def handle_attachments(
+    attachment,
+    user_message,
+    channel_id,
+    category_id,
+    thread_id,
+    assigned_memory=None,
+    memory_name=None,
+):
     """Handle image, PDF, and text file attachments from the message."""
     logging.info(f"Processing attachment: {attachment.filename}")
     file_url = attachment.url
@@ -1611,7 +1640,8 @@ async def handle_attachments(attachment, user_message, channel_id, category_id,
                 logging.info(f"Successfully retrieved attachment: {attachment.filename}")
                 content_type = attachment.content_type
 
-                assigned_memory = await get_assigned_memory(channel_id, category_id, thread_id)
+                if not assigned_memory:
+                    assigned_memory = await get_assigned_memory(channel_id, category_id, thread_id)
                 if not assigned_memory:
                     logging.error("Assigned memory ID is invalid or empty.")
                     return
@@ -1626,6 +1656,7 @@ async def handle_attachments(attachment, user_message, channel_id, category_id,
                         thread_id,
                         assigned_memory,
                         system_prompt=_channel_system_prompt(channel.name if channel else None),
+                        memory_name=memory_name,
                     )
                     if response:
                         await send_response_in_chunks(channel, response)
@@ -1642,6 +1673,7 @@ async def handle_attachments(attachment, user_message, channel_id, category_id,
                         thread_id,
                         assigned_memory,
                         system_prompt=_channel_system_prompt(channel.name if channel else None),
+                        memory_name=memory_name,
                     )
                     if response:
                         await send_response_in_chunks(channel, response)
@@ -1661,6 +1693,7 @@ async def handle_attachments(attachment, user_message, channel_id, category_id,
                         thread_id,
                         assigned_memory,
                         system_prompt=_channel_system_prompt(channel.name if channel else None),
+                        memory_name=memory_name,
                     )
                     if response:
                         await send_response_in_chunks(channel, response)
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import asyncio
-
 from config import GEMINI_CHAT_MODEL
 
 from ..prompting import (
@@ -20,13 +18,12 @@ class ImportStrategy:
 
         prompt = build_import_prompt(request)
         if request.source.file_paths:
-            return await asyncio.to_thread(
-                gemini.generate_text_from_files,
+            return await gemini.generate_text_from_files_async(
                 list(request.source.file_paths),
                 prompt,
                 GEMINI_CHAT_MODEL,
             )
-        return await asyncio.to_thread(gemini.generate_text, prompt)
+        return await gemini.generate_text_async(prompt)
 
     async def repair(
         self,
@@ -42,13 +39,12 @@ class ImportStrategy:
             current_markdown=current_markdown,
         )
         if request.source.file_paths:
-            return await asyncio.to_thread(
-                gemini.generate_text_from_files,
+            return await gemini.generate_text_from_files_async(
                 list(request.source.file_paths),
                 prompt,
                 GEMINI_CHAT_MODEL,
             )
-        return await asyncio.to_thread(gemini.generate_text, prompt)
+        return await gemini.generate_text_async(prompt)
 
     async def backfill_reference_links(
         self,
@@ -62,13 +58,12 @@ class ImportStrategy:
             current_markdown=current_markdown,
         )
         if request.source.file_paths:
-            return await asyncio.to_thread(
-                gemini.generate_text_from_files,
+            return await gemini.generate_text_from_files_async(
                 list(request.source.file_paths),
                 prompt,
                 GEMINI_CHAT_MODEL,
             )
-        return await asyncio.to_thread(gemini.generate_text, prompt)
+        return await gemini.generate_text_async(prompt)
 
     async def format_pass(
         self,
@@ -79,10 +74,9 @@ class ImportStrategy:
     ) -> str:
         prompt = build_format_pass_prompt(raw_markdown)
         if request.source.file_paths:
-            return await asyncio.to_thread(
-                gemini.generate_text_from_files,
+            return await gemini.generate_text_from_files_async(
                 list(request.source.file_paths),
                 prompt,
                 GEMINI_CHAT_MODEL,
             )
-        return await asyncio.to_thread(gemini.generate_text, prompt)
+        return await gemini.generate_text_async(prompt)
@@ -0,0 +1,96 @@
+import logging
+import time
+
+import discord
+
+from config import STREAM_EDIT_INTERVAL_SECONDS
+from .shared_functions import format_for_discord, split_for_discord
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiscordResponseStream:
+    """Posts a streamed model reply progressively.
+
+    Text is re-rendered with `format_for_discord` on every flush and split into
+    Discord-sized pages; pages that changed are edited in place and new pages
+    are sent as follow-up messages. Flushes are throttled to `edit_interval`
+    seconds to stay well inside Discord's edit rate limits.
+    """
+
+    def __init__(
+        self,
+        channel,
+        *,
+        placeholder: discord.Message | None = None,
+        edit_interval: float = STREAM_EDIT_INTERVAL_SECONDS,
+    ) -> None:
+        self.channel = channel
+        self.placeholder = placeholder
+        self.edit_interval = edit_interval
+        self.placeholder_consumed = False
+        self.messages: list[discord.Message] = []
+        self._parts: list[str] = []
+        self._rendered: list[str] = []
+        self._last_flush = 0.0
+        self._started_at = time.monotonic()
+        self.first_post_seconds: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def posted(self) -> bool:
+        return bool(self.messages)
+
+    async def feed(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        # Post the first chunk immediately; after that, batch edits.
+        if self.posted and time.monotonic() - self._last_flush < self.edit_interval:
+            return
+        await self._flush()
+
+    async def finish(self, suffix: str | None = None) -> str:
+        if suffix:
+            self._parts.append(suffix)
+        await self._flush(final=True)
+        return self.text
+
+    async def _flush(self, *, final: bool = False) -> None:
+        self._last_flush = time.monotonic()
+        pages = split_for_discord(format_for_discord(self.text))
+        for index, page in enumerate(pages):
+            try:
+                if index < len(self.messages):
+                    if self._rendered[index] != page:
+                        await self.messages[index].edit(content=page)
+                        self._rendered[index] = page
+                    continue
+                if index == 0 and self.placeholder is not None and not self.placeholder_consumed:
+                    await self.placeholder.edit(content=page)
+                    message = self.placeholder
+                    self.placeholder_consumed = True
+                else:
+                    message = await self.channel.send(page)
+            except discord.HTTPException as exc:
+                logger.warning("Failed to update streamed response page %s: %s", index + 1, exc)
+                return
+            self.messages.append(message)
+            self._rendered.append(page)
+            if self.first_post_seconds is None:
+                self.first_post_seconds = time.monotonic() - self._started_at
+                logger.info("First streamed response chunk posted after %.2fs.", self.first_post_seconds)
+
+        if final:
+            # Reformatting the full text can occasionally need fewer pages than a partial render did.
+            while len(self.messages) > len(pages):
+                stale = self.messages.pop()
+                self._rendered.pop()
+                try:
+                    await stale.delete()
+                except discord.HTTPException:
+                    pass
@@ -1,24 +1,18 @@
-import asyncio
 import logging
 import re
 
 import discord
 
 from config import client
-from data_store.db_repository import (
-    ensure_channel_for_category,
-    ensure_thread_for_channel,
-    get_or_create_campaign_context,
-    is_always_on,
-    set_channel_always_on,
-    set_thread_always_on,
-)
+from data_store import async_db_repository as async_repo
 
 
 always_on_channels = {}
 MARKDOWN_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://[^\s)]+)\)")
 BULLET_ONLY_RE = re.compile(r"^\s*(?:[-*•]|o)\s*$")
 LIST_ITEM_RE = re.compile(r"^(\s*)(?:[-*•]|o)\s+(.*\S.*)$")
+DISCORD_MESSAGE_LIMIT = 2000
+CODE_FENCE = "```"
 
 
 def _normalize_list_formatting(response: str) -> str:
@@ -64,11 +58,44 @@ def format_for_discord(response: str) -> str:
     return _normalize_list_formatting(response)
 
 
+def _find_split_point(window: str) -> int:
+    """Prefer paragraph, line, sentence, then word boundaries in the back half of a page."""
+    minimum = len(window) // 2
+    for separator in ("\n\n", "\n", ". ", "! ", "? ", " "):
+        index = window.rfind(separator)
+        if index >= minimum:
+            return index + len(separator)
+    return len(window)
+
+
+def split_for_discord(response: str, limit: int = DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """Split formatted text into Discord-sized pages at natural boundaries.
+
+    Code fences cut by a page break are closed and reopened so each page
+    renders on its own.
+    """
+    pages: list[str] = []
+    remaining = (response or "").strip()
+    # Room to close a code fence that straddles the split.
+    page_limit = limit - len(CODE_FENCE) - 1
+    while len(remaining) > limit:
+        split_at = _find_split_point(remaining[:page_limit])
+        page = remaining[:split_at].rstrip()
+        remaining = remaining[split_at:].lstrip("\n")
+        if page.count(CODE_FENCE) % 2 == 1:
+            page = f"{page}\n{CODE_FENCE}"
+            remaining = f"{CODE_FENCE}\n{remaining}"
+        if page:
+            pages.append(page)
+    if remaining:
+        pages.append(remaining)
+    return pages
+
+
 async def set_always_on(channel_or_thread, always_on_value):
     always_on = bool(always_on_value)
     category = channel_or_thread.parent.category if isinstance(channel_or_thread, discord.Thread) else channel_or_thread.category
-    await asyncio.to_thread(
-        get_or_create_campaign_context,
+    await async_repo.get_or_create_campaign_context(
         channel_or_thread.guild.id,
         channel_or_thread.guild.name,
         category.id,
@@ -76,32 +103,29 @@ async def set_always_on(channel_or_thread, always_on_value):
     )
 
     if isinstance(channel_or_thread, discord.Thread):
-        await asyncio.to_thread(
-            ensure_channel_for_category,
+        await async_repo.ensure_channel_for_category(
             channel_or_thread.parent.category.id,
             channel_or_thread.parent.id,
             channel_or_thread.parent.name,
             False,
             False,
         )
-        await asyncio.to_thread(
-            ensure_thread_for_channel,
+        await async_repo.ensure_thread_for_channel(
             channel_or_thread.parent.id,
             channel_or_thread.id,
             channel_or_thread.name,
             always_on,
         )
-        await asyncio.to_thread(set_thread_always_on, channel_or_thread.id, always_on)
+        await async_repo.set_thread_always_on(channel_or_thread.id, always_on)
     else:
-        await asyncio.to_thread(
-            ensure_channel_for_category,
+        await async_repo.ensure_channel_for_category(
             channel_or_thread.category.id,
             channel_or_thread.id,
             channel_or_thread.name,
             always_on,
             False,
         )
-        await asyncio.to_thread(set_channel_always_on, channel_or_thread.id, always_on)
+        await async_repo.set_channel_always_on(channel_or_thread.id, always_on)
 
     always_on_channels[channel_or_thread.id] = always_on
     if not always_on:
@@ -114,7 +138,8 @@ async def set_always_on(channel_or_thread, always_on_value):
 
 async def check_always_on(channel_id, category_id, thread_id):
     try:
-        return await asyncio.to_thread(is_always_on, channel_id, thread_id)
+        routing = await async_repo.resolve_message_routing(channel_id, category_id, thread_id)
+        return routing.always_on
     except Exception as exc:
         logging.error("Failed to check always_on for category %s channel %s thread %s: %s", category_id, channel_id, thread_id, exc)
         return False
@@ -124,12 +149,8 @@ async def send_response_in_chunks(channel, response):
     if response is None:
         logging.error("Received None as response.")
         return
-    response = format_for_discord(response)
-    if len(response) > 2000:
-        for chunk in [response[i:i + 2000] for i in range(0, len(response), 2000)]:
-            await channel.send(chunk)
-    else:
-        await channel.send(response)
+    for page in split_for_discord(format_for_discord(response)):
+        await channel.send(page)
 
 
 async def send_response(interaction, response, channel_id=None, thread_id=None, backup_channel_name=None):
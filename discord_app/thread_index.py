@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import discord
+
+from config import THREAD_INDEX_ARCHIVED_LIMIT, THREAD_INDEX_REFRESH_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexedThread:
+    thread_id: int
+    name: str
+    archived: bool = False
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+class ThreadIndex:
+    """Per-channel in-memory index of Discord threads for autocomplete.
+
+    Active threads are seeded from the gateway cache and kept current by the
+    thread create/update/delete events. Archived threads require an API call, so
+    they are fetched by background refreshes and never on the autocomplete path.
+    """
+
+    def __init__(self, refresh_seconds: float, archived_limit: int, max_concurrent_refreshes: int = 2) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.archived_limit = archived_limit
+        self._threads: dict[int, dict[int, IndexedThread]] = {}
+        self._refreshed_at: dict[int, float] = {}
+        self._refresh_tasks: dict[int, asyncio.Task] = {}
+        # Deletions seen while a refresh is fetching, so the fetched set cannot bring them back.
+        self._refreshes_in_flight = 0
+        self._removed_at: dict[int, float] = {}
+        self._refresh_semaphore = asyncio.Semaphore(max(1, max_concurrent_refreshes))
+
+    def upsert(self, thread: discord.Thread) -> None:
+        if thread.parent_id is None:
+            return
+        self._threads.setdefault(thread.parent_id, {})[thread.id] = IndexedThread(
+            thread_id=thread.id,
+            name=thread.name,
+            archived=bool(thread.archived),
+        )
+
+    def remove_thread(self, thread_id: int, parent_id: int | None = None) -> None:
+        if self._refreshes_in_flight:
+            self._removed_at[thread_id] = time.monotonic()
+        if parent_id is not None:
+            self._threads.get(parent_id, {}).pop(thread_id, None)
+            return
+        for threads in self._threads.values():
+            if threads.pop(thread_id, None) is not None:
+                return
+
+    def remove_channel(self, channel_id: int) -> None:
+        self._threads.pop(channel_id, None)
+        self._refreshed_at.pop(channel_id, None)
+        task = self._refresh_tasks.pop(channel_id, None)
+        if task is not None:
+            task.cancel()
+
+    def threads_for(self, channel_id: int) -> list[IndexedThread]:
+        return list(self._threads.get(channel_id, {}).values())
+
+    def is_stale(self, channel_id: int) -> bool:
+        refreshed_at = self._refreshed_at.get(channel_id)
+        return refreshed_at is None or time.monotonic() - refreshed_at > self.refresh_seconds
+
+    def seed_guild(self, guild: discord.Guild) -> None:
+        for thread in guild.threads:
+            self.upsert(thread)
+
+    async def refresh_channel(self, channel: discord.TextChannel) -> None:
+        async with self._refresh_semaphore:
+            started_at = time.monotonic()
+            self._refreshes_in_flight += 1
+            try:
+                threads: dict[int, IndexedThread] = {
+                    thread.id: IndexedThread(thread_id=thread.id, name=thread.name, archived=False)
+                    for thread in channel.threads
+                }
+                try:
+                    async for thread in channel.archived_threads(limit=self.archived_limit):
+                        threads.setdefault(
+                            thread.id,
+                            IndexedThread(thread_id=thread.id, name=thread.name, archived=True),
+                        )
+                except discord.Forbidden:
+                    logger.debug("No permission to read archived threads in channel %s.", channel.id)
+                except discord.HTTPException as exc:
+                    logger.warning("Failed to fetch archived threads for channel %s: %s", channel.id, exc)
+                    return
+                # The fetch replaces the channel's entries; deletions and gateway upserts that
+                # landed while it was in flight are newer than what it returned.
+                for thread_id, removed_at in self._removed_at.items():
+                    if removed_at >= started_at:
+                        threads.pop(thread_id, None)
+                for thread_id, entry in self._threads.get(channel.id, {}).items():
+                    if entry.updated_at >= started_at:
+                        threads[thread_id] = entry
+            finally:
+                self._refreshes_in_flight -= 1
+                if not self._refreshes_in_flight:
+                    self._removed_at.clear()
+            self._threads[channel.id] = threads
+            self._refreshed_at[channel.id] = time.monotonic()
+            logger.debug(
+                "Refreshed thread index for channel %s with %s threads in %.2fs.",
+                channel.id,
+                len(threads),
+                time.monotonic() - started_at,
+            )
+
+    def schedule_refresh(self, channel: discord.TextChannel, *, force: bool = False) -> asyncio.Task | None:
+        if not force and not self.is_stale(channel.id):
+            return None
+        existing = self._refresh_tasks.get(channel.id)
+        if existing is not None and not existing.done():
+            return existing
+        task = asyncio.create_task(self.refresh_channel(channel))
+        self._refresh_tasks[channel.id] = task
+        task.add_done_callback(lambda done, channel_id=channel.id: self._forget_refresh(channel_id, done))
+        return task
+
+    def _forget_refresh(self, channel_id: int, task: asyncio.Task) -> None:
+        # A cancelled refresh may finish after its replacement was scheduled; leave that one alone.
+        if self._refresh_tasks.get(channel_id) is task:
+            del self._refresh_tasks[channel_id]
+
+    def warm_channels(self, channels) -> None:
+        for channel in channels:
+            if isinstance(channel, discord.TextChannel):
+                self.schedule_refresh(channel)
+
+
+thread_index = ThreadIndex(THREAD_INDEX_REFRESH_SECONDS, THREAD_INDEX_ARCHIVED_LIMIT)
@@ -3,6 +3,8 @@ import asyncio
 import json
 from pathlib import Path
 
+from ai_services.gemini_client import gemini_limiter
+from config import TRANSCRIPTION_CONCURRENCY
 from voice.transcription import VoiceRecorder
 
 
@@ -69,7 +71,21 @@ async def main() -> int:
         default=[],
         help="Optional local image reference path for offline image generation. Can be supplied multiple times.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=TRANSCRIPTION_CONCURRENCY,
+        help="How many audio segments to transcribe at once. Defaults to TRANSCRIPTION_CONCURRENCY.",
+    )
     args = parser.parse_args()
+    concurrency = max(1, args.concurrency)
+
+    # No chat shares this process, so let the Gemini limiter admit the requested parallelism.
+    gemini_limiter.configure(
+        max_global=max(gemini_limiter.max_global, concurrency),
+        max_per_guild=max(gemini_limiter.max_per_guild, concurrency),
+        max_background_per_guild=concurrency,
+    )
 
     recorder = VoiceRecorder()
     result = await recorder.process_existing_audio_files(
@@ -85,6 +101,7 @@ async def main() -> int:
         image_aspect_ratio=None if args.image_aspect_ratio == "auto" else args.image_aspect_ratio,
         image_max_scenes=args.image_max_scenes,
         image_reference_paths=args.image_ref,
+        transcription_concurrency=concurrency,
     )
     print(json.dumps(result, indent=2, ensure_ascii=False))
     return 0
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from ai_services.context_compiler import CompiledContextPacket, compile_context_packet_from_category_id
 from ai_services.gemini_client import gemini_client
+from ai_services.reference_image_cache import reference_image_cache
 from ai_services.scene_pipeline import scene_pipeline
 from voice.context_support import build_context_block
 
@@ -108,7 +109,7 @@ async def main() -> int:
         if args.generate_images:
             combined_reference_images = [asset for asset in request.reference_assets if asset.is_image]
             combined_reference_images.extend(Path(path).expanduser() for path in args.ref_image)
-            images = gemini_client.generate_image(
+            images = await gemini_client.generate_image_async(
                 request.prompt,
                 model_name=request.model_name,
                 aspect_ratio=request.aspect_ratio,
@@ -125,6 +126,7 @@ async def main() -> int:
         "output_dir": str(output_root),
         "scene_manifest_path": str(output_root / "scene_manifest.json"),
         "generated_outputs": generated_outputs,
+        "reference_image_cache": reference_image_cache.stats(),
     }
     print(json.dumps(result, indent=2, ensure_ascii=False))
     return 0
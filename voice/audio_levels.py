@@ -0,0 +1,158 @@
+import logging
+import math
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    CAPTURE_SILENCE_DBFS,
+    VAD_MIN_PAUSE_SECONDS,
+    VAD_SPLIT_SEARCH_SECONDS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PCM_FULL_SCALE = 32768.0
+SILENCE_FLOOR_DBFS = -120.0
+# Level analysis runs on 8 kHz mono in 30 ms frames: plenty for speech/silence decisions.
+VAD_ANALYSIS_SAMPLE_RATE = 8000
+VAD_FRAME_SECONDS = 0.03
+
+
+def pcm_rms_dbfs(pcm: bytes) -> float:
+    """RMS level of a signed 16-bit PCM buffer in dBFS (channels interleaved)."""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if not samples.size:
+        return SILENCE_FLOOR_DBFS
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    if rms <= 0:
+        return SILENCE_FLOOR_DBFS
+    return max(SILENCE_FLOOR_DBFS, 20 * math.log10(rms / PCM_FULL_SCALE))
+
+
+def map_capture_offset(offset_map: list[list[float]] | None, file_seconds: float) -> int:
+    """Translate a position in a trimmed capture file back to seconds into its window.
+
+    `offset_map` holds `[file_seconds, window_seconds]` anchors, one for every
+    place where dropped silence made the file jump ahead of the window clock.
+    """
+    if not offset_map:
+        return max(0, int(round(file_seconds)))
+    window_seconds = file_seconds
+    for anchor_file, anchor_window in offset_map:
+        if anchor_file > file_seconds:
+            break
+        window_seconds = anchor_window + (file_seconds - anchor_file)
+    return max(0, int(round(window_seconds)))
+
+
+def frame_levels_dbfs(samples: np.ndarray, frame_size: int) -> np.ndarray:
+    """Per-frame RMS levels in dBFS for mono 16-bit samples; a trailing partial frame is ignored."""
+    usable = samples.size - samples.size % frame_size
+    if usable <= 0:
+        return np.empty(0)
+    frames = samples[:usable].reshape(-1, frame_size).astype(np.float64)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    with np.errstate(divide="ignore"):
+        levels = 20 * np.log10(rms / PCM_FULL_SCALE)
+    return np.maximum(levels, SILENCE_FLOOR_DBFS)
+
+
+def read_frame_levels(
+    audio_file: Path,
+    *,
+    sample_rate: int = VAD_ANALYSIS_SAMPLE_RATE,
+    frame_seconds: float = VAD_FRAME_SECONDS,
+) -> np.ndarray:
+    """Decode `audio_file` to mono PCM with ffmpeg and return its per-frame levels.
+
+    The decoded stream is consumed in blocks, so only the level array is kept in
+    memory even for multi-hour recordings.
+    """
+    frame_size = int(sample_rate * frame_seconds)
+    frame_bytes = frame_size * 2
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        str(audio_file),
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    levels: list[np.ndarray] = []
+    remainder = b""
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        while True:
+            block = process.stdout.read(frame_bytes * 1000)
+            if not block:
+                break
+            data = remainder + block
+            usable = len(data) - len(data) % frame_bytes
+            levels.append(frame_levels_dbfs(np.frombuffer(data[:usable], dtype=np.int16), frame_size))
+            remainder = data[usable:]
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not decode {audio_file} for level analysis.")
+    return np.concatenate(levels) if levels else np.empty(0)
+
+
+def measure_speech_seconds(
+    audio_file: Path,
+    *,
+    threshold_dbfs: float = CAPTURE_SILENCE_DBFS,
+    frame_seconds: float = VAD_FRAME_SECONDS,
+) -> float | None:
+    """Seconds of frames above `threshold_dbfs`, or None when the file cannot be analysed."""
+    try:
+        levels = read_frame_levels(audio_file, frame_seconds=frame_seconds)
+    except Exception as exc:
+        logger.warning("Voice activity check failed for %s: %s", audio_file, exc)
+        return None
+    return float(np.count_nonzero(levels > threshold_dbfs)) * frame_seconds
+
+
+def find_pause_cut_points(
+    levels: np.ndarray,
+    *,
+    target_seconds: float,
+    threshold_dbfs: float = CAPTURE_SILENCE_DBFS,
+    min_pause_seconds: float = VAD_MIN_PAUSE_SECONDS,
+    search_seconds: float = VAD_SPLIT_SEARCH_SECONDS,
+    frame_seconds: float = VAD_FRAME_SECONDS,
+) -> list[float]:
+    """Pick cut points roughly every `target_seconds`, moved into the longest nearby pause.
+
+    Each nominal cut looks `search_seconds` either side for a silent run of at
+    least `min_pause_seconds` and cuts in its middle; with no such pause it falls
+    back to the hard cut.
+    """
+    total_frames = levels.size
+    target_frames = max(1, int(target_seconds / frame_seconds))
+    search_frames = int(search_seconds / frame_seconds)
+    min_pause_frames = max(1, int(min_pause_seconds / frame_seconds))
+    silent = levels <= threshold_dbfs
+
+    cuts: list[float] = []
+    last_cut = 0
+    while last_cut + target_frames + search_frames < total_frames:
+        nominal = last_cut + target_frames
+        low = max(last_cut + 1, nominal - search_frames)
+        high = min(total_frames, nominal + search_frames)
+        padded = np.concatenate(([0], silent[low:high].astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(padded))
+        starts, ends = edges[0::2], edges[1::2]
+        lengths = ends - starts
+        cut = nominal
+        if lengths.size and lengths.max() >= min_pause_frames:
+            best = int(np.argmax(lengths))
+            cut = low + int((starts[best] + ends[best]) // 2)
+        cuts.append(round(cut * frame_seconds, 2))
+        last_cut = cut
+    return cuts
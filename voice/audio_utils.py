@@ -1,3 +1,4 @@
+import logging
 import subprocess
 from pathlib import Path
 
@@ -5,9 +6,22 @@ from config import (
     AUDIO_BITRATE,
     AUDIO_CHANNELS,
     AUDIO_SAMPLE_RATE,
+    CAPTURE_AUDIO_CODEC,
+    CAPTURE_OPUS_BITRATE,
+    CAPTURE_SAMPLE_RATE,
     FFMPEG_INPUT_DEVICE,
     FFMPEG_INPUT_FORMAT,
+    VAD_ENABLED,
 )
+from .audio_levels import find_pause_cut_points, read_frame_levels
+
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_CODEC_ARGS = {
+    "flac": (".flac", ["-c:a", "flac", "-compression_level", "8"]),
+    "opus": (".ogg", ["-c:a", "libopus", "-b:a", CAPTURE_OPUS_BITRATE, "-application", "voip"]),
+}
 
 
 def get_category_id_voice(voice_channel):
@@ -42,6 +56,45 @@ def build_ffmpeg_command(audio_filename: Path, duration: int) -> list[str]:
     ]
 
 
+def encode_capture_audio(
+    wav_path: Path,
+    *,
+    codec: str = CAPTURE_AUDIO_CODEC,
+    sample_rate: int = CAPTURE_SAMPLE_RATE,
+) -> Path:
+    """Downmix a captured WAV to mono at `sample_rate` and re-encode it for upload.
+
+    Returns the encoded file and removes the WAV, or returns the WAV untouched
+    when the codec is `wav` or encoding fails.
+    """
+    if codec not in CAPTURE_CODEC_ARGS:
+        return wav_path
+    suffix, codec_args = CAPTURE_CODEC_ARGS[codec]
+    output_path = wav_path.with_suffix(suffix)
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-i", str(wav_path), "-ac", "1", "-ar", str(sample_rate), *codec_args, str(output_path)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except Exception as exc:
+        logger.warning("Could not encode %s as %s, uploading the WAV instead: %s", wav_path.name, codec, exc)
+        output_path.unlink(missing_ok=True)
+        return wav_path
+
+    original_size = wav_path.stat().st_size
+    wav_path.unlink(missing_ok=True)
+    logger.info(
+        "Encoded %s as %s: %.1f MB -> %.1f MB.",
+        wav_path.name,
+        output_path.name,
+        original_size / (1024 * 1024),
+        output_path.stat().st_size / (1024 * 1024),
+    )
+    return output_path
+
+
 def probe_audio_duration(audio_file: Path, fallback_duration: int) -> int:
     try:
         result = subprocess.run(
@@ -72,6 +125,15 @@ def split_audio_file_for_offline(audio_file: Path, output_dir: Path, segment_sec
     output_dir.mkdir(parents=True, exist_ok=True)
     suffix = audio_file.suffix or ".mp3"
     output_pattern = output_dir / f"{audio_file.stem}_part_%03d{suffix}"
+    segment_args = ["-segment_time", str(segment_seconds)]
+    if VAD_ENABLED:
+        try:
+            cut_points = find_pause_cut_points(read_frame_levels(audio_file), target_seconds=segment_seconds)
+        except Exception as exc:
+            logger.warning("Pause detection failed for %s, using fixed-length segments: %s", audio_file.name, exc)
+            cut_points = []
+        if cut_points:
+            segment_args = ["-segment_times", ",".join(f"{point:.2f}" for point in cut_points)]
     try:
         subprocess.run(
             [
@@ -81,8 +143,7 @@ def split_audio_file_for_offline(audio_file: Path, output_dir: Path, segment_sec
                 str(audio_file),
                 "-f",
                 "segment",
-                "-segment_time",
-                str(segment_seconds),
+                *segment_args,
                 "-reset_timestamps",
                 "1",
                 "-c",
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from ai_services.gemini_client import gemini_client, gemini_file_handle
+from ai_services.gemini_file_poller import gemini_file_poller
+from .transcript_manifest import TranscriptManifestStore
+
+
+logger = logging.getLogger(__name__)
+
+# Re-upload a little before Gemini's own expiry so a long summary call cannot race it.
+EXPIRY_MARGIN = timedelta(minutes=10)
+
+
+def _handle_is_usable(handle: dict | None, audio_file: str) -> bool:
+    if not handle or not handle.get("uri") or handle.get("audio_file") != audio_file:
+        return False
+    expires_at = handle.get("expires_at")
+    if not expires_at:
+        return True
+    try:
+        expiry = datetime.fromisoformat(expires_at)
+    except ValueError:
+        return False
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry - EXPIRY_MARGIN > datetime.now(timezone.utc)
+
+
+class GeminiFileRegistry:
+    """Uploads each session chunk to Gemini once and hands out the stored file handle.
+
+    Handles live on the chunk records of the session's `TranscriptManifestStore`
+    (`chunk["gemini_file"]`), so transcription, window summaries and retries all
+    reuse the same upload. Concurrent requests for the same chunk share one
+    upload. `cleanup` deletes everything at session finalization.
+    """
+
+    def __init__(self, manifest_store: TranscriptManifestStore) -> None:
+        self.manifest_store = manifest_store
+        self._uploads: dict[int, asyncio.Task] = {}
+
+    async def ensure_uploaded(self, chunk_info: dict) -> dict:
+        chunk_index = chunk_info["chunk_index"]
+        chunk = self.manifest_store.get_chunk(chunk_index) or chunk_info
+        audio_file = str(chunk["audio_file"])
+        handle = chunk.get("gemini_file")
+        if _handle_is_usable(handle, audio_file):
+            return handle
+
+        task = self._uploads.get(chunk_index)
+        if task is None:
+            task = asyncio.create_task(self._upload(chunk_index, audio_file, stale_handle=handle))
+            self._uploads[chunk_index] = task
+            task.add_done_callback(lambda _task, index=chunk_index: self._uploads.pop(index, None))
+        return await asyncio.shield(task)
+
+    async def _upload(self, chunk_index: int, audio_file: str, *, stale_handle: dict | None) -> dict:
+        if stale_handle and stale_handle.get("name"):
+            await gemini_client.delete_file_async(stale_handle["name"])
+        uploaded = await gemini_client.upload_file_async(Path(audio_file))
+        handle = {**gemini_file_handle(uploaded), "audio_file": audio_file}
+        await self.manifest_store.set_chunk_gemini_file(chunk_index, handle)
+        logger.info("Uploaded chunk %s to Gemini as %s.", chunk_index, handle["name"])
+        return handle
+
+    async def handles_for_chunks(self, chunk_indexes: list[int]) -> list[dict]:
+        chunks = [self.manifest_store.get_chunk(index) for index in chunk_indexes]
+        return list(
+            await asyncio.gather(
+                *(
+                    self.ensure_uploaded(chunk)
+                    for chunk in chunks
+                    if chunk is not None and Path(chunk.get("audio_file", "")).exists()
+                )
+            )
+        )
+
+    async def forget(self, chunk_index: int) -> None:
+        """Drop a handle Gemini rejected so the next attempt uploads again."""
+        chunk = self.manifest_store.get_chunk(chunk_index)
+        handle = (chunk or {}).get("gemini_file")
+        if not handle:
+            return
+        await self.manifest_store.set_chunk_gemini_file(chunk_index, None)
+        await gemini_client.delete_file_async(handle["name"])
+
+    async def cleanup(self) -> None:
+        for task in list(self._uploads.values()):
+            task.cancel()
+        logger.info("Gemini file processing times by size: %s", gemini_file_poller.metrics.format_stats())
+        chunks = [chunk for chunk in self.manifest_store.chunk_manifest if chunk.get("gemini_file")]
+        if not chunks:
+            return
+        await asyncio.gather(
+            *(gemini_client.delete_file_async(chunk["gemini_file"]["name"]) for chunk in chunks)
+        )
+        for chunk in chunks:
+            await self.manifest_store.set_chunk_gemini_file(chunk["chunk_index"], None)
+        logger.info("Deleted %s session files from Gemini.", len(chunks))
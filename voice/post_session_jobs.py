@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config import POST_SESSION_JOBS_DB_PATH, POST_SESSION_MAX_ATTEMPTS, POST_SESSION_WORKERS, client
+from .transcription import VoiceRecorder
+
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("transcribe", "rebuild", "summarize", "upload", "images", "cleanup")
+DONE = "done"
+RETRY_BASE_SECONDS = 5
+
+
+class PostSessionJobStore:
+    """SQLite record of post-session jobs and the next stage each one has to run."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.row_factory = sqlite3.Row
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS post_session_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_dir TEXT NOT NULL,
+                guild_id INTEGER NOT NULL,
+                voice_channel_id INTEGER NOT NULL,
+                category_id INTEGER,
+                stage TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                timings TEXT NOT NULL DEFAULT '{}',
+                error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        return connection
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+    def create_job(self, *, session_dir: Path, guild_id: int, voice_channel_id: int, category_id: int | None) -> int:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                INSERT INTO post_session_jobs
+                    (session_dir, guild_id, voice_channel_id, category_id, stage, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)
+                """,
+                (str(session_dir), guild_id, voice_channel_id, category_id, STAGES[0], self._now(), self._now()),
+            )
+            return int(cursor.lastrowid)
+
+    def get_job(self, job_id: int) -> dict | None:
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM post_session_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def resumable_job_ids(self) -> list[int]:
+        """Jobs a previous process left pending or mid-stage, oldest first."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE post_session_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (self._now(),),
+            )
+            rows = connection.execute(
+                "SELECT id FROM post_session_jobs WHERE status = 'pending' ORDER BY id"
+            ).fetchall()
+        return [int(row["id"]) for row in rows]
+
+    def mark_running(self, job_id: int) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE post_session_jobs SET status = 'running', updated_at = ? WHERE id = ?",
+                (self._now(), job_id),
+            )
+
+    def complete_stage(self, job_id: int, *, next_stage: str, timings: dict) -> None:
+        status = DONE if next_stage == DONE else "running"
+        with self._connect() as connection:
+            connection.execute(
+                """
+                UPDATE post_session_jobs
+                SET stage = ?, status = ?, attempts = 0, timings = ?, error = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (next_stage, status, json.dumps(timings), self._now(), job_id),
+            )
+
+    def record_failure(self, job_id: int, *, error: str, attempts: int, give_up: bool) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE post_session_jobs SET status = ?, attempts = ?, error = ?, updated_at = ? WHERE id = ?",
+                ("failed" if give_up else "pending", attempts, error, self._now(), job_id),
+            )
+
+
+class PostSessionJobQueue:
+    """Runs transcribe -> rebuild -> summarize -> upload -> images -> cleanup for finished sessions.
+
+    Capture hands a session over with `enqueue` and can release the voice
+    connection straight away. Each job's next stage is stored in SQLite after
+    every stage, so `start` resumes unfinished jobs after a restart from the
+    session directory and manifest journal. A failing stage, or a guild that is
+    not available, is retried with backoff up to `max_attempts` times. Stage
+    durations are logged and kept on the job row.
+    """
+
+    def __init__(
+        self,
+        store: PostSessionJobStore,
+        *,
+        workers: int = POST_SESSION_WORKERS,
+        max_attempts: int = POST_SESSION_MAX_ATTEMPTS,
+    ) -> None:
+        self.store = store
+        self.worker_count = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        # Recorders of sessions captured by this process; resumed jobs rebuild theirs from disk.
+        self._live_recorders: dict[int, VoiceRecorder] = {}
+        # Delayed requeues; held here so they are not garbage-collected while sleeping.
+        self._retry_tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(index + 1), name=f"post-session-worker-{index + 1}")
+            for index in range(self.worker_count)
+        ]
+        job_ids = await asyncio.to_thread(self.store.resumable_job_ids)
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        if job_ids:
+            logger.info("Resuming %s unfinished post-session jobs: %s", len(job_ids), job_ids)
+
+    async def enqueue(self, recorder: VoiceRecorder, *, voice_channel_id: int) -> int:
+        job_id = await asyncio.to_thread(
+            self.store.create_job,
+            session_dir=recorder.session_dir,
+            guild_id=recorder.guild.id,
+            voice_channel_id=voice_channel_id,
+            category_id=recorder.category.id if recorder.category else None,
+        )
+        self._live_recorders[job_id] = recorder
+        self._queue.put_nowait(job_id)
+        logger.info("Queued post-session job %s for %s (queue depth %s).", job_id, recorder.session_dir, self._queue.qsize())
+        return job_id
+
+    async def _worker(self, worker_number: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as exc:
+                logger.exception("Post-session worker %s crashed on job %s: %s", worker_number, job_id, exc)
+            finally:
+                self._queue.task_done()
+
+    async def _recorder_for_job(self, job: dict) -> VoiceRecorder | None:
+        recorder = self._live_recorders.get(job["id"])
+        if recorder is not None:
+            return recorder
+        guild = client.get_guild(job["guild_id"])
+        if guild is None:
+            return None
+        recorder = VoiceRecorder(Path(job["session_dir"]))
+        recorder.guild = guild
+        recorder.category = guild.get_channel(job["category_id"]) if job["category_id"] else None
+        recorder._gemini_guild_id = guild.id
+        await recorder.refresh_context_from_category(recorder.category)
+        self._live_recorders[job["id"]] = recorder
+        return recorder
+
+    async def _run_stage(self, recorder: VoiceRecorder, stage: str) -> None:
+        if stage == "transcribe":
+            await recorder.transcribe_pending_chunks()
+        elif stage == "rebuild":
+            await recorder.rebuild_transcript_from_manifest()
+        elif stage == "summarize":
+            await recorder.summarize_transcript()
+        elif stage == "upload":
+            await recorder.upload_session_outputs()
+        elif stage == "images":
+            await recorder.post_session_images()
+        elif stage == "cleanup":
+            await recorder.cleanup_session_artifacts()
+
+    async def _run_job(self, job_id: int) -> None:
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        if job is None or job["status"] == DONE:
+            return
+        recorder = await self._recorder_for_job(job)
+        if recorder is None:
+            await self._handle_failure(job_id, job["stage"], RuntimeError(f"guild {job['guild_id']} is unavailable"))
+            return
+
+        await asyncio.to_thread(self.store.mark_running, job_id)
+        timings = json.loads(job["timings"] or "{}")
+        stage_index = STAGES.index(job["stage"])
+        for stage in STAGES[stage_index:]:
+            started_at = time.monotonic()
+            try:
+                await self._run_stage(recorder, stage)
+            except Exception as exc:
+                await self._handle_failure(job_id, stage, exc)
+                return
+            timings[stage] = round(time.monotonic() - started_at, 2)
+            next_stage = STAGES[STAGES.index(stage) + 1] if stage != STAGES[-1] else DONE
+            await asyncio.to_thread(self.store.complete_stage, job_id, next_stage=next_stage, timings=timings)
+            logger.info("Post-session job %s finished stage %s in %.1fs.", job_id, stage, timings[stage])
+
+        self._live_recorders.pop(job_id, None)
+        logger.info("Post-session job %s completed. Stage timings: %s", job_id, timings)
+
+    async def _handle_failure(self, job_id: int, stage: str, exc: Exception) -> None:
+        # Re-read the row: completed stages reset the attempt count, so only this stage's failures count.
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        attempts = int(job["attempts"]) + 1 if job else self.max_attempts
+        give_up = attempts >= self.max_attempts
+        await asyncio.to_thread(
+            self.store.record_failure,
+            job_id,
+            error=f"{stage}: {exc}",
+            attempts=attempts,
+            give_up=give_up,
+        )
+        if give_up:
+            self._live_recorders.pop(job_id, None)
+            logger.error("Post-session job %s failed at stage %s after %s attempts: %s", job_id, stage, attempts, exc)
+            return
+        delay = RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+        logger.warning("Post-session job %s failed at stage %s (%s); retrying in %ss.", job_id, stage, exc, delay)
+
+        async def requeue() -> None:
+            await asyncio.sleep(delay)
+            self._queue.put_nowait(job_id)
+
+        task = asyncio.create_task(requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+
+post_session_jobs = PostSessionJobQueue(PostSessionJobStore(POST_SESSION_JOBS_DB_PATH))
@@ -0,0 +1,71 @@
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from config import VOICE_SESSIONS_PATH
+from .post_session_jobs import post_session_jobs
+from .transcription import VoiceRecorder
+
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceSessionRegistry:
+    """Tracks one `VoiceRecorder` per recorded voice channel.
+
+    Every recording works in `<root>/<guild_id>/<channel_id>/<started_at>/` with
+    its own transcript, manifest, audio files, Gemini uploads and transcription
+    queue, so campaigns in different guilds can record and transcribe at the
+    same time, and a channel can start recording again while the post-session
+    job of its previous recording is still running.
+    """
+
+    def __init__(self, root: Path = VOICE_SESSIONS_PATH) -> None:
+        self.root = root
+        self._sessions: dict[tuple[int, int], VoiceRecorder] = {}
+
+    @staticmethod
+    def session_key(voice_channel) -> tuple[int, int]:
+        return voice_channel.guild.id, voice_channel.id
+
+    def session_dir(self, voice_channel) -> Path:
+        guild_id, channel_id = self.session_key(voice_channel)
+        started_at = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        return self.root / str(guild_id) / str(channel_id) / started_at
+
+    def get(self, voice_channel) -> VoiceRecorder | None:
+        return self._sessions.get(self.session_key(voice_channel))
+
+    def is_active(self, voice_channel) -> bool:
+        return self.session_key(voice_channel) in self._sessions
+
+    def active_sessions(self) -> dict[tuple[int, int], VoiceRecorder]:
+        return dict(self._sessions)
+
+    async def run_session(self, voice_client) -> None:
+        """Record `voice_client`'s channel until the session finalizes, then release it."""
+        channel = voice_client.channel
+        key = self.session_key(channel)
+        if key in self._sessions:
+            logger.info("A recording session is already running for voice channel %s.", channel.name)
+            return
+        recorder = VoiceRecorder(self.session_dir(channel))
+        self._sessions[key] = recorder
+        logger.info(
+            "Started voice session for guild %s channel %s (%s active).",
+            key[0],
+            key[1],
+            len(self._sessions),
+        )
+        try:
+            await recorder.capture_audio(voice_client)
+        finally:
+            self._sessions.pop(key, None)
+            logger.info("Voice session for guild %s channel %s ended.", key[0], key[1])
+            if recorder.manifest_store.chunk_manifest:
+                await post_session_jobs.enqueue(recorder, voice_channel_id=channel.id)
+            else:
+                await recorder.transcription_queue.drain()
+
+
+voice_sessions = VoiceSessionRegistry()
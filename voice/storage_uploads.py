@@ -1,15 +1,31 @@
+import asyncio
+import base64
+import hashlib
+import json
 import logging
 import mimetypes
 from pathlib import Path
 from urllib.parse import quote
 
-import requests
+import aiohttp
 
-from config import DISCORD_GUILD_ID, SUPABASE_SERVICE_KEY, SUPABASE_STORAGE_BUCKET, SUPABASE_URL
+from config import (
+    DISCORD_GUILD_ID,
+    STORAGE_UPLOAD_CHUNK_BYTES,
+    STORAGE_UPLOAD_CONCURRENCY,
+    SUPABASE_SERVICE_KEY,
+    SUPABASE_STORAGE_BUCKET,
+    SUPABASE_URL,
+)
 
 
 logger = logging.getLogger(__name__)
 
+TUS_VERSION = "1.0.0"
+UPLOAD_INDEX_FILENAME = "storage_upload_index.json"
+HASH_BLOCK_BYTES = 1024 * 1024
+MAX_RESUME_ATTEMPTS = 3
+
 
 def _storage_headers(content_type: str) -> dict[str, str]:
     if not SUPABASE_SERVICE_KEY:
@@ -22,6 +38,13 @@ def _storage_headers(content_type: str) -> dict[str, str]:
     }
 
 
+def _tus_headers(**extra: str) -> dict[str, str]:
+    headers = _storage_headers("application/offset+octet-stream")
+    headers["Tus-Resumable"] = TUS_VERSION
+    headers.update(extra)
+    return headers
+
+
 def _bucket_endpoint() -> str:
     if not SUPABASE_URL:
         raise RuntimeError("SUPABASE_URL is not configured.")
@@ -32,35 +55,148 @@ def _object_endpoint(bucket_name: str, object_path: str) -> str:
     return f"{SUPABASE_URL.rstrip('/')}/storage/v1/object/{bucket_name}/{quote(object_path, safe='/')}"
 
 
-def ensure_storage_bucket(bucket_name: str = SUPABASE_STORAGE_BUCKET) -> None:
-    response = requests.get(
-        f"{_bucket_endpoint()}/{bucket_name}",
-        headers=_storage_headers("application/json"),
-        timeout=30,
-    )
-    if response.status_code == 200:
-        return
-    if response.status_code not in {400, 404}:
-        response.raise_for_status()
-
-    create_response = requests.post(
+def _resumable_endpoint() -> str:
+    return f"{SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable"
+
+
+def _tus_metadata(**values: str) -> str:
+    return ",".join(f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}" for key, value in values.items())
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while block := handle.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_block(path: Path, offset: int, size: int) -> bytes:
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        return handle.read(size)
+
+
+def _load_upload_index(index_path: Path) -> dict[str, str]:
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+async def ensure_storage_bucket(session: aiohttp.ClientSession, bucket_name: str = SUPABASE_STORAGE_BUCKET) -> None:
+    async with session.get(f"{_bucket_endpoint()}/{bucket_name}", headers=_storage_headers("application/json")) as response:
+        if response.status == 200:
+            return
+        if response.status not in {400, 404}:
+            response.raise_for_status()
+
+    async with session.post(
         _bucket_endpoint(),
         headers=_storage_headers("application/json"),
         json={"id": bucket_name, "name": bucket_name, "public": False},
-        timeout=30,
-    )
-    if create_response.status_code not in {200, 201, 409}:
-        create_response.raise_for_status()
+    ) as create_response:
+        if create_response.status not in {200, 201, 409}:
+            create_response.raise_for_status()
+
+
+async def _upload_small_object(
+    session: aiohttp.ClientSession,
+    path: Path,
+    *,
+    bucket_name: str,
+    object_path: str,
+    content_type: str,
+) -> None:
+    data = await asyncio.to_thread(path.read_bytes)
+    async with session.post(
+        _object_endpoint(bucket_name, object_path),
+        headers=_storage_headers(content_type),
+        data=data,
+    ) as response:
+        if response.status not in {200, 201}:
+            response.raise_for_status()
 
 
-def upload_session_artifacts_for_guild(
+async def _upload_resumable_object(
+    session: aiohttp.ClientSession,
+    path: Path,
+    *,
+    bucket_name: str,
+    object_path: str,
+    content_type: str,
+    size: int,
+    chunk_bytes: int,
+) -> None:
+    """Upload through Supabase's TUS endpoint, one `chunk_bytes` block in memory at a time.
+
+    A failed block asks the server for its current offset and continues from
+    there instead of starting the file over.
+    """
+    async with session.post(
+        _resumable_endpoint(),
+        headers=_tus_headers(
+            **{
+                "Upload-Length": str(size),
+                "Upload-Metadata": _tus_metadata(
+                    bucketName=bucket_name,
+                    objectName=object_path,
+                    contentType=content_type,
+                ),
+            }
+        ),
+    ) as create_response:
+        if create_response.status != 201:
+            create_response.raise_for_status()
+        upload_url = create_response.headers["Location"]
+
+    offset = 0
+    failures = 0
+    while offset < size:
+        block = await asyncio.to_thread(_read_block, path, offset, chunk_bytes)
+        try:
+            async with session.patch(
+                upload_url,
+                headers=_tus_headers(**{"Upload-Offset": str(offset)}),
+                data=block,
+            ) as response:
+                if response.status != 204:
+                    response.raise_for_status()
+                offset = int(response.headers.get("Upload-Offset", offset + len(block)))
+            failures = 0
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            failures += 1
+            if failures > MAX_RESUME_ATTEMPTS:
+                raise
+            logger.warning("Upload of %s interrupted at byte %s (%s); resuming.", object_path, offset, exc)
+            await asyncio.sleep(2 ** failures)
+            async with session.head(upload_url, headers=_tus_headers()) as head_response:
+                head_response.raise_for_status()
+                offset = int(head_response.headers["Upload-Offset"])
+
+
+async def upload_session_artifacts_for_guild(
     *,
     guild_id: int,
     audio_files: list[Path],
     transcript_path: Path,
     manifest_path: Path,
+    session_prefix: str | None = None,
     bucket_name: str = SUPABASE_STORAGE_BUCKET,
+    index_path: Path | None = None,
+    concurrency: int = STORAGE_UPLOAD_CONCURRENCY,
+    chunk_bytes: int = STORAGE_UPLOAD_CHUNK_BYTES,
 ) -> list[str]:
+    """Upload a session's artifacts concurrently over one pooled HTTP session.
+
+    Files up to `chunk_bytes` go up in a single request; larger ones use the
+    resumable endpoint in `chunk_bytes` blocks. A SHA-256 per object is kept in
+    `index_path` (next to the transcript by default), and objects whose content
+    has not changed since their last successful upload are skipped. Objects go
+    under `guild_<id>/sessions/<session_prefix>/`, so concurrent sessions in one
+    guild never share keys. If any object fails, the index is still saved for
+    the others and the call raises.
+    """
     if not DISCORD_GUILD_ID or str(guild_id) != str(DISCORD_GUILD_ID):
         logger.info(
             "Skipping Supabase storage upload for guild %s because it does not match configured DISCORD_GUILD_ID.",
@@ -71,23 +207,64 @@ def upload_session_artifacts_for_guild(
         logger.info("Skipping Supabase storage upload because storage credentials are incomplete.")
         return []
 
-    ensure_storage_bucket(bucket_name)
-
-    uploaded_paths: list[str] = []
+    index_path = index_path or transcript_path.parent / UPLOAD_INDEX_FILENAME
+    upload_index = await asyncio.to_thread(_load_upload_index, index_path)
     base_prefix = f"guild_{guild_id}/sessions"
+    if session_prefix:
+        base_prefix = f"{base_prefix}/{session_prefix.strip('/')}"
     files_to_upload = [path for path in [*audio_files, transcript_path, manifest_path] if path.exists()]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-    for path in files_to_upload:
-        object_path = f"{base_prefix}/{path.name}"
-        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
-        response = requests.post(
-            _object_endpoint(bucket_name, object_path),
-            headers=_storage_headers(content_type),
-            data=path.read_bytes(),
-            timeout=120,
-        )
-        if response.status_code not in {200, 201}:
-            response.raise_for_status()
-        uploaded_paths.append(object_path)
+    connector = aiohttp.TCPConnector(limit=max(1, concurrency))
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await ensure_storage_bucket(session, bucket_name)
 
+        async def upload(path: Path) -> str | None:
+            object_path = f"{base_prefix}/{path.name}"
+            async with semaphore:
+                content_hash = await asyncio.to_thread(file_sha256, path)
+                if upload_index.get(object_path) == content_hash:
+                    logger.info("Skipping unchanged storage object %s.", object_path)
+                    return None
+                content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+                size = path.stat().st_size
+                if size > chunk_bytes:
+                    await _upload_resumable_object(
+                        session,
+                        path,
+                        bucket_name=bucket_name,
+                        object_path=object_path,
+                        content_type=content_type,
+                        size=size,
+                        chunk_bytes=chunk_bytes,
+                    )
+                else:
+                    await _upload_small_object(
+                        session,
+                        path,
+                        bucket_name=bucket_name,
+                        object_path=object_path,
+                        content_type=content_type,
+                    )
+            upload_index[object_path] = content_hash
+            return object_path
+
+        results = await asyncio.gather(*(upload(path) for path in files_to_upload), return_exceptions=True)
+
+    await asyncio.to_thread(index_path.write_text, json.dumps(upload_index, indent=2), "utf-8")
+
+    uploaded_paths: list[str] = []
+    errors: list[BaseException] = []
+    for path, result in zip(files_to_upload, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to upload %s to Supabase storage: %s", path.name, result)
+            errors.append(result)
+        elif result:
+            uploaded_paths.append(result)
+    if errors:
+        # The index already records what succeeded, so a retry only re-sends the failed objects.
+        raise RuntimeError(
+            f"{len(errors)} of {len(files_to_upload)} session artifacts failed to upload to Supabase storage."
+        ) from errors[0]
     return uploaded_paths
@@ -2,8 +2,8 @@ import asyncio
 import logging
 from pathlib import Path
 
-from config import AUDIO_SUMMARY_WINDOW_CHUNKS, GEMINI_SUMMARY_MODEL
-from ai_services.gemini_client import gemini_client
+from config import AUDIO_SUMMARY_CONCURRENCY, AUDIO_SUMMARY_WINDOW_CHUNKS, GEMINI_SUMMARY_MODEL
+from ai_services.gemini_client import gemini_client, is_gemini_file_unavailable_error
 from prompts.transcription_prompts import (
     build_audio_narrative_summary_prompt,
     build_audio_objective_summary_prompt,
@@ -17,13 +17,16 @@ logger = logging.getLogger(__name__)
 
 
 class AudioSummaryService:
-    def __init__(self, transcript_service: TranscriptService) -> None:
+    def __init__(self, transcript_service: TranscriptService, file_registry=None) -> None:
         self.transcript_service = transcript_service
+        self.file_registry = file_registry
 
     async def build_audio_summary_windows(self, manifest_store: TranscriptManifestStore) -> list[dict]:
         windows = []
         transcribed_chunks = [
-            chunk for chunk in manifest_store.sorted_chunks() if chunk.get("audio_file")
+            chunk
+            for chunk in manifest_store.sorted_chunks()
+            if chunk.get("audio_file") and chunk.get("status") != "skipped_silence"
         ]
         if not transcribed_chunks:
             return windows
@@ -46,48 +49,63 @@ class AudioSummaryService:
             )
         return windows
 
+    async def summarize_audio_window(self, window: dict, context_block: str | None = None) -> dict:
+        prompt = build_audio_summary_chunk_prompt(
+            window["window_index"],
+            window["start_offset_seconds"],
+            window["end_offset_seconds"],
+            context_block,
+        )
+        try:
+            if self.file_registry is not None:
+                handles = await self.file_registry.handles_for_chunks(window["chunk_indexes"])
+                result = await gemini_client.generate_text_from_uploaded_files_async(
+                    handles,
+                    prompt,
+                    GEMINI_SUMMARY_MODEL,
+                )
+            else:
+                result = await gemini_client.generate_text_from_files_async(
+                    window["file_paths"],
+                    prompt,
+                    GEMINI_SUMMARY_MODEL,
+                )
+            payload = self.transcript_service.extract_json_payload(result)
+            payload.setdefault("window_index", window["window_index"])
+            payload.setdefault("start_offset_seconds", window["start_offset_seconds"])
+            payload.setdefault("end_offset_seconds", window["end_offset_seconds"])
+            return payload
+        except Exception as exc:
+            logger.error("Audio summary window %s failed: %s", window["window_index"], exc)
+            if self.file_registry is not None and is_gemini_file_unavailable_error(exc):
+                for chunk_index in window["chunk_indexes"]:
+                    await self.file_registry.forget(chunk_index)
+            return {
+                "window_index": window["window_index"],
+                "start_offset_seconds": window["start_offset_seconds"],
+                "end_offset_seconds": window["end_offset_seconds"],
+                "objective_notes": [],
+                "narrative_notes": [],
+                "notable_cues": [],
+                "uncertainties": [f"Window summary failed: {exc}"],
+            }
+
     async def summarize_audio_windows(
         self,
         manifest_store: TranscriptManifestStore,
         context_block: str | None = None,
+        *,
+        concurrency: int = AUDIO_SUMMARY_CONCURRENCY,
     ) -> list[dict]:
-        window_summaries = []
-        windows = await self.build_audio_summary_windows(manifest_store)
-        for window in windows:
-            if not window["file_paths"]:
-                continue
-            prompt = build_audio_summary_chunk_prompt(
-                window["window_index"],
-                window["start_offset_seconds"],
-                window["end_offset_seconds"],
-                context_block,
-            )
-            try:
-                result = await asyncio.to_thread(
-                    gemini_client.generate_text_from_files,
-                    window["file_paths"],
-                    prompt,
-                    GEMINI_SUMMARY_MODEL,
-                )
-                payload = self.transcript_service.extract_json_payload(result)
-                payload.setdefault("window_index", window["window_index"])
-                payload.setdefault("start_offset_seconds", window["start_offset_seconds"])
-                payload.setdefault("end_offset_seconds", window["end_offset_seconds"])
-                window_summaries.append(payload)
-            except Exception as exc:
-                logger.error("Audio summary window %s failed: %s", window["window_index"], exc)
-                window_summaries.append(
-                    {
-                        "window_index": window["window_index"],
-                        "start_offset_seconds": window["start_offset_seconds"],
-                        "end_offset_seconds": window["end_offset_seconds"],
-                        "objective_notes": [],
-                        "narrative_notes": [],
-                        "notable_cues": [],
-                        "uncertainties": [f"Window summary failed: {exc}"],
-                    }
-                )
-        return window_summaries
+        windows = [window for window in await self.build_audio_summary_windows(manifest_store) if window["file_paths"]]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(window: dict) -> dict:
+            async with semaphore:
+                return await self.summarize_audio_window(window, context_block)
+
+        # gather keeps results in window order regardless of completion order.
+        return list(await asyncio.gather(*(run(window) for window in windows)))
 
     def format_audio_summary_notes(self, window_summaries: list[dict]) -> str:
         sections = []
@@ -122,14 +140,16 @@ class AudioSummaryService:
         objective_prompt = build_audio_objective_summary_prompt(notes_text, context_block)
         narrative_prompt = build_audio_narrative_summary_prompt(notes_text, context_block)
 
-        objective_summary = await asyncio.to_thread(
-            gemini_client.generate_summary_text,
-            objective_prompt,
-            None,
-        )
-        narrative_summary = await asyncio.to_thread(
-            gemini_client.generate_summary_text,
-            narrative_prompt,
-            None,
+        objective_result, narrative_result = await asyncio.gather(
+            gemini_client.generate_summary_text_async(objective_prompt),
+            gemini_client.generate_summary_text_async(narrative_prompt),
+            return_exceptions=True,
         )
-        return objective_summary, narrative_summary
+        # One failed reduction should not throw away the other.
+        if isinstance(objective_result, BaseException):
+            logger.error("Objective summary reduction failed: %s", objective_result)
+            objective_result = None
+        if isinstance(narrative_result, BaseException):
+            logger.error("Narrative summary reduction failed: %s", narrative_result)
+            narrative_result = None
+        return objective_result, narrative_result
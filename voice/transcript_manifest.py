@@ -1,40 +1,163 @@
 import asyncio
 import json
+import logging
+import os
 from datetime import datetime
 from pathlib import Path
 
+from config import MANIFEST_COMPACT_EVENTS
+
+
+logger = logging.getLogger(__name__)
+
 
 class TranscriptManifestStore:
-    def __init__(self, transcript_path: Path, manifest_path: Path, chunk_seconds: int) -> None:
+    """Chunk manifest for one recording session, persisted as snapshot + journal.
+
+    Every change is appended as one JSON line to `<manifest>.journal.jsonl`, so
+    a chunk update costs a single small write instead of re-serializing the
+    whole manifest. Every `compact_every` events (and whenever `persist` is
+    called) the state is written to the snapshot file atomically and the
+    journal is truncated. `recover` rebuilds the state from the snapshot plus
+    whatever the journal holds, ignoring a torn final line.
+    """
+
+    def __init__(
+        self,
+        transcript_path: Path,
+        manifest_path: Path,
+        chunk_seconds: int,
+        *,
+        compact_every: int = MANIFEST_COMPACT_EVENTS,
+    ) -> None:
         self.transcript_path = transcript_path
         self.manifest_path = manifest_path
+        self.journal_path = manifest_path.with_name(f"{manifest_path.stem}.journal.jsonl")
+        self.compact_every = max(1, compact_every)
         self.chunk_manifest: list[dict] = []
         self.chunk_counter = 0
         self.session_started_at: str | None = None
         self.session_chunk_seconds = chunk_seconds
         self.lock = asyncio.Lock()
+        self._journal_events = 0
 
     async def initialize_session_files(self, duration: int) -> None:
-        self.chunk_manifest = []
-        self.chunk_counter = 0
-        self.session_started_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-        self.session_chunk_seconds = duration
-
-        self.transcript_path.write_text("", encoding="utf-8")
-        self.manifest_path.write_text("", encoding="utf-8")
-        await self.persist()
+        async with self.lock:
+            if self.chunk_manifest:
+                logger.info(
+                    "Starting a new session over %s chunks left from %s.",
+                    len(self.chunk_manifest),
+                    self.session_started_at,
+                )
+            self._apply(
+                {
+                    "op": "session",
+                    "session_started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                    "recording_chunk_seconds": duration,
+                }
+            )
+            self.transcript_path.write_text("", encoding="utf-8")
+            await self._compact()
 
-    async def persist(self) -> None:
-        payload = {
+    def snapshot_payload(self) -> dict:
+        return {
             "session_started_at": self.session_started_at,
             "recording_chunk_seconds": self.session_chunk_seconds,
             "chunks": self.chunk_manifest,
         }
-        await asyncio.to_thread(
-            self.manifest_path.write_text,
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            "utf-8",
-        )
+
+    async def persist(self) -> None:
+        async with self.lock:
+            await self._compact()
+
+    async def _compact(self) -> None:
+        payload = json.dumps(self.snapshot_payload(), ensure_ascii=False, indent=2)
+        await asyncio.to_thread(self._write_snapshot, payload)
+        self._journal_events = 0
+
+    def _write_snapshot(self, payload: str) -> None:
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        temp_path.write_text(payload, encoding="utf-8")
+        os.replace(temp_path, self.manifest_path)
+        # Replay is idempotent, so a crash between these two steps only re-applies events.
+        self.journal_path.write_text("", encoding="utf-8")
+
+    async def _record(self, event: dict) -> None:
+        """Apply `event` and journal it. Callers hold `self.lock`."""
+        self._apply(event)
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        await asyncio.to_thread(self._append_journal, line)
+        self._journal_events += 1
+        if self._journal_events >= self.compact_every:
+            await self._compact()
+
+    def _append_journal(self, line: str) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(line)
+            journal.flush()
+
+    def _apply(self, event: dict) -> None:
+        op = event.get("op")
+        if op == "session":
+            self.chunk_manifest = []
+            self.chunk_counter = 0
+            self.session_started_at = event.get("session_started_at")
+            self.session_chunk_seconds = event.get("recording_chunk_seconds", self.session_chunk_seconds)
+        elif op == "chunk":
+            chunk = event["chunk"]
+            existing = self.get_chunk(chunk["chunk_index"])
+            if existing is not None:
+                existing.clear()
+                existing.update(chunk)
+            else:
+                self.chunk_manifest.append(chunk)
+            self.chunk_counter = max(self.chunk_counter, chunk["chunk_index"])
+        elif op == "update":
+            chunk = self.get_chunk(event["chunk_index"])
+            if chunk is None:
+                return
+            chunk.update(event.get("set", {}))
+            for key in event.get("drop", []):
+                chunk.pop(key, None)
+
+    def recover(self) -> int:
+        """Load the snapshot and replay the journal; returns the number of chunks recovered."""
+        self.chunk_manifest = []
+        self.chunk_counter = 0
+        try:
+            snapshot_text = self.manifest_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            snapshot_text = ""
+        if snapshot_text.strip():
+            try:
+                snapshot = json.loads(snapshot_text)
+            except json.JSONDecodeError as exc:
+                logger.warning("Ignoring unreadable manifest snapshot %s: %s", self.manifest_path, exc)
+                snapshot = {}
+            self.session_started_at = snapshot.get("session_started_at")
+            self.session_chunk_seconds = snapshot.get("recording_chunk_seconds", self.session_chunk_seconds)
+            for chunk in snapshot.get("chunks", []):
+                self._apply({"op": "chunk", "chunk": chunk})
+
+        replayed = 0
+        try:
+            journal_lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            journal_lines = []
+        for line_number, line in enumerate(journal_lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping torn manifest journal line %s in %s.", line_number, self.journal_path)
+                continue
+            self._apply(event)
+            replayed += 1
+        self._journal_events = replayed
+        if replayed:
+            logger.info("Replayed %s manifest journal events from %s.", replayed, self.journal_path)
+        return len(self.chunk_manifest)
 
     async def register_chunk(self, audio_filename: Path, duration: int) -> dict:
         return await self.register_external_chunk(audio_filename, duration, self.chunk_counter * duration)
@@ -48,11 +171,12 @@ class TranscriptManifestStore:
         source_user_id: int | None = None,
         source_user_name: str | None = None,
         capture_mode: str | None = None,
+        offset_map: list[list[float]] | None = None,
+        audio_duration_seconds: int | None = None,
     ) -> dict:
         async with self.lock:
-            self.chunk_counter += 1
             chunk = {
-                "chunk_index": self.chunk_counter,
+                "chunk_index": self.chunk_counter + 1,
                 "audio_file": str(audio_filename),
                 "start_offset_seconds": start_offset_seconds,
                 "duration_seconds": duration,
@@ -67,8 +191,11 @@ class TranscriptManifestStore:
                 chunk["source_user_name"] = source_user_name
             if capture_mode:
                 chunk["capture_mode"] = capture_mode
-            self.chunk_manifest.append(chunk)
-            await self.persist()
+            if offset_map:
+                chunk["offset_map"] = offset_map
+            if audio_duration_seconds is not None:
+                chunk["audio_duration_seconds"] = audio_duration_seconds
+            await self._record({"op": "chunk", "chunk": chunk})
             return chunk
 
     async def update_chunk_result(
@@ -82,19 +209,32 @@ class TranscriptManifestStore:
         error: str | None = None,
     ) -> None:
         async with self.lock:
-            chunk = self.get_chunk(chunk_index)
-            if chunk is None:
+            if self.get_chunk(chunk_index) is None:
                 return
-            chunk["status"] = status
+            changes: dict = {"status": status}
             if notes is not None:
-                chunk["notes"] = notes
+                changes["notes"] = notes
             if roster_hints is not None:
-                chunk["roster_hints"] = roster_hints
+                changes["roster_hints"] = roster_hints
             if segments is not None:
-                chunk["segments"] = segments
+                changes["segments"] = segments
             if error:
-                chunk["error"] = error
-            await self.persist()
+                changes["error"] = error
+            event = {"op": "update", "chunk_index": chunk_index, "set": changes}
+            if not error and status == "transcribed":
+                # A retry succeeded; drop the error left by the earlier attempt.
+                event["drop"] = ["error"]
+            await self._record(event)
+
+    async def set_chunk_gemini_file(self, chunk_index: int, handle: dict | None) -> None:
+        async with self.lock:
+            if self.get_chunk(chunk_index) is None:
+                return
+            if handle is None:
+                event = {"op": "update", "chunk_index": chunk_index, "drop": ["gemini_file"]}
+            else:
+                event = {"op": "update", "chunk_index": chunk_index, "set": {"gemini_file": handle}}
+            await self._record(event)
 
     def get_chunk(self, chunk_index: int) -> dict | None:
         return next((item for item in self.chunk_manifest if item["chunk_index"] == chunk_index), None)
@@ -153,6 +293,10 @@ class TranscriptManifestStore:
             self.manifest_path.write_text("", encoding="utf-8")
         except Exception:
             pass
+        try:
+            self.journal_path.write_text("", encoding="utf-8")
+        except Exception:
+            pass
 
     def build_manifest_payload(self, *, window_summaries: list[dict] | None = None) -> dict:
         payload = {"chunks": self.chunk_manifest}
@@ -1,5 +1,6 @@
 import logging
 import os
+import shutil
 from pathlib import Path
 
 import discord
@@ -35,9 +36,7 @@ class TranscriptOutputService:
     async def post_transcript_to_channel(self, summary_channel) -> None:
         await summary_channel.send("Full transcript attached:", file=discord.File(self.transcript_path))
 
-    async def cleanup_live_artifacts(self, voice_client, reset_callback) -> None:
-        logger.info("Cleaning up transcript and audio files...")
-
+    async def cleanup_live_artifacts(self, reset_callback) -> None:
         try:
             transcript_content = self.transcript_path.read_text(encoding="utf-8")
         except Exception as exc:
@@ -73,3 +72,17 @@ class TranscriptOutputService:
                         segment_file.rmdir()
                 except OSError:
                     pass
+
+    def remove_session_directory(self, session_dir: Path, sessions_root: Path) -> None:
+        """Delete a finished session's directory, then any parents it left empty below `sessions_root`."""
+        if KEEP_AUDIO_FILES or KEEP_TRANSCRIPT_FILES:
+            return
+        shutil.rmtree(session_dir, ignore_errors=True)
+        logger.info("Removed session directory %s.", session_dir)
+        parent = session_dir.parent
+        while parent != sessions_root and sessions_root in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
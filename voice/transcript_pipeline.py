@@ -4,18 +4,22 @@ import logging
 import re
 from pathlib import Path
 
-from ai_services.gemini_client import gemini_client
-from config import AUDIO_PROMPT
+from ai_services.gemini_client import gemini_client, is_gemini_file_unavailable_error
+from config import AUDIO_PROMPT, GEMINI_TRANSCRIBE_MODEL, VAD_ENABLED, VAD_MIN_SPEECH_SECONDS
 from prompts.transcription_prompts import build_transcript_capture_prompt
+from .audio_levels import map_capture_offset, measure_speech_seconds
 from .transcript_manifest import TranscriptManifestStore
+from .transcript_renderer import IncrementalTranscriptRenderer
 
 
 logger = logging.getLogger(__name__)
 
 
 class TranscriptService:
-    def __init__(self, transcript_path: Path) -> None:
+    def __init__(self, transcript_path: Path, file_registry=None) -> None:
         self.transcript_path = transcript_path
+        self.file_registry = file_registry
+        self.renderer = IncrementalTranscriptRenderer(self.format_timestamp)
         self._role_like_character_labels = {
             "father",
             "daughter",
@@ -259,7 +263,14 @@ class TranscriptService:
         # If every candidate goes backwards, preserve chronology conservatively.
         return max(previous_offset, min(candidates, key=lambda candidate: abs(candidate - previous_offset)))
 
-    def normalize_segments(self, segments: list[dict], chunk_start: int = 0, chunk_duration: int = 0) -> list[dict]:
+    def normalize_segments(
+        self,
+        segments: list[dict],
+        chunk_start: int = 0,
+        chunk_duration: int = 0,
+        *,
+        offset_map: list[list[float]] | None = None,
+    ) -> list[dict]:
         normalized = [self.normalize_segment(segment) for segment in segments]
         previous_offset: int | None = None
         for segment in normalized:
@@ -269,7 +280,8 @@ class TranscriptService:
                 chunk_duration,
             )
             chosen_offset = self._choose_best_offset(raw_offset, chunk_start, chunk_duration, previous_offset)
-            segment["offset_seconds"] = chosen_offset
+            # Trimmed capture files are shorter than their window; map back to window time.
+            segment["offset_seconds"] = map_capture_offset(offset_map, chosen_offset) if offset_map else chosen_offset
             previous_offset = chosen_offset
         speaker_values = [segment.get("speaker") for segment in normalized if segment.get("speaker")]
         has_numbered_unknown = any(re.fullmatch(r"Unknown \d+", speaker or "") for speaker in speaker_values)
@@ -298,33 +310,55 @@ class TranscriptService:
         chunk_info: dict,
         manifest_store: TranscriptManifestStore,
         context_block: str | None = None,
-    ) -> None:
+    ) -> bool:
         logger.info("Preparing to send %s to Gemini for transcription...", audio_filename)
 
         if not audio_filename.exists() or audio_filename.stat().st_size == 0:
             logger.error("Audio file %s does not exist or is empty.", audio_filename)
-            return
-
+            return False
+
+        if VAD_ENABLED:
+            speech_seconds = await asyncio.to_thread(measure_speech_seconds, audio_filename)
+            if speech_seconds is not None and speech_seconds < VAD_MIN_SPEECH_SECONDS:
+                logger.info(
+                    "Skipping chunk %s: only %.1fs of speech detected in %s.",
+                    chunk_info["chunk_index"],
+                    speech_seconds,
+                    audio_filename.name,
+                )
+                await manifest_store.update_chunk_result(chunk_info["chunk_index"], status="skipped_silence")
+                return True
+
+        # Silence-trimmed captures are shorter than the window they cover.
+        audio_duration = chunk_info.get("audio_duration_seconds") or chunk_info["duration_seconds"]
         try:
             prompt = build_transcript_capture_prompt(
                 chunk_info["chunk_index"],
                 chunk_info["start_offset_seconds"],
-                chunk_info["duration_seconds"],
+                audio_duration,
                 self.build_additional_transcription_instructions(manifest_store, chunk_info),
                 context_block,
             )
-            transcript = await asyncio.to_thread(
-                gemini_client.transcribe_audio,
-                str(audio_filename),
-                prompt,
-            )
+            if self.file_registry is not None:
+                handle = await self.file_registry.ensure_uploaded(chunk_info)
+                transcript = await gemini_client.generate_text_from_uploaded_files_async(
+                    [handle],
+                    prompt,
+                    GEMINI_TRANSCRIBE_MODEL,
+                )
+            else:
+                transcript = await gemini_client.transcribe_audio_async(
+                    str(audio_filename),
+                    prompt,
+                )
             logger.info("Received transcription: %s", transcript[:100])
             payload = self.extract_json_payload(transcript)
             normalized_roster_hints = self.normalize_roster_hints(payload.get("roster_hints", []))
             normalized_segments = self.normalize_segments(
                 payload.get("segments", []),
                 chunk_info["start_offset_seconds"],
-                chunk_info["duration_seconds"],
+                audio_duration,
+                offset_map=chunk_info.get("offset_map"),
             )
             await manifest_store.update_chunk_result(
                 chunk_info["chunk_index"],
@@ -333,43 +367,70 @@ class TranscriptService:
                 roster_hints=normalized_roster_hints,
                 segments=normalized_segments,
             )
+            # Index the finished chunk right away so a rolling transcript is always current.
+            transcribed_chunk = manifest_store.get_chunk(chunk_info["chunk_index"])
+            if transcribed_chunk is not None:
+                self.renderer.set_chunk(transcribed_chunk)
+            return True
         except Exception as exc:
             logger.error("Unexpected error during Gemini transcription request: %s", exc)
+            if self.file_registry is not None and is_gemini_file_unavailable_error(exc):
+                await self.file_registry.forget(chunk_info["chunk_index"])
             await manifest_store.update_chunk_result(
                 chunk_info["chunk_index"],
                 status="failed",
                 error=str(exc),
             )
+            return False
 
-    async def rebuild_transcript_from_manifest(self, manifest_store: TranscriptManifestStore) -> str:
-        warnings: list[str] = []
-        lines: list[tuple[int, int, str]] = []
+    async def transcribe_chunks(
+        self,
+        chunks: list[tuple[Path, dict]],
+        manifest_store: TranscriptManifestStore,
+        context_block: str | None = None,
+        *,
+        concurrency: int = 1,
+    ) -> None:
+        """Transcribe registered chunks with at most `concurrency` requests in flight.
+
+        The opening chunk runs alone so introductions seed the roster hints. The
+        rest are dispatched in manifest order, so each prompt still carries the
+        hints of every earlier chunk that has already finished.
+        """
+        ordered = sorted(chunks, key=lambda item: item[1]["chunk_index"])
+        if not ordered:
+            return
+        first_path, first_info = ordered[0]
+        await self.transcribe_chunk(first_path, first_info, manifest_store, context_block)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(audio_filename: Path, chunk_info: dict) -> None:
+            try:
+                await self.transcribe_chunk(audio_filename, chunk_info, manifest_store, context_block)
+            finally:
+                semaphore.release()
 
+        tasks: list[asyncio.Task] = []
+        try:
+            for audio_filename, chunk_info in ordered[1:]:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(run(audio_filename, chunk_info)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def render_transcript(self, manifest_store: TranscriptManifestStore) -> str:
+        """Render the current transcript from the incremental index (also usable mid-session)."""
+        warnings: list[str] = []
         for chunk in manifest_store.sorted_chunks():
-            chunk_index = chunk["chunk_index"]
-            if chunk.get("status") != "transcribed":
+            status = chunk.get("status")
+            if status not in ("transcribed", "skipped_silence"):
                 error_message = chunk.get("error") or "Chunk transcription unavailable."
-                warnings.append(f"Chunk {chunk_index}: {error_message}")
-                continue
-
-            for segment in self.normalize_segments(
-                chunk.get("segments", []),
-                chunk["start_offset_seconds"],
-                chunk["duration_seconds"],
-            ):
-                absolute_seconds = chunk["start_offset_seconds"] + int(segment.get("offset_seconds", 0))
-                timestamp = self.format_timestamp(absolute_seconds)
-                mode = segment.get("mode", "UNCLEAR")
-                speaker = segment.get("speaker") or "Unknown"
-                character = segment.get("character")
-                lang = segment.get("lang") or "RO+EN"
-                header = f"[{timestamp}][{mode}][Speaker: {speaker}]"
-                if character:
-                    header += f"[Character: {character}]"
-                header += f"[Lang: {lang}]"
-                text = (segment.get("text") or "").strip()
-                if text:
-                    lines.append((absolute_seconds, chunk_index, f"{header} {text}"))
+                warnings.append(f"Chunk {chunk['chunk_index']}: {error_message}")
+        self.renderer.sync(manifest_store.chunk_manifest)
 
         transcript_parts: list[str] = []
         if manifest_store.session_started_at:
@@ -387,12 +448,13 @@ class TranscriptService:
             transcript_parts.extend(f"- {warning}" for warning in all_warnings)
 
         transcript_parts.append("\n=== SESSION TRANSCRIPT ===")
-        lines.sort(key=lambda item: (item[0], item[1], item[2]))
         transcript_parts.extend(
-            [line for _absolute_seconds, _chunk_index, line in lines]
+            self.renderer.lines()
             or ["[00:00:00][UNCLEAR][Speaker: Unknown][Lang: RO+EN] No transcript content captured."]
         )
+        return "\n".join(transcript_parts).strip() + "\n"
 
-        transcript_content = "\n".join(transcript_parts).strip() + "\n"
+    async def rebuild_transcript_from_manifest(self, manifest_store: TranscriptManifestStore) -> str:
+        transcript_content = self.render_transcript(manifest_store)
         await asyncio.to_thread(self.transcript_path.write_text, transcript_content, "utf-8")
         return transcript_content
@@ -0,0 +1,81 @@
+from bisect import bisect_left, insort
+from typing import Callable
+
+
+TranscriptLine = tuple[int, int, str]
+
+
+class IncrementalTranscriptRenderer:
+    """Sorted index of rendered transcript lines, updated one chunk at a time.
+
+    Lines are kept ordered by (absolute seconds, chunk index, text) with
+    `bisect`, so adding a finished chunk costs one insertion per segment and the
+    full transcript is a plain read of the index. `sync` compares each chunk's
+    `segments` list by identity: the manifest replaces that list whenever a
+    chunk's result changes, so only new or re-transcribed chunks are rendered.
+    Segments are rendered as stored; `transcribe_chunk` has already normalized
+    them.
+    """
+
+    def __init__(self, format_timestamp: Callable[[int], str]) -> None:
+        self.format_timestamp = format_timestamp
+        self._lines: list[TranscriptLine] = []
+        self._chunk_lines: dict[int, list[TranscriptLine]] = {}
+        self._chunk_segments: dict[int, list[dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def render_segment_line(self, segment: dict, absolute_seconds: int) -> str | None:
+        text = (segment.get("text") or "").strip()
+        if not text:
+            return None
+        header = (
+            f"[{self.format_timestamp(absolute_seconds)}][{segment.get('mode', 'UNCLEAR')}]"
+            f"[Speaker: {segment.get('speaker') or 'Unknown'}]"
+        )
+        character = segment.get("character")
+        if character:
+            header += f"[Character: {character}]"
+        header += f"[Lang: {segment.get('lang') or 'RO+EN'}]"
+        return f"{header} {text}"
+
+    def set_chunk(self, chunk: dict) -> None:
+        chunk_index = chunk["chunk_index"]
+        self.remove_chunk(chunk_index)
+        segments = chunk.get("segments") or []
+        chunk_lines: list[TranscriptLine] = []
+        for segment in segments:
+            absolute_seconds = chunk["start_offset_seconds"] + int(segment.get("offset_seconds", 0))
+            line = self.render_segment_line(segment, absolute_seconds)
+            if line is None:
+                continue
+            entry = (absolute_seconds, chunk_index, line)
+            insort(self._lines, entry)
+            chunk_lines.append(entry)
+        self._chunk_lines[chunk_index] = chunk_lines
+        self._chunk_segments[chunk_index] = chunk.get("segments")
+
+    def remove_chunk(self, chunk_index: int) -> None:
+        for entry in self._chunk_lines.pop(chunk_index, []):
+            position = bisect_left(self._lines, entry)
+            if position < len(self._lines) and self._lines[position] == entry:
+                del self._lines[position]
+        self._chunk_segments.pop(chunk_index, None)
+
+    def sync(self, chunks: list[dict]) -> None:
+        """Bring the index in line with the transcribed chunks of a manifest."""
+        current: set[int] = set()
+        for chunk in chunks:
+            if chunk.get("status") != "transcribed":
+                continue
+            chunk_index = chunk["chunk_index"]
+            current.add(chunk_index)
+            if self._chunk_segments.get(chunk_index) is not chunk.get("segments"):
+                self.set_chunk(chunk)
+        for chunk_index in list(self._chunk_lines):
+            if chunk_index not in current:
+                self.remove_chunk(chunk_index)
+
+    def lines(self) -> list[str]:
+        return [line for _absolute_seconds, _chunk_index, line in self._lines]
@@ -2,6 +2,7 @@ import asyncio
 import io
 import json
 import logging
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 
@@ -12,10 +13,9 @@ from ai_services.context_compiler import (
     compile_context_packet_from_category,
     compile_context_packet_from_category_id,
 )
-from ai_services.gemini_client import gemini_client
 from ai_services.guild_api_keys import use_guild_gemini_api_key
 from ai_services.scene_pipeline import scene_pipeline
-from .audio_utils import get_category_id_voice, probe_audio_duration, split_audio_file_for_offline
+from .audio_utils import probe_audio_duration, split_audio_file_for_offline
 from .context_support import build_context_block
 from .orchestrator import VoiceSessionOrchestrator
 from config import (
@@ -23,19 +23,24 @@ from config import (
     AUDIO_FILES_PATH,
     TRANSCRIPT_MANIFEST_PATH,
     TRANSCRIPT_PATH,
+    TRANSCRIPTION_CONCURRENCY,
     VOICE_INCLUDE_DM_CONTEXT,
+    VOICE_SESSIONS_PATH,
 )
 from data_store.db_repository import get_campaign_image_settings, get_discord_guild_id_for_category
 from discord_app.shared_functions import send_response_in_chunks
+from .gemini_file_registry import GeminiFileRegistry
 from .summary_pipeline import AudioSummaryService
 from .transcript_manifest import TranscriptManifestStore
 from .transcript_outputs import TranscriptOutputService
 from .transcript_pipeline import TranscriptService
+from .transcription_queue import TranscriptionQueue
 from .voice_capture import VoiceCaptureService
 from .storage_uploads import upload_session_artifacts_for_guild
 
 
 recording_duration = AUDIO_CHUNK_SECONDS
+POSTED_OUTPUTS_FILENAME = "posted_outputs.json"
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
 audio_files_path = Path(AUDIO_FILES_PATH)
@@ -43,29 +48,52 @@ audio_files_path.mkdir(exist_ok=True)
 
 
 class VoiceRecorder:
-    def __init__(self):
+    def __init__(self, session_dir: Path | None = None):
+        """Without `session_dir` the recorder uses the shared top-level paths (offline runs);
+        live sessions get their own directory from the voice session registry."""
         self.voice_client = None
-        self.transcription_tasks = []
-        self.transcript_path = Path(TRANSCRIPT_PATH)
-        self.transcript_manifest_path = Path(TRANSCRIPT_MANIFEST_PATH)
+        self.session_dir = session_dir
+        # Resolved from the voice channel at capture time, or from stored ids when a
+        # post-session job resumes after a restart.
+        self.guild: discord.Guild | None = None
+        self.category: discord.CategoryChannel | None = None
+        if session_dir is not None:
+            self.transcript_path = session_dir / "transcript.txt"
+            self.transcript_manifest_path = session_dir / "transcript_manifest.json"
+            self.audio_files_path = session_dir / "audio_files"
+            self.audio_files_path.mkdir(parents=True, exist_ok=True)
+        else:
+            self.transcript_path = Path(TRANSCRIPT_PATH)
+            self.transcript_manifest_path = Path(TRANSCRIPT_MANIFEST_PATH)
+            self.audio_files_path = audio_files_path
         self.session_chunk_seconds = recording_duration
         self.manifest_store = TranscriptManifestStore(
             self.transcript_path,
             self.transcript_manifest_path,
             self.session_chunk_seconds,
         )
-        self.transcript_service = TranscriptService(self.transcript_path)
-        self.summary_service = AudioSummaryService(self.transcript_service)
+        if session_dir is not None:
+            # Pick up whatever a previous run of this session left in its journal.
+            recovered = self.manifest_store.recover()
+            if recovered:
+                logging.info("Recovered %s manifest chunks from %s.", recovered, session_dir)
+        self.gemini_files = GeminiFileRegistry(self.manifest_store)
+        self.transcript_service = TranscriptService(self.transcript_path, file_registry=self.gemini_files)
+        self.summary_service = AudioSummaryService(self.transcript_service, file_registry=self.gemini_files)
+        self.transcription_queue = TranscriptionQueue(self.send_to_openai)
         self.output_service = TranscriptOutputService(
             self.transcript_path,
             self.transcript_manifest_path,
-            audio_files_path,
+            self.audio_files_path,
         )
+        if session_dir is not None:
+            # Session directories are per recording; keep one archive per voice channel.
+            self.output_service.archive_path = session_dir.parent / "transcript_archive.txt"
         self.context_block = None
         self.context_packet = None
         self.latest_objective_summary: str | None = None
         self.latest_narrative_summary: str | None = None
-        self.capture_service = VoiceCaptureService(audio_files_path)
+        self.capture_service = VoiceCaptureService(self.audio_files_path)
         self.orchestrator = VoiceSessionOrchestrator()
         self._gemini_guild_id: int | None = None
 
@@ -79,8 +107,19 @@ class VoiceRecorder:
     async def register_chunk(self, audio_filename: Path, duration: int) -> dict:
         return await self.manifest_store.register_chunk(audio_filename, duration)
 
-    async def register_external_chunk(self, audio_filename: Path, duration: int, start_offset_seconds: int) -> dict:
-        return await self.manifest_store.register_external_chunk(audio_filename, duration, start_offset_seconds)
+    async def register_external_chunk(
+        self,
+        audio_filename: Path,
+        duration: int,
+        start_offset_seconds: int,
+        **chunk_details,
+    ) -> dict:
+        return await self.manifest_store.register_external_chunk(
+            audio_filename,
+            duration,
+            start_offset_seconds,
+            **chunk_details,
+        )
 
     async def update_chunk_result(self, chunk_index: int, **kwargs) -> None:
         await self.manifest_store.update_chunk_result(chunk_index, **kwargs)
@@ -121,6 +160,16 @@ class VoiceRecorder:
                 return await self.summary_service.build_final_summaries_from_windows(window_summaries, self.context_block)
         return await self.summary_service.build_final_summaries_from_windows(window_summaries, self.context_block)
 
+    async def release_gemini_files(self) -> None:
+        try:
+            if self._gemini_guild_id is not None:
+                with use_guild_gemini_api_key(self._gemini_guild_id):
+                    await self.gemini_files.cleanup()
+                return
+            await self.gemini_files.cleanup()
+        except Exception as exc:
+            logging.warning("Failed to release session files from Gemini: %s", exc)
+
     async def refresh_context_from_category(self, category: discord.CategoryChannel | None) -> None:
         packet = await compile_context_packet_from_category(
             category,
@@ -179,34 +228,100 @@ class VoiceRecorder:
             if rationale:
                 await send_response_in_chunks(target_channel, f"**Scene selection rationale**\n{rationale}")
 
-            for index, scene in enumerate(selected_scenes, start=1):
-                request = scene_pipeline.prepare_scene_image_request(
+            requests = [
+                scene_pipeline.prepare_scene_image_request(
                     scene,
                     context_packet=context_packet,
                     quality_mode=settings.session_image_quality,
                 )
-                images = gemini_client.generate_image(
-                    request.prompt,
-                    model_name=request.model_name,
-                    aspect_ratio=request.aspect_ratio,
-                    reference_images=request.reference_assets,
-                )
-                if not images:
-                    await target_channel.send(f"Skipping `{scene.title}` because Gemini returned no image.")
-                    continue
-
-                image = images[0]
-                extension = ".png" if image["mime_type"] == "image/png" else ".jpg"
-                filename = f"session_scene_{index:02d}{extension}"
-                file = discord.File(io.BytesIO(image["image_bytes"]), filename=filename)
-                caption = (
-                    f"**{scene.title}**\n"
-                    f"• Focus: {scene.subject_focus or 'mixed'}\n"
-                    f"• Location: {scene.location or 'unspecified'}\n"
-                    f"• Aspect ratio: `{request.aspect_ratio}`\n"
-                    f"• Model: `{request.model_name}`"
-                )
-                await target_channel.send(caption, file=file)
+                for scene in selected_scenes
+            ]
+            # Scenes render concurrently; each one is posted as soon as it and every earlier scene are done.
+            async with aclosing(scene_pipeline.render_image_requests(requests)) as rendered:
+                async for index, request, images in rendered:
+                    scene = selected_scenes[index - 1]
+                    if isinstance(images, Exception):
+                        await target_channel.send(f"Skipping `{scene.title}` because image generation failed.")
+                        continue
+                    if not images:
+                        await target_channel.send(f"Skipping `{scene.title}` because Gemini returned no image.")
+                        continue
+
+                    image = images[0]
+                    extension = ".png" if image["mime_type"] == "image/png" else ".jpg"
+                    filename = f"session_scene_{index:02d}{extension}"
+                    file = discord.File(io.BytesIO(image["image_bytes"]), filename=filename)
+                    caption = (
+                        f"**{scene.title}**\n"
+                        f"• Focus: {scene.subject_focus or 'mixed'}\n"
+                        f"• Location: {scene.location or 'unspecified'}\n"
+                        f"• Aspect ratio: `{request.aspect_ratio}`\n"
+                        f"• Model: `{request.model_name}`"
+                    )
+                    await target_channel.send(caption, file=file)
+
+    async def _generate_offline_scene_images(
+        self,
+        *,
+        objective_summary: str | None,
+        narrative_summary: str | None,
+        context_packet: CompiledContextPacket | None,
+        output_root: Path,
+        session_label: str,
+        image_quality: str,
+        image_aspect_ratio: str | None,
+        image_max_scenes: int | None,
+        image_reference_paths: list[str] | None,
+    ) -> tuple[Path, list[str]]:
+        candidates = await scene_pipeline.extract_scene_candidates(
+            objective_summary=objective_summary or "",
+            narrative_summary=narrative_summary or "",
+            context_packet=context_packet,
+            max_scenes_cap=image_max_scenes,
+        )
+        selected_scenes, rationale = await scene_pipeline.select_final_scenes(
+            candidates,
+            context_packet=context_packet,
+            max_scenes_cap=image_max_scenes,
+        )
+        scene_manifest_output_path = output_root / f"scene_manifest_{session_label}.json"
+        scene_manifest_output_path.write_text(
+            json.dumps(
+                {
+                    "selection_rationale": rationale,
+                    "selected_scenes": [scene.__dict__ for scene in selected_scenes],
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+        requests = [
+            scene_pipeline.prepare_scene_image_request(
+                scene,
+                context_packet=context_packet,
+                quality_mode=image_quality,
+                aspect_ratio_override=image_aspect_ratio,
+            )
+            for scene in selected_scenes
+        ]
+        image_outputs: list[str] = []
+        async with aclosing(
+            scene_pipeline.render_image_requests(
+                requests,
+                extra_references=[Path(path).expanduser() for path in (image_reference_paths or [])],
+            )
+        ) as rendered:
+            async for index, _request, images in rendered:
+                if isinstance(images, Exception):
+                    raise images
+                for image_index, image in enumerate(images, start=1):
+                    extension = ".png" if image["mime_type"] == "image/png" else ".jpg"
+                    image_path = output_root / f"scene_{index:02d}_image_{image_index:02d}{extension}"
+                    await asyncio.to_thread(image_path.write_bytes, image["image_bytes"])
+                    image_outputs.append(str(image_path))
+        return scene_manifest_output_path, image_outputs
 
     async def process_existing_audio_files(
         self,
@@ -223,6 +338,7 @@ class VoiceRecorder:
         image_aspect_ratio: str | None = None,
         image_max_scenes: int | None = None,
         image_reference_paths: list[str] | None = None,
+        transcription_concurrency: int | None = None,
     ) -> dict:
         self._gemini_guild_id = get_discord_guild_id_for_category(discord_category_id) if discord_category_id else None
         resolved_paths = [Path(path).expanduser() for path in file_paths]
@@ -271,19 +387,35 @@ class VoiceRecorder:
 
         await self.initialize_session_files(self.session_chunk_seconds)
 
-        running_offset = 0
-        split_file_paths: list[Path] = []
-        for file_index, file_path in enumerate(resolved_paths, start=1):
-            split_dir = segment_output_root / f"input_{file_index:03d}"
-            split_file_paths.extend(self.split_audio_file_for_offline(file_path, split_dir))
+        split_groups = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self.split_audio_file_for_offline,
+                    file_path,
+                    segment_output_root / f"input_{file_index:03d}",
+                )
+                for file_index, file_path in enumerate(resolved_paths, start=1)
+            )
+        )
+        split_file_paths = [path for group in split_groups for path in group]
 
         try:
-            for file_path in split_file_paths:
-                duration = self.probe_audio_duration(file_path)
+            durations = await asyncio.gather(
+                *(asyncio.to_thread(self.probe_audio_duration, file_path) for file_path in split_file_paths)
+            )
+            # Register every chunk up front so indices and offsets follow input order.
+            running_offset = 0
+            registered_chunks: list[tuple[Path, dict]] = []
+            for file_path, duration in zip(split_file_paths, durations):
                 chunk_info = await self.register_external_chunk(file_path, duration, running_offset)
-                await self.send_to_openai(file_path, chunk_info)
+                registered_chunks.append((file_path, chunk_info))
                 running_offset += duration
 
+            await self.transcribe_chunks(
+                registered_chunks,
+                concurrency=transcription_concurrency or TRANSCRIPTION_CONCURRENCY,
+            )
+
             transcript_text = await self.rebuild_transcript_from_manifest()
             window_summaries = await self.summarize_audio_windows()
             objective_summary, narrative_summary = await self.build_final_summaries_from_windows(window_summaries)
@@ -305,97 +437,22 @@ class VoiceRecorder:
             image_outputs: list[str] = []
             scene_manifest_output_path = None
             if generate_images and (objective_summary or narrative_summary):
+                image_kwargs = dict(
+                    objective_summary=objective_summary,
+                    narrative_summary=narrative_summary,
+                    context_packet=offline_context_packet,
+                    output_root=output_root,
+                    session_label=session_label,
+                    image_quality=image_quality,
+                    image_aspect_ratio=image_aspect_ratio,
+                    image_max_scenes=image_max_scenes,
+                    image_reference_paths=image_reference_paths,
+                )
                 if self._gemini_guild_id is not None:
                     with use_guild_gemini_api_key(self._gemini_guild_id):
-                        candidates = await scene_pipeline.extract_scene_candidates(
-                            objective_summary=objective_summary or "",
-                            narrative_summary=narrative_summary or "",
-                            context_packet=offline_context_packet,
-                            max_scenes_cap=image_max_scenes,
-                        )
-                        selected_scenes, rationale = await scene_pipeline.select_final_scenes(
-                            candidates,
-                            context_packet=offline_context_packet,
-                            max_scenes_cap=image_max_scenes,
-                        )
-                        scene_manifest_output_path = output_root / f"scene_manifest_{session_label}.json"
-                        scene_manifest_output_path.write_text(
-                            json.dumps(
-                                {
-                                    "selection_rationale": rationale,
-                                    "selected_scenes": [scene.__dict__ for scene in selected_scenes],
-                                },
-                                ensure_ascii=False,
-                                indent=2,
-                            ),
-                            encoding="utf-8",
-                        )
-                        for index, scene in enumerate(selected_scenes, start=1):
-                            request = scene_pipeline.prepare_scene_image_request(
-                                scene,
-                                context_packet=offline_context_packet,
-                                quality_mode=image_quality,
-                                aspect_ratio_override=image_aspect_ratio,
-                            )
-                            images = gemini_client.generate_image(
-                                request.prompt,
-                                model_name=request.model_name,
-                                aspect_ratio=request.aspect_ratio,
-                                reference_images=[
-                                    *[asset for asset in request.reference_assets if asset.is_image],
-                                    *[Path(path).expanduser() for path in (image_reference_paths or [])],
-                                ],
-                            )
-                            for image_index, image in enumerate(images, start=1):
-                                extension = ".png" if image["mime_type"] == "image/png" else ".jpg"
-                                image_path = output_root / f"scene_{index:02d}_image_{image_index:02d}{extension}"
-                                image_path.write_bytes(image["image_bytes"])
-                                image_outputs.append(str(image_path))
+                        scene_manifest_output_path, image_outputs = await self._generate_offline_scene_images(**image_kwargs)
                 else:
-                    candidates = await scene_pipeline.extract_scene_candidates(
-                        objective_summary=objective_summary or "",
-                        narrative_summary=narrative_summary or "",
-                        context_packet=offline_context_packet,
-                        max_scenes_cap=image_max_scenes,
-                    )
-                    selected_scenes, rationale = await scene_pipeline.select_final_scenes(
-                        candidates,
-                        context_packet=offline_context_packet,
-                        max_scenes_cap=image_max_scenes,
-                    )
-                    scene_manifest_output_path = output_root / f"scene_manifest_{session_label}.json"
-                    scene_manifest_output_path.write_text(
-                        json.dumps(
-                            {
-                                "selection_rationale": rationale,
-                                "selected_scenes": [scene.__dict__ for scene in selected_scenes],
-                            },
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                        encoding="utf-8",
-                    )
-                    for index, scene in enumerate(selected_scenes, start=1):
-                        request = scene_pipeline.prepare_scene_image_request(
-                            scene,
-                            context_packet=offline_context_packet,
-                            quality_mode=image_quality,
-                            aspect_ratio_override=image_aspect_ratio,
-                        )
-                        images = gemini_client.generate_image(
-                            request.prompt,
-                            model_name=request.model_name,
-                            aspect_ratio=request.aspect_ratio,
-                            reference_images=[
-                                *[asset for asset in request.reference_assets if asset.is_image],
-                                *[Path(path).expanduser() for path in (image_reference_paths or [])],
-                            ],
-                        )
-                        for image_index, image in enumerate(images, start=1):
-                            extension = ".png" if image["mime_type"] == "image/png" else ".jpg"
-                            image_path = output_root / f"scene_{index:02d}_image_{image_index:02d}{extension}"
-                            image_path.write_bytes(image["image_bytes"])
-                            image_outputs.append(str(image_path))
+                    scene_manifest_output_path, image_outputs = await self._generate_offline_scene_images(**image_kwargs)
 
             return {
                 "transcript_path": str(transcript_output_path),
@@ -407,11 +464,14 @@ class VoiceRecorder:
                 "image_paths": image_outputs,
             }
         finally:
+            await self.release_gemini_files()
             self.output_service.cleanup_offline_segments(segment_output_root)
 
     async def capture_audio(self, voice_client, duration=recording_duration):
         self._gemini_guild_id = getattr(getattr(voice_client, "guild", None), "id", None)
-        await self.refresh_context_from_category(getattr(voice_client.channel, "category", None))
+        self.guild = voice_client.guild
+        self.category = getattr(voice_client.channel, "category", None)
+        await self.refresh_context_from_category(self.category)
         if hasattr(voice_client, "listen") and hasattr(voice_client, "is_listening"):
             logging.info("Voice capture mode: Discord receive-mode stream capture.")
             await self.capture_service.capture_discord_streams(self, voice_client, duration)
@@ -425,44 +485,120 @@ class VoiceRecorder:
     async def archive_transcript(self, content):
         await self.output_service.archive_transcript(content)
 
-    async def cleanup_files(self):
-        logging.info("Cleaning up transcript and audio files...")
-        category_id = get_category_id_voice(self.voice_client.channel)
-        guild = self.voice_client.guild
-        summary_channel = discord.utils.get(guild.text_channels, name="session-summary", category_id=category_id)
+    def _summary_channel(self) -> discord.TextChannel | None:
+        category_id = self.category.id if self.category else None
+        summary_channel = discord.utils.get(self.guild.text_channels, name="session-summary", category_id=category_id)
         if not summary_channel:
             logging.error("Could not find 'session-summary' channel in category %s.", category_id)
-            return
+        return summary_channel
 
-        audio_paths = sorted(path for path in audio_files_path.iterdir() if path.is_file()) if audio_files_path.exists() else []
+    def _saved_summary_paths(self) -> tuple[Path, Path] | None:
+        if self.session_dir is None:
+            return None
+        return self.session_dir / "objective_summary.md", self.session_dir / "narrative_summary.md"
+
+    async def save_summaries(self) -> None:
+        paths = self._saved_summary_paths()
+        if paths is None:
+            return
+        for path, content in zip(paths, (self.latest_objective_summary, self.latest_narrative_summary)):
+            if content:
+                await asyncio.to_thread(path.write_text, content, "utf-8")
+
+    async def load_saved_summaries(self) -> None:
+        """Restore summaries written by an earlier run of this session's summarize stage."""
+        paths = self._saved_summary_paths()
+        if paths is None:
+            return
+        objective_path, narrative_path = paths
+        if self.latest_objective_summary is None and objective_path.exists():
+            self.latest_objective_summary = await asyncio.to_thread(objective_path.read_text, "utf-8")
+        if self.latest_narrative_summary is None and narrative_path.exists():
+            self.latest_narrative_summary = await asyncio.to_thread(narrative_path.read_text, "utf-8")
+
+    async def transcribe_pending_chunks(self) -> None:
+        """Finish live transcription, then transcribe chunks that never got a result (e.g. after a restart)."""
+        await self.transcription_queue.drain()
+        pending = [
+            (Path(chunk["audio_file"]), chunk)
+            for chunk in self.manifest_store.pending_recorded_chunks()
+            if Path(chunk.get("audio_file", "")).exists()
+        ]
+        if pending:
+            logging.info("Transcribing %s chunks left pending from capture.", len(pending))
+            await self.transcribe_chunks(pending, concurrency=TRANSCRIPTION_CONCURRENCY)
+
+    def _load_posted_outputs(self) -> set[str]:
+        if self.session_dir is None:
+            return set()
         try:
-            uploaded_paths = await asyncio.to_thread(
-                upload_session_artifacts_for_guild,
-                guild_id=guild.id,
-                audio_files=audio_paths,
-                transcript_path=self.transcript_path,
-                manifest_path=self.transcript_manifest_path,
+            return set(json.loads((self.session_dir / POSTED_OUTPUTS_FILENAME).read_text(encoding="utf-8")))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return set()
+
+    async def _mark_posted(self, posted: set[str], name: str) -> None:
+        posted.add(name)
+        if self.session_dir is not None:
+            await asyncio.to_thread(
+                (self.session_dir / POSTED_OUTPUTS_FILENAME).write_text,
+                json.dumps(sorted(posted)),
+                "utf-8",
             )
-            if uploaded_paths:
-                logging.info(
-                    "Uploaded %s session artifacts to Supabase storage for guild %s.",
-                    len(uploaded_paths),
-                    guild.id,
-                )
-        except Exception as exc:
-            logging.error("Failed to upload session artifacts to Supabase storage: %s", exc)
 
-        await self.output_service.post_transcript_to_channel(summary_channel)
-        if self.latest_objective_summary:
-            await summary_channel.send("**Objective Summary**")
-            await send_response_in_chunks(summary_channel, self.latest_objective_summary)
-        if self.latest_narrative_summary:
-            await summary_channel.send("**Narrative Summary**")
-            await send_response_in_chunks(summary_channel, self.latest_narrative_summary)
+    async def upload_session_outputs(self) -> None:
+        """Release Gemini uploads, post transcript and summaries and archive artifacts to storage.
+
+        A storage failure propagates so the job queue retries this stage before
+        cleanup can delete anything that did not reach storage.
+        """
+        # Summaries are done by now, so the session's Gemini uploads are no longer needed.
+        await self.release_gemini_files()
+        await self.persist_manifest()
+        await self.load_saved_summaries()
+        summary_channel = self._summary_channel()
+        if summary_channel:
+            # Each post is recorded once sent, so a retried upload stage does not post it twice.
+            posted = await asyncio.to_thread(self._load_posted_outputs)
+            if "transcript" not in posted:
+                await self.output_service.post_transcript_to_channel(summary_channel)
+                await self._mark_posted(posted, "transcript")
+            if self.latest_objective_summary and "objective_summary" not in posted:
+                await summary_channel.send("**Objective Summary**")
+                await send_response_in_chunks(summary_channel, self.latest_objective_summary)
+                await self._mark_posted(posted, "objective_summary")
+            if self.latest_narrative_summary and "narrative_summary" not in posted:
+                await summary_channel.send("**Narrative Summary**")
+                await send_response_in_chunks(summary_channel, self.latest_narrative_summary)
+                await self._mark_posted(posted, "narrative_summary")
+
+        audio_paths = (
+            sorted(path for path in self.audio_files_path.iterdir() if path.is_file())
+            if self.audio_files_path.exists()
+            else []
+        )
+        uploaded_paths = await upload_session_artifacts_for_guild(
+            guild_id=self.guild.id,
+            # Session dirs end in <channel_id>/<started_at>; keep the same layout in storage.
+            session_prefix="/".join(self.session_dir.parts[-2:]) if self.session_dir else None,
+            audio_files=audio_paths,
+            transcript_path=self.transcript_path,
+            manifest_path=self.transcript_manifest_path,
+        )
+        if uploaded_paths:
+            logging.info(
+                "Uploaded %s session artifacts to Supabase storage for guild %s.",
+                len(uploaded_paths),
+                self.guild.id,
+            )
 
+    async def post_session_images(self) -> None:
+        await self.load_saved_summaries()
+        summary_channel = self._summary_channel()
+        if not summary_channel:
+            return
         try:
             await self._generate_and_post_session_images(
-                category=getattr(self.voice_client.channel, "category", None),
+                category=self.category,
                 objective_summary=self.latest_objective_summary,
                 narrative_summary=self.latest_narrative_summary,
                 default_channel=summary_channel,
@@ -471,40 +607,62 @@ class VoiceRecorder:
             logging.error("Error generating session images: %s", exc)
             await summary_channel.send(f"Error generating session images: {exc}")
 
-        await self.output_service.cleanup_live_artifacts(self.voice_client, self.reset_session_artifacts)
+    async def cleanup_session_artifacts(self) -> None:
+        if self.session_dir is not None and not self.session_dir.exists():
+            return
+        logging.info("Cleaning up transcript and audio files...")
+        await self.output_service.cleanup_live_artifacts(self.reset_session_artifacts)
+        if self.session_dir is not None:
+            await asyncio.to_thread(self.output_service.remove_session_directory, self.session_dir, VOICE_SESSIONS_PATH)
 
-    async def send_to_openai(self, audio_filename, chunk_info):
+    async def send_to_openai(self, audio_filename, chunk_info) -> bool:
         if self._gemini_guild_id is not None:
             with use_guild_gemini_api_key(self._gemini_guild_id):
-                await self.transcript_service.transcribe_chunk(
+                return await self.transcript_service.transcribe_chunk(
                     Path(audio_filename),
                     chunk_info,
                     self.manifest_store,
                     self.context_block,
                 )
-            return
-        await self.transcript_service.transcribe_chunk(
+        return await self.transcript_service.transcribe_chunk(
             Path(audio_filename),
             chunk_info,
             self.manifest_store,
             self.context_block,
         )
 
-    async def summarize_transcript(self, category_id):
+    async def enqueue_transcription(self, audio_filename: Path, chunk_info: dict) -> None:
+        await self.transcription_queue.submit(audio_filename, chunk_info)
+
+    async def transcribe_chunks(self, chunks: list[tuple[Path, dict]], *, concurrency: int = 1) -> None:
+        if self._gemini_guild_id is not None:
+            with use_guild_gemini_api_key(self._gemini_guild_id):
+                await self.transcript_service.transcribe_chunks(
+                    chunks,
+                    self.manifest_store,
+                    self.context_block,
+                    concurrency=concurrency,
+                )
+            return
+        await self.transcript_service.transcribe_chunks(
+            chunks,
+            self.manifest_store,
+            self.context_block,
+            concurrency=concurrency,
+        )
+
+    async def summarize_transcript(self):
         logging.info("Starting audio-native session summarization...")
 
-        if not self.voice_client:
-            logging.error("Voice client is not connected. Cannot summarize transcript.")
+        if not self.guild:
+            logging.error("Session guild is unknown. Cannot summarize transcript.")
             return
 
-        await self.refresh_context_from_category(getattr(self.voice_client.channel, "category", None))
+        await self.refresh_context_from_category(self.category)
         self.latest_objective_summary = None
         self.latest_narrative_summary = None
 
-        guild = self.voice_client.guild
-        summary_channel = discord.utils.get(guild.text_channels, name="session-summary", category_id=category_id)
-        if not summary_channel:
-            logging.error("Could not find 'session-summary' channel in category %s.", category_id)
+        if not self._summary_channel():
             return
 
         window_summaries = await self.summarize_audio_windows()
@@ -529,4 +687,5 @@ class VoiceRecorder:
         except Exception as exc:
             logging.error("Error generating narrative session summary: %s", exc)
 
+        await self.save_summaries()
         logging.info("Audio-native transcript summarization completed.")
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from config import (
+    TRANSCRIPTION_CONCURRENCY,
+    TRANSCRIPTION_MAX_ATTEMPTS,
+    TRANSCRIPTION_QUEUE_SIZE,
+    TRANSCRIPTION_RETRY_BASE_SECONDS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TranscribeCallable = Callable[[Path, dict], Awaitable[bool]]
+
+
+@dataclass
+class _QueuedChunk:
+    audio_file: Path
+    chunk_info: dict
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+@dataclass
+class TranscriptionQueueStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    max_depth: int = 0
+    total_wait_seconds: float = 0.0
+    started: int = 0
+
+    def as_dict(self, *, depth: int, in_flight: int) -> dict:
+        average_wait = self.total_wait_seconds / self.started if self.started else 0.0
+        return {
+            "depth": depth,
+            "in_flight": in_flight,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "avg_wait_seconds": round(average_wait, 2),
+        }
+
+
+class TranscriptionQueue:
+    """Feeds recorded capture chunks to a fixed pool of transcription workers.
+
+    `submit` waits while the queue is full, so a capture loop that outpaces
+    Gemini slows down instead of piling up uploads. Failed chunks are retried
+    with exponential backoff before being left as `failed` in the manifest, and
+    `drain` waits for everything queued so far before the session is finalized.
+    """
+
+    def __init__(
+        self,
+        transcribe: TranscribeCallable,
+        *,
+        workers: int = TRANSCRIPTION_CONCURRENCY,
+        max_pending: int = TRANSCRIPTION_QUEUE_SIZE,
+        max_attempts: int = TRANSCRIPTION_MAX_ATTEMPTS,
+        retry_base_seconds: float = TRANSCRIPTION_RETRY_BASE_SECONDS,
+    ) -> None:
+        self.transcribe = transcribe
+        self.worker_count = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.metrics = TranscriptionQueueStats()
+        self._queue: asyncio.Queue[_QueuedChunk] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._in_flight = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        return self.metrics.as_dict(depth=self.depth, in_flight=self._in_flight)
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        if not self._workers:
+            self.metrics = TranscriptionQueueStats()
+            self._workers = [
+                asyncio.create_task(self._worker(index + 1), name=f"transcription-worker-{index + 1}")
+                for index in range(self.worker_count)
+            ]
+            logger.info("Started %s transcription workers (queue size %s).", self.worker_count, self.max_pending)
+        return self._queue
+
+    async def submit(self, audio_file: Path, chunk_info: dict) -> None:
+        queue = self._ensure_workers()
+        if queue.full():
+            logger.warning(
+                "Transcription queue is full (%s pending, %s in flight); capture is waiting for a free slot.",
+                queue.qsize(),
+                self._in_flight,
+            )
+        await queue.put(_QueuedChunk(Path(audio_file), chunk_info))
+        self.metrics.submitted += 1
+        self.metrics.max_depth = max(self.metrics.max_depth, queue.qsize())
+        logger.info(
+            "Queued chunk %s for transcription (depth %s, in flight %s).",
+            chunk_info["chunk_index"],
+            queue.qsize(),
+            self._in_flight,
+        )
+
+    async def _worker(self, worker_number: int) -> None:
+        queue = self._queue
+        while True:
+            item = await queue.get()
+            self._in_flight += 1
+            try:
+                if item.attempts == 0:
+                    self.metrics.started += 1
+                    self.metrics.total_wait_seconds += time.monotonic() - item.enqueued_at
+                await self._process(item, worker_number)
+            except Exception as exc:
+                logger.error("Transcription worker %s failed on chunk %s: %s", worker_number, item.chunk_info["chunk_index"], exc)
+                self.metrics.failed += 1
+            finally:
+                self._in_flight -= 1
+                queue.task_done()
+
+    async def _process(self, item: _QueuedChunk, worker_number: int) -> None:
+        chunk_index = item.chunk_info["chunk_index"]
+        while True:
+            item.attempts += 1
+            if await self.transcribe(item.audio_file, item.chunk_info):
+                self.metrics.completed += 1
+                return
+            if item.attempts >= self.max_attempts or not item.audio_file.exists():
+                self.metrics.failed += 1
+                logger.error("Giving up on chunk %s after %s attempts.", chunk_index, item.attempts)
+                return
+            delay = self.retry_base_seconds * (2 ** (item.attempts - 1))
+            delay += random.uniform(0, delay / 2)
+            self.metrics.retries += 1
+            logger.warning(
+                "Worker %s retrying chunk %s in %.1fs (attempt %s of %s).",
+                worker_number,
+                chunk_index,
+                delay,
+                item.attempts + 1,
+                self.max_attempts,
+            )
+            await asyncio.sleep(delay)
+
+    async def drain(self) -> dict:
+        """Wait for every queued chunk to finish, then stop the workers."""
+        if self._queue is not None and self._workers:
+            logger.info("Draining transcription queue: %s", self.stats())
+            await self._queue.join()
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+        stats = self.stats()
+        logger.info("Transcription queue drained: %s", stats)
+        return stats
@@ -5,7 +5,16 @@ import time
 import wave
 from pathlib import Path
 
-from .audio_utils import build_ffmpeg_command
+from config import (
+    CAPTURE_SILENCE_DBFS,
+    CAPTURE_SILENCE_HANGOVER_SECONDS,
+    CAPTURE_TRIM_SILENCE,
+    VAD_ENABLED,
+    VAD_MIN_PAUSE_SECONDS,
+    VAD_SPLIT_SEARCH_SECONDS,
+)
+from .audio_levels import pcm_rms_dbfs
+from .audio_utils import build_ffmpeg_command, encode_capture_audio
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +28,9 @@ except Exception:  # pragma: no cover - optional runtime dependency guard
 DISCORD_PCM_SAMPLE_RATE = 48000
 DISCORD_PCM_CHANNELS = 2
 DISCORD_PCM_SAMPLE_WIDTH = 2
+DISCORD_PCM_FRAME_BYTES = DISCORD_PCM_CHANNELS * DISCORD_PCM_SAMPLE_WIDTH
+# Packets arriving this much later than the file's running clock start a new offset-map anchor.
+OFFSET_MAP_GAP_TOLERANCE_SECONDS = 0.25
 
 
 def _slugify_voice_label(value: str | None) -> str:
@@ -28,8 +40,27 @@ def _slugify_voice_label(value: str | None) -> str:
 
 
 class _DiscordStreamChunkRecorder:
-    def __init__(self, audio_files_path: Path) -> None:
+    """Writes each speaker's decoded packets to a per-window WAV file.
+
+    With `trim_silence`, packets below `silence_dbfs` are dropped once a speaker
+    has been quiet for `hangover_seconds`, so the file only holds speech. Because
+    Discord also stops sending packets while someone is silent, every file keeps
+    an `offset_map` of `[file_seconds, window_seconds]` anchors that records
+    where its audio actually sat in the capture window.
+    """
+
+    def __init__(
+        self,
+        audio_files_path: Path,
+        *,
+        trim_silence: bool = CAPTURE_TRIM_SILENCE,
+        silence_dbfs: float = CAPTURE_SILENCE_DBFS,
+        hangover_seconds: float = CAPTURE_SILENCE_HANGOVER_SECONDS,
+    ) -> None:
         self.audio_files_path = audio_files_path
+        self.trim_silence = trim_silence
+        self.silence_dbfs = silence_dbfs
+        self.hangover_seconds = hangover_seconds
         self._lock = threading.Lock()
         self._window_started_at = time.monotonic()
         self._current_window_index = 0
@@ -55,7 +86,22 @@ class _DiscordStreamChunkRecorder:
             or "Unknown"
         )
 
+        pcm = data.pcm
+        voiced = not self.trim_silence or pcm_rms_dbfs(pcm) > self.silence_dbfs
+
         with self._lock:
+            window_seconds = time.monotonic() - self._window_started_at
+            file_info = self._files.get(user_id)
+            if voiced:
+                if file_info is not None:
+                    file_info["last_voiced_at"] = window_seconds
+            elif (
+                file_info is None
+                or file_info["last_voiced_at"] is None
+                or window_seconds - file_info["last_voiced_at"] > self.hangover_seconds
+            ):
+                return
+
             if user_id not in self._writers:
                 slug = _slugify_voice_label(display_name)
                 file_path = self.audio_files_path / f"audio_recording_{self._current_window_index:03d}_{slug}_{user_id or 'unknown'}.wav"
@@ -64,18 +110,51 @@ class _DiscordStreamChunkRecorder:
                 wav_handle.setsampwidth(DISCORD_PCM_SAMPLE_WIDTH)
                 wav_handle.setframerate(DISCORD_PCM_SAMPLE_RATE)
                 self._writers[user_id] = wav_handle
-                self._files[user_id] = {
+                file_info = {
                     "path": file_path,
                     "source_user_id": user_id or None,
                     "source_user_name": display_name,
+                    "offset_map": [],
+                    "frames_written": 0,
+                    "last_voiced_at": window_seconds,
                 }
+                self._files[user_id] = file_info
 
-            self._writers[user_id].writeframesraw(data.pcm)
+            file_seconds = file_info["frames_written"] / DISCORD_PCM_SAMPLE_RATE
+            offset_map = file_info["offset_map"]
+            if offset_map:
+                anchor_file, anchor_window = offset_map[-1]
+                expected_window_seconds = anchor_window + (file_seconds - anchor_file)
+            else:
+                expected_window_seconds = None
+            # Bursty packet delivery only ever runs ahead of the clock; a packet that
+            # lands well behind it follows a gap (dropped silence or no transmission).
+            if expected_window_seconds is None or window_seconds - expected_window_seconds > OFFSET_MAP_GAP_TOLERANCE_SECONDS:
+                offset_map.append([round(file_seconds, 2), round(window_seconds, 2)])
+
+            self._writers[user_id].writeframesraw(pcm)
+            file_info["frames_written"] += len(pcm) // DISCORD_PCM_FRAME_BYTES
+
+    def quiet_seconds(self) -> float:
+        """Seconds since anyone in the current window last spoke above the silence level."""
+        with self._lock:
+            window_seconds = time.monotonic() - self._window_started_at
+            voiced_at = [info["last_voiced_at"] for info in self._files.values() if info["last_voiced_at"] is not None]
+            return window_seconds - max(voiced_at) if voiced_at else window_seconds
 
     def rotate_window(self) -> tuple[int, list[dict]]:
         with self._lock:
             actual_duration = max(1, int(round(time.monotonic() - self._window_started_at)))
-            finished_files = list(self._files.values())
+            finished_files = [
+                {
+                    "path": info["path"],
+                    "source_user_id": info["source_user_id"],
+                    "source_user_name": info["source_user_name"],
+                    "offset_map": info["offset_map"],
+                    "audio_duration_seconds": max(1, int(round(info["frames_written"] / DISCORD_PCM_SAMPLE_RATE))),
+                }
+                for info in self._files.values()
+            ]
             for writer in self._writers.values():
                 writer.close()
             self._writers = {}
@@ -88,6 +167,17 @@ class VoiceCaptureService:
     def __init__(self, audio_files_path: Path) -> None:
         self.audio_files_path = audio_files_path
 
+    async def _wait_for_pause(self, stream_recorder: _DiscordStreamChunkRecorder) -> None:
+        """Hold the window open (up to VAD_SPLIT_SEARCH_SECONDS) until the table pauses."""
+        if not VAD_ENABLED:
+            return
+        deadline = time.monotonic() + VAD_SPLIT_SEARCH_SECONDS
+        while time.monotonic() < deadline:
+            if stream_recorder.quiet_seconds() >= VAD_MIN_PAUSE_SECONDS:
+                return
+            await asyncio.sleep(0.1)
+        logger.info("No pause found within %ss; cutting the capture window mid-speech.", VAD_SPLIT_SEARCH_SECONDS)
+
     async def process_pending_transcriptions(self, recorder) -> None:
         logger.info("Processing any recorded chunks that are still pending transcription...")
         pending_chunks = [
@@ -115,6 +205,7 @@ class VoiceCaptureService:
             audio_file = Path(file_info["path"])
             if not audio_file.exists() or audio_file.stat().st_size <= 44:
                 continue
+            audio_file = await asyncio.to_thread(encode_capture_audio, audio_file)
             chunk_info = await recorder.register_external_chunk(
                 audio_file,
                 duration,
@@ -122,10 +213,10 @@ class VoiceCaptureService:
                 source_user_id=file_info.get("source_user_id"),
                 source_user_name=file_info.get("source_user_name"),
                 capture_mode="discord_stream",
+                offset_map=file_info.get("offset_map"),
+                audio_duration_seconds=file_info.get("audio_duration_seconds"),
             )
-            task = asyncio.create_task(recorder.send_to_openai(audio_file, chunk_info))
-            recorder.transcription_tasks.append(task)
-            task.add_done_callback(lambda t: recorder.transcription_tasks.remove(t))
+            await recorder.enqueue_transcription(audio_file, chunk_info)
 
     async def capture_discord_streams(self, recorder, voice_client, duration: int) -> None:
         if voice_recv is None:
@@ -167,16 +258,20 @@ class VoiceCaptureService:
                             break
 
                     await asyncio.sleep(duration)
+                    await self._wait_for_pause(stream_recorder)
                     actual_duration, window_files = stream_recorder.rotate_window()
+                    window_offset = current_offset
+                    current_offset += actual_duration
+                    current_window_index += 1
+                    # Open the next window first: queueing may wait for a free slot and
+                    # audio keeps arriving meanwhile.
+                    stream_recorder.start_window(window_index=current_window_index)
                     await self._register_and_transcribe_stream_files(
                         recorder,
                         window_files=window_files,
-                        start_offset_seconds=current_offset,
+                        start_offset_seconds=window_offset,
                         duration=actual_duration,
                     )
-                    current_offset += actual_duration
-                    current_window_index += 1
-                    stream_recorder.start_window(window_index=current_window_index)
                 else:
                     logger.info("Voice client not connected. Exiting recording loop.")
                     break
@@ -218,9 +313,7 @@ class VoiceCaptureService:
 
                     if audio_filename.exists() and audio_filename.stat().st_size > 0:
                         chunk_info = await recorder.register_chunk(audio_filename, duration)
-                        task = asyncio.create_task(recorder.send_to_openai(audio_filename, chunk_info))
-                        recorder.transcription_tasks.append(task)
-                        task.add_done_callback(lambda t: recorder.transcription_tasks.remove(t))
+                        await recorder.enqueue_transcription(audio_filename, chunk_info)
                     else:
                         logger.error(
                             "Audio file %s does not exist or is empty after recording. %s",